@@ -0,0 +1,4 @@
+"""Benchmarks of Copier with big synthetic templates.
+
+Run them with `poe bench`. See [contributing][benchmarks].
+"""
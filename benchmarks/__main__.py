@@ -0,0 +1,74 @@
+"""Run the benchmarks, record their results and check for regressions."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from .run import (
+    HISTORY_RUNS,
+    SCENARIOS,
+    find_regressions,
+    load_history,
+    run_scenarios,
+    save_history,
+)
+from .templates import SIZES
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks.
+
+    Returns:
+        The exit code: 1 if any scenario got slower than allowed, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "--size", choices=SIZES, default="small", help="template size (%(default)s)"
+    )
+    parser.add_argument(
+        "--scenario",
+        choices=SCENARIOS,
+        action="append",
+        help="scenario to run, may be given multiple times (all)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs of each scenario (%(default)s)"
+    )
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=Path(".benchmarks", "history.json"),
+        help="JSON file with the results of previous runs (%(default)s)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help=(
+            "allowed slowdown compared to the median of the last "
+            f"{HISTORY_RUNS} runs, as a fraction (%(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="don't add the results to the history"
+    )
+    args = parser.parse_args(argv)
+    scenarios = args.scenario or list(SCENARIOS)
+    results = run_scenarios(SIZES[args.size], scenarios, args.repeat)
+    history = load_history(args.history)
+    regressions = find_regressions(history, args.size, results, args.threshold)
+    for name, durations in results.items():
+        line = f"{name:<8} min {durations['min']:8.3f}s  median {durations['median']:8.3f}s"
+        if name in regressions:
+            baseline, _ = regressions[name]
+            line += f"  REGRESSION from {baseline:.3f}s"
+        print(line)
+    if not args.no_save:
+        save_history(args.history, history, args.size, results)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Copy, recopy and update scenarios, and their history of results."""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from plumbum import local
+
+import copier
+
+from .templates import NEW_VERSION, OLD_VERSION, TemplateSpec, generate_template
+
+HISTORY_RUNS = 5
+"""Number of previous runs that make the baseline of a regression check."""
+
+Scenario = Callable[[Path, Path], Callable[[], object]]
+"""Prepare a scenario from a template bundle and a work directory.
+
+The returned function is the part of the scenario that is timed.
+"""
+
+
+def _options() -> dict[str, Any]:
+    return {"defaults": True, "overwrite": True, "unsafe": True, "quiet": True}
+
+
+def _git_save(path: Path) -> None:
+    with local.cwd(path):
+        git = local["git"]["-c", "user.name=Benchmarks", "-c", "user.email=b@copier"]
+        git("init", "--quiet")
+        git("add", "--all")
+        git("commit", "--quiet", "--message", "Generated")
+
+
+def _copy(bundle: Path, workdir: Path) -> Callable[[], object]:
+    return lambda: copier.run_copy(
+        str(bundle), workdir / "project", vcs_ref=OLD_VERSION, **_options()
+    )
+
+
+def _recopy(bundle: Path, workdir: Path) -> Callable[[], object]:
+    _copy(bundle, workdir)()
+    _git_save(workdir / "project")
+    return lambda: copier.run_recopy(workdir / "project", **_options())
+
+
+def _update(bundle: Path, workdir: Path) -> Callable[[], object]:
+    _copy(bundle, workdir)()
+    _git_save(workdir / "project")
+    return lambda: copier.run_update(
+        workdir / "project", vcs_ref=NEW_VERSION, **_options()
+    )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "copy": _copy,
+    "recopy": _recopy,
+    "update": _update,
+}
+"""Scenarios available by name."""
+
+
+def run_scenarios(
+    spec: TemplateSpec, scenarios: Sequence[str], repeat: int
+) -> dict[str, dict[str, float]]:
+    """Time scenarios against a template generated from `spec`.
+
+    Each scenario runs `repeat` times, in a fresh work directory each time.
+
+    Returns:
+        The minimum and median durations of each scenario, in seconds.
+    """
+    results = {}
+    with TemporaryDirectory(prefix="copier-benchmarks.") as tmp:
+        bundle = generate_template(Path(tmp), spec)
+        for name in scenarios:
+            durations = []
+            for attempt in range(repeat):
+                workdir = Path(tmp, f"{name}-{attempt}")
+                workdir.mkdir()
+                timed = SCENARIOS[name](bundle, workdir)
+                start = time.perf_counter()
+                timed()
+                durations.append(time.perf_counter() - start)
+            results[name] = {
+                "min": min(durations),
+                "median": statistics.median(durations),
+            }
+    return results
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    """Read the results of previous runs, oldest first."""
+    try:
+        return list(json.loads(path.read_text()))
+    except FileNotFoundError:
+        return []
+
+
+def save_history(
+    path: Path, history: list[dict[str, Any]], size: str, results: dict[str, Any]
+) -> None:
+    """Append the results of a run to the history file."""
+    commit = local["git"]("rev-parse", "HEAD", retcode=None).strip() or None
+    history.append(
+        {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit,
+            "copier": copier.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": size,
+            "results": results,
+        }
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=2) + "\n")
+
+
+def find_regressions(
+    history: Sequence[dict[str, Any]],
+    size: str,
+    results: dict[str, dict[str, float]],
+    threshold: float,
+) -> dict[str, tuple[float, float]]:
+    """Compare results with the previous runs of the same size.
+
+    The baseline of each scenario is the median of its minimum durations in
+    the last [HISTORY_RUNS][benchmarks.run.HISTORY_RUNS] runs.
+
+    Args:
+        history: Previous runs, oldest first.
+        size: Name of the template size of `results`.
+        results: Durations of the current run.
+        threshold: Allowed slowdown, as a fraction of the baseline.
+
+    Returns:
+        The baseline and current duration of each scenario that got slower.
+    """
+    regressions = {}
+    for name, durations in results.items():
+        previous = [
+            run["results"][name]["min"]
+            for run in history
+            if run["size"] == size and name in run["results"]
+        ][-HISTORY_RUNS:]
+        if not previous:
+            continue
+        baseline = statistics.median(previous)
+        if durations["min"] > baseline * (1 + threshold):
+            regressions[name] = (baseline, durations["min"])
+    return regressions
@@ -0,0 +1,162 @@
+"""Generation of synthetic templates, stored as git bundles."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+from plumbum import local
+
+OLD_VERSION = "1.0.0"
+NEW_VERSION = "2.0.0"
+
+
+@dataclass(frozen=True)
+class TemplateSpec:
+    """Shape of a synthetic template.
+
+    Attributes:
+        files: Number of templated files.
+        depth: Nesting of the templated directories that hold those files.
+        fan_out: Number of directories produced by a `yield` directory.
+        assets: Number of large static files.
+        asset_size: Size of each static file, in bytes.
+        questions: Number of questions, at least 3.
+        migrations: Number of migrations, at least 1. All but one are for
+            versions older than the ones used in the benchmarks.
+    """
+
+    files: int
+    depth: int
+    fan_out: int
+    assets: int
+    asset_size: int
+    questions: int
+    migrations: int
+
+
+SIZES = {
+    "tiny": TemplateSpec(
+        files=20,
+        depth=2,
+        fan_out=2,
+        assets=1,
+        asset_size=1 << 10,
+        questions=5,
+        migrations=5,
+    ),
+    "small": TemplateSpec(
+        files=500,
+        depth=3,
+        fan_out=5,
+        assets=2,
+        asset_size=1 << 18,
+        questions=50,
+        migrations=50,
+    ),
+    "large": TemplateSpec(
+        files=5000,
+        depth=6,
+        fan_out=50,
+        assets=8,
+        asset_size=1 << 20,
+        questions=300,
+        migrations=500,
+    ),
+}
+"""Template shapes available by name."""
+
+_FILE_CONTENTS = """\
+# {{ q0 }}, generated from file {index}
+{% for item in items %}
+- {{ item }}: {{ q1 | upper }}
+{% endfor %}
+{% if q2 %}{{ q2 | replace("a", "b") }}{% endif %}
+"""
+
+
+def _git(*args: str) -> None:
+    local["git"](
+        "-c", "user.name=Benchmarks", "-c", "user.email=benchmarks@copier", *args
+    )
+
+
+def _config(spec: TemplateSpec) -> dict[str, object]:
+    config: dict[str, object] = {
+        "items": {
+            "type": "yaml",
+            "default": [f"item{i}" for i in range(spec.fan_out)],
+        }
+    }
+    for i in range(spec.questions):
+        question: dict[str, object] = {"type": "str", "default": f"value{i}"}
+        if i % 3 == 1:
+            question["choices"] = [f"value{i}", f"other{i}"]
+        elif i % 3 == 2:
+            question["default"] = f"{{{{ q{i - 1} }}}}-derived"
+            question["when"] = f"{{{{ q{i - 2} != '' }}}}"
+        config[f"q{i}"] = question
+    # Old migrations are parsed and evaluated, but never run in the benchmarks
+    migrations = [
+        {"version": f"0.{i // 100}.{i % 100}", "command": "exit 1"}
+        for i in range(spec.migrations - 1)
+    ]
+    migrations.append({"version": NEW_VERSION, "command": "echo migrated > migrated"})
+    config["_migrations"] = migrations
+    return config
+
+
+def _write_files(root: Path, spec: TemplateSpec, version: int) -> None:
+    """Write the files of a template version, changing some in each version."""
+    directory = root
+    for level in range(spec.depth):
+        directory /= f"{{{{ q{level % spec.questions} }}}}_{level}"
+    directory.mkdir(parents=True, exist_ok=True)
+    for index in range(spec.files):
+        path = directory / f"file{index}.txt.jinja"
+        # Later versions change one file out of 10, and remove one out of 20
+        if version > 1 and index % 20 == 19:
+            path.unlink(missing_ok=True)
+            continue
+        contents = _FILE_CONTENTS.replace("{index}", str(index))
+        if version > 1 and index % 10 == 0:
+            contents += f"Changed in version {version}\n"
+        path.write_text(contents)
+    yield_dir = root / "{% yield item from items %}{{ item }}{% endyield %}"
+    yield_dir.mkdir(exist_ok=True)
+    (yield_dir / "{{ item }}.txt.jinja").write_text("{{ item }} of {{ q0 }}\n")
+    assets = root / "assets"
+    assets.mkdir(exist_ok=True)
+    generator = random.Random(spec.asset_size)
+    for index in range(spec.assets):
+        (assets / f"blob{index}.bin").write_bytes(generator.randbytes(spec.asset_size))
+    (root / "{{ _copier_conf.answers_file }}.jinja").write_text(
+        "{{ _copier_answers|to_nice_yaml }}"
+    )
+
+
+def generate_template(root: Path, spec: TemplateSpec) -> Path:
+    """Create a template with two tagged versions, bundled with git.
+
+    Args:
+        root: Empty directory where the template repository is created.
+        spec: Shape of the template.
+
+    Returns:
+        Path of the git bundle with both versions of the template.
+    """
+    repo = root / "template"
+    repo.mkdir(parents=True)
+    (repo / "copier.yml").write_text(yaml.safe_dump(_config(spec), sort_keys=False))
+    with local.cwd(repo):
+        _git("init", "--quiet")
+        for version, tag in enumerate((OLD_VERSION, NEW_VERSION), 1):
+            _write_files(repo, spec, version)
+            _git("add", "--all")
+            _git("commit", "--quiet", "--message", f"Version {tag}")
+            _git("tag", tag)
+        bundle = root / "template.bundle"
+        _git("bundle", "create", str(bundle), "--all")
+    return bundle
@@ -3,38 +3,87 @@
 Docs: https://copier.readthedocs.io/
 """
 
+import importlib
 import importlib.metadata
 from typing import TYPE_CHECKING, Any
 
-from . import _main
 from ._deprecation import deprecate_member_as_internal
+from ._events import (
+    Event,
+    FileEvent,
+    StepFinished,
+    StepStarted,
+    TaskFinished,
+    TaskStarted,
+    Totals,
+)
 from ._settings import Settings, load_settings
+from ._sinks import MemoryEntry, MemorySink, Sink, TarSink, ZipSink
 from ._types import Phase, VcsRef
 
 if TYPE_CHECKING:
+    from ._batch import (
+        Destination,
+        UpdateResult,
+        find_destinations,
+        run_batch_update,
+    )
     from ._main import *  # noqa: F403
 
-try:
-    __version__ = importlib.metadata.version(__name__)
-except importlib.metadata.PackageNotFoundError:
-    __version__ = "0.0.0"
+    __version__: str
 
 
+def _version() -> str:
+    try:
+        return importlib.metadata.version(__name__)
+    except importlib.metadata.PackageNotFoundError:
+        return "0.0.0"
+
+
+_BATCH_MEMBERS = frozenset(
+    {"Destination", "UpdateResult", "find_destinations", "run_batch_update"}
+)
+
+
+# The version and the main module are slow to load, so they're loaded on first use
 def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        globals()[name] = version = _version()
+        return version
+    if name in _BATCH_MEMBERS:
+        return getattr(importlib.import_module(f"{__name__}._batch"), name)
     if not name.startswith("_") and name not in {
+        "inspect_template",
         "run_copy",
         "run_recopy",
         "run_update",
     }:
         deprecate_member_as_internal(name, __name__)
-    return getattr(_main, name)
+    return getattr(importlib.import_module(f"{__name__}._main"), name)
 
 
 __all__ = [
+    "Destination",
+    "Event",
+    "FileEvent",
+    "MemoryEntry",
+    "MemorySink",
     "Phase",
     "Settings",
+    "Sink",
+    "StepFinished",
+    "StepStarted",
+    "TarSink",
+    "TaskFinished",
+    "TaskStarted",
+    "Totals",
+    "UpdateResult",
     "VcsRef",
+    "ZipSink",
+    "find_destinations",
+    "inspect_template",  # noqa: F405
     "load_settings",
+    "run_batch_update",
     "run_copy",  # noqa: F405
     "run_recopy",  # noqa: F405
     "run_update",  # noqa: F405,
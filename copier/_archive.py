@@ -0,0 +1,331 @@
+"""Templates distributed as tar or zip archives.
+
+Archived templates are read straight from the archive, without extracting it.
+They're only extracted when their files are needed on disk; see
+[ArchiveTree.needs_checkout][copier._archive.ArchiveTree.needs_checkout].
+"""
+
+from __future__ import annotations
+
+import stat
+import sys
+import tarfile
+import zipfile
+from collections.abc import Iterator
+from dataclasses import dataclass as std_dataclass
+from functools import cached_property
+from hashlib import sha256
+from pathlib import Path, PurePosixPath
+from typing import Literal
+
+from pydantic.dataclasses import dataclass
+
+from ._vcs import checkout_mode, glob_regex
+from .errors import ForbiddenPathError
+
+ARCHIVE_SUFFIXES = (
+    ".zip",
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
+"""File name suffixes of the archives that can be used as templates."""
+
+EntryKind = Literal["file", "dir", "link"]
+
+
+@std_dataclass(frozen=True)
+class _ArchiveIndex:
+    """Paths of an archive, relative to its root directory.
+
+    Attributes:
+        entries: Mode, kind and member name of each path, directories first.
+        root: Directory inside the archive that holds the template.
+        contents: Contents of each file of tar archives, which can't be read
+            randomly without decompressing them again.
+    """
+
+    entries: dict[PurePosixPath, tuple[int, EntryKind, str]]
+    root: PurePosixPath
+    contents: dict[PurePosixPath, bytes] | None
+
+
+# Indexes of the archives read, keyed by the digest of their contents, so every
+# version of an archive gets its own entry, even if they're in the same path
+_archive_indexes: dict[str, _ArchiveIndex] = {}
+_ARCHIVE_INDEXES_MAX = 8
+
+
+def is_archive(url: str) -> bool:
+    """Tell if a template URL points to an archive file."""
+    path = Path(url).expanduser()
+    return url.lower().endswith(ARCHIVE_SUFFIXES) and path.is_file()
+
+
+def _digest(path: Path) -> str:
+    result = sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(1 << 20):
+            result.update(chunk)
+    return result.hexdigest()
+
+
+def _member_path(name: str) -> PurePosixPath:
+    path = PurePosixPath(name.replace("\\", "/"))
+    if path.is_absolute() or ".." in path.parts:
+        raise ForbiddenPathError(
+            path=Path(name), hint="Archive members must be inside the archive"
+        )
+    return path
+
+
+def _check_link(member: PurePosixPath, target: str, *, hard: bool = False) -> None:
+    """Make sure that a link points inside the archive.
+
+    Args:
+        member: Path of the link in the archive.
+        target: Target of the link, relative to the archive root if it's a hard
+            link, or to the directory of the link otherwise.
+        hard: Whether it's a hard link.
+    """
+    path = PurePosixPath(target.replace("\\", "/"))
+    depth = 0
+    for part in (() if hard else member.parent.parts) + path.parts:
+        if part != "..":
+            depth += 1
+        elif (depth := depth - 1) < 0:
+            break
+    if path.is_absolute() or depth < 0:
+        raise ForbiddenPathError(
+            path=Path(str(member)), hint="Archive links must point inside the archive"
+        )
+
+
+_Members = dict[PurePosixPath, tuple[int, EntryKind, str]]
+
+
+def _read_zip_members(path: Path) -> _Members:
+    """Read the paths of a zip archive."""
+    result: _Members = {}
+    with zipfile.ZipFile(path) as zip_:
+        for info in zip_.infolist():
+            member = _member_path(info.filename)
+            # Unix mode in the high bits, if the archive was made on Unix
+            mode = info.external_attr >> 16
+            if info.is_dir():
+                result[member] = (mode or stat.S_IFDIR | 0o755, "dir", "")
+            elif stat.S_ISLNK(mode):
+                _check_link(member, zip_.read(info).decode())
+                result[member] = (mode, "link", info.filename)
+            else:
+                result[member] = (mode or 0o644, "file", info.filename)
+    return result
+
+
+def _read_tar_members(path: Path, contents: dict[PurePosixPath, bytes]) -> _Members:
+    """Read the paths of a tar archive, and the contents of its files."""
+    result: _Members = {}
+    # Read sequentially, which is the only cheap way for compressed tars
+    with tarfile.open(path, "r|*") as tar:
+        for info in tar:
+            member = _member_path(info.name)
+            if info.isdir():
+                result[member] = (info.mode, "dir", "")
+            elif info.issym() or info.islnk():
+                _check_link(member, info.linkname, hard=info.islnk())
+                result[member] = (info.mode, "link", info.name)
+            elif info.isfile():
+                result[member] = (info.mode, "file", info.name)
+                file = tar.extractfile(info)
+                assert file
+                contents[member] = file.read()
+    return result
+
+
+def _read_index(path: Path) -> _ArchiveIndex:
+    """Read the paths of an archive, and the file contents of tar archives."""
+    contents: dict[PurePosixPath, bytes] | None = None
+    if zipfile.is_zipfile(path):
+        members = _read_zip_members(path)
+    else:
+        contents = {}
+        members = _read_tar_members(path, contents)
+    members.pop(PurePosixPath("."), None)
+    # Archives usually hold a single directory named after the project
+    root = PurePosixPath()
+    top_level = {member.parts[0] for member in members}
+    if len(top_level) == 1 and any(len(member.parts) > 1 for member in members):
+        root = PurePosixPath(top_level.pop())
+    entries: _Members = {}
+    # Directories before their contents, adding the ones that aren't archived
+    for member in sorted(members, key=lambda member: member.parts):
+        if member == root or not member.is_relative_to(root):
+            continue
+        relpath = member.relative_to(root)
+        for parent in reversed(relpath.parents[:-1]):
+            entries.setdefault(parent, (stat.S_IFDIR | 0o755, "dir", ""))
+        entries[relpath] = members[member]
+    if contents is not None:
+        contents = {
+            relpath: contents[root / relpath]
+            for relpath, (_, kind, _) in entries.items()
+            if kind == "file"
+        }
+    return _ArchiveIndex(entries=entries, root=root, contents=contents)
+
+
+def get_archive_index(path: Path) -> _ArchiveIndex:
+    """Get the index of an archive, reading it only if its contents changed."""
+    digest = _digest(path)
+    if (cached := _archive_indexes.get(digest)) is not None:
+        return cached
+    result = _read_index(path)
+    if len(_archive_indexes) >= _ARCHIVE_INDEXES_MAX:
+        # Forget the oldest entry
+        del _archive_indexes[next(iter(_archive_indexes))]
+    _archive_indexes[digest] = result
+    return result
+
+
+@dataclass
+class ArchiveTree:
+    """Files of a template archive, read without extracting it.
+
+    If the archive holds a single directory, that directory is the template
+    root. Zip archives are read lazily; tar archives are read at once, because
+    compressed tars can't be read randomly. Call
+    [close][copier._archive.ArchiveTree.close] when done.
+
+    Attributes:
+        path: Path to the archive file.
+    """
+
+    path: Path
+
+    @cached_property
+    def _index(self) -> _ArchiveIndex:
+        return get_archive_index(self.path)
+
+    @cached_property
+    def _zip(self) -> zipfile.ZipFile:
+        return zipfile.ZipFile(self.path)
+
+    @property
+    def entries(self) -> dict[PurePosixPath, tuple[int, EntryKind, str]]:
+        """Mode, kind and archive member name of each path in the archive.
+
+        Directories come before their contents, like when walking a directory.
+        """
+        return self._index.entries
+
+    @cached_property
+    def modes(self) -> dict[PurePosixPath, int]:
+        """Mode of each file in the archive, by path."""
+        return {
+            path: mode
+            for path, (mode, kind, _) in self.entries.items()
+            if kind == "file"
+        }
+
+    @cached_property
+    def needs_checkout(self) -> bool:
+        """Tell if the archive must be extracted to get its real contents.
+
+        That's the case for archives with symlinks or hard links, which aren't
+        plain files.
+        """
+        return any(kind == "link" for _, kind, _ in self.entries.values())
+
+    def exists(self, path: PurePosixPath) -> bool:
+        """Tell if a file or directory exists in the archive."""
+        return path in self.entries or not path.parts
+
+    def walk(self, root: PurePosixPath) -> Iterator[tuple[PurePosixPath, bool]]:
+        """Walk the tree of a directory, like a recursive `os.scandir`.
+
+        Yields:
+            Each path below the directory, relative to the template root, and
+            whether it's a directory.
+
+        Raises:
+            FileNotFoundError: If the directory is not in the archive.
+        """
+        if root.parts and self.entries.get(root, (0, "file", ""))[1] != "dir":
+            raise FileNotFoundError(root)
+        for path, (_, kind, _) in self.entries.items():
+            if path != root and path.is_relative_to(root):
+                yield path, kind == "dir"
+
+    def glob(self, pattern: str) -> list[PurePosixPath]:
+        """Get the files that match a glob pattern, like `Path.glob`."""
+        regex = glob_regex(pattern)
+        return sorted(path for path in self.modes if regex.fullmatch(path.as_posix()))
+
+    def stat_mode(self, path: PurePosixPath) -> int:
+        """Get the mode that a file would have if extracted, like `stat`."""
+        return checkout_mode(bool(self.modes[path] & 0o111))
+
+    def read_bytes(self, path: PurePosixPath) -> bytes:
+        """Read the contents of a file.
+
+        Raises:
+            FileNotFoundError: If the file is not in the archive.
+        """
+        if path not in self.modes:
+            raise FileNotFoundError(path)
+        if self._index.contents is not None:
+            return self._index.contents[path]
+        return self._zip.read(self.entries[path][2])
+
+    def close(self) -> None:
+        """Close the archive file, if it's open."""
+        archive = self.__dict__.pop("_zip", None)
+        if archive is not None:
+            archive.close()
+
+    def extract(self, location: Path) -> Path:
+        """Extract the archive, for the templates that need a checkout.
+
+        Args:
+            location: Empty directory where the archive is extracted.
+
+        Returns:
+            The template root inside `location`.
+
+        Raises:
+            ForbiddenPathError: If a member or link target is outside the archive.
+        """
+        # Checks the paths of all members and link targets
+        index = self._index
+        if zipfile.is_zipfile(self.path):
+            with zipfile.ZipFile(self.path) as zip_:
+                zip_.extractall(location)
+                # Zip symlinks are extracted as files with their target inside
+                for name, (mode, kind, member) in self.entries.items():
+                    if kind == "link" and stat.S_ISLNK(mode):
+                        link = location / index.root / name
+                        target = zip_.read(member).decode()
+                        link.unlink()
+                        link.symlink_to(target)
+        else:
+            with tarfile.open(self.path) as tar:
+                if sys.version_info >= (3, 12) or hasattr(tarfile, "data_filter"):
+                    tar.extractall(location, filter="data")
+                else:
+                    # Only the members in the index, which are all checked
+                    tar.extractall(
+                        location,
+                        members=[
+                            info
+                            for info in tar
+                            if info.isdir()
+                            or info.isfile()
+                            or info.issym()
+                            or info.islnk()
+                        ],
+                    )
+        return location / index.root
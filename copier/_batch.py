@@ -0,0 +1,505 @@
+"""Operations on many subprojects at once.
+
+Subprojects are found by their [answers files][the-copier-answersyml-file], and
+grouped by the template they were generated from, so each template is resolved
+only once.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import time
+import zlib
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatch
+from functools import cache
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Lock
+from typing import Any, Literal
+
+from ._main import (
+    _get_update_data_from_refs,
+    get_update_data,
+    run_update,
+    sharing_git_index,
+)
+from ._subproject import Subproject
+from ._template import Template, sharing_template_cache
+from ._types import AnyByStrDict, VcsRef
+from ._vcs import (
+    get_git,
+    get_object_store,
+    get_remote_tags,
+    reusing_mirrors,
+    select_latest_tag,
+)
+from .errors import UserMessageError
+
+DEFAULT_ANSWERS_PATTERN = ".copier-answers*.yml"
+"""Names of the answers files found when scanning, if no answers file is given."""
+
+
+@dataclass(frozen=True)
+class Destination:
+    """A subproject to operate on.
+
+    Attributes:
+        dst_path: Root folder of the subproject.
+        answers_file: Path of its answers file, relative to `dst_path`, or `None`
+            for the default one.
+    """
+
+    dst_path: Path
+    answers_file: Path | None = None
+
+
+def find_destinations(
+    root: Path | str, answers_file: Path | str | None = None
+) -> list[Destination]:
+    """Find the subprojects below a folder, by their answers files.
+
+    Git folders are not scanned.
+
+    Args:
+        root: Folder to scan recursively.
+        answers_file: Path of the answers files, relative to each subproject. If
+            `None`, any file matching `.copier-answers*.yml` is an answers file.
+
+    Returns:
+        The subprojects found, sorted by path.
+    """
+    result = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name != ".git")
+        folder = Path(dirpath)
+        if answers_file is not None:
+            if (folder / answers_file).is_file():
+                result.append(Destination(folder, Path(answers_file)))
+            continue
+        result.extend(
+            Destination(folder, Path(name))
+            for name in sorted(filenames)
+            if fnmatch(name, DEFAULT_ANSWERS_PATTERN)
+        )
+    return result
+
+
+def read_destinations(lines: Iterable[str]) -> list[Destination]:
+    """Read subprojects from JSON lines.
+
+    Each line is an object with a `dst_path` and, optionally, an `answers_file`.
+    Blank lines are ignored.
+
+    Raises:
+        UserMessageError: If a line is not valid.
+    """
+    result = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            answers_file = item.get("answers_file")
+            result.append(
+                Destination(
+                    Path(item["dst_path"]),
+                    None if answers_file is None else Path(answers_file),
+                )
+            )
+        except (ValueError, TypeError, KeyError, AttributeError) as error:
+            raise UserMessageError(
+                f"Invalid destination in line {number}: {error!r}"
+            ) from error
+    return result
+
+
+@dataclass
+class UpdateCheck:
+    """Result of checking a subproject for updates.
+
+    Attributes:
+        dst_path: Root folder of the subproject.
+        answers_file: Path of its answers file, relative to `dst_path`.
+        src_path: Template it was generated from, if known.
+        update_available: Whether a newer template version exists.
+        current_version: Template version used by the subproject.
+        latest_version: Latest template version.
+        error: Why the subproject couldn't be checked, if it couldn't.
+    """
+
+    dst_path: Path
+    answers_file: Path
+    src_path: str | None = None
+    update_available: bool | None = None
+    current_version: str | None = None
+    latest_version: str | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result into JSON-serializable data."""
+        return {
+            **asdict(self),
+            "dst_path": str(self.dst_path),
+            "answers_file": str(self.answers_file),
+        }
+
+
+def check_updates(
+    destinations: Sequence[Destination],
+    use_prereleases: bool = False,
+    jobs: int = 8,
+) -> list[UpdateCheck]:
+    """Check many subprojects for template updates.
+
+    Subprojects are grouped by the template they were generated from. The tags of
+    each template are listed once for its whole group, and groups are checked
+    concurrently. A subproject that can't be checked doesn't stop the others; the
+    reason is in its result.
+
+    See [checking a project][checking-a-project].
+
+    Args:
+        destinations: Subprojects to check.
+        use_prereleases: Consider prereleases as the latest template version.
+        jobs: Maximum number of templates to check at once.
+
+    Returns:
+        A result for each subproject, in the same order.
+    """
+    checks = []
+    groups: defaultdict[str, list[tuple[UpdateCheck, str]]] = defaultdict(list)
+    for destination in destinations:
+        subproject = Subproject(
+            local_abspath=Path(destination.dst_path).absolute(),
+            answers_relpath=destination.answers_file or Path(".copier-answers.yml"),
+        )
+        check = UpdateCheck(destination.dst_path, subproject.answers_relpath)
+        checks.append(check)
+        try:
+            template = subproject.template
+            if template is None or template.ref is None:
+                raise UserMessageError(
+                    "Cannot check because cannot obtain old template references "
+                    f"from `{subproject.answers_relpath}`."
+                )
+            check.src_path = str(template.url)
+            groups[template.url_expanded].append((check, template.ref))
+        # One subproject failing must not stop the others
+        except Exception as error:  # noqa: BLE001
+            check.error = str(error)
+        finally:
+            subproject._cleanup()
+    fallback_lock = Lock()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for future in [
+            executor.submit(_check_group, group, use_prereleases, fallback_lock)
+            for group in groups.values()
+        ]:
+            future.result()
+    return checks
+
+
+def _check_group(
+    group: Sequence[tuple[UpdateCheck, str]], use_prereleases: bool, fallback_lock: Lock
+) -> None:
+    """Check subprojects generated from the same template.
+
+    Args:
+        group: The result of each subproject, to fill, and the commit description
+            of the template used in its last update.
+        use_prereleases: Consider prereleases as the latest template version.
+        fallback_lock: Lock held while checking out the template, when the tags
+            aren't enough.
+    """
+    latest = Template(
+        url=str(group[0][0].src_path), use_prereleases=use_prereleases, checkout=False
+    )
+    try:
+        if latest.vcs != "git":
+            raise UserMessageError(
+                "Checking is only supported in git-tracked templates."
+            )
+        tags = get_remote_tags(latest.url_expanded)
+    except Exception as error:  # noqa: BLE001
+        for check, _ in group:
+            check.error = str(error)
+        return
+    # Subprojects generated from the same commit have the same result
+    known: dict[str, tuple[bool, str, str]] = {}
+    for check, last_commit in group:
+        try:
+            if last_commit not in known:
+                result = _get_update_data_from_refs(latest, last_commit, tags)
+                if result is None:
+                    # Checking out the template changes the working directory
+                    with fallback_lock:
+                        result = get_update_data(
+                            check.dst_path, check.answers_file, use_prereleases
+                        )
+                known[last_commit] = result
+        except Exception as error:  # noqa: BLE001
+            check.error = str(error)
+            continue
+        (
+            check.update_available,
+            check.current_version,
+            check.latest_version,
+        ) = known[last_commit]
+
+
+UpdateStatus = Literal["updated", "conflicted", "failed"]
+"""Outcome of updating a subproject.
+
+It's `conflicted` if the update left conflicts to solve by hand.
+"""
+
+
+@dataclass
+class UpdateResult:
+    """Result of updating a subproject.
+
+    Attributes:
+        dst_path: Root folder of the subproject.
+        answers_file: Path of its answers file, relative to `dst_path`.
+        src_path: Template it was generated from, if known.
+        from_ref: Template commit it was updated from.
+        to_ref: Template reference it was updated to.
+        status: Outcome of the update.
+        conflicts: Paths left with conflicts, relative to the `dst_path`.
+        error: Why the subproject couldn't be updated, if it couldn't.
+        duration: Wall clock duration of the update, in seconds.
+    """
+
+    dst_path: Path
+    answers_file: Path
+    src_path: str | None = None
+    from_ref: str | None = None
+    to_ref: str | None = None
+    status: UpdateStatus = "failed"
+    conflicts: list[str] = field(default_factory=list)
+    error: str | None = None
+    duration: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result into JSON-serializable data."""
+        return {
+            **asdict(self),
+            "dst_path": str(self.dst_path),
+            "answers_file": str(self.answers_file),
+        }
+
+
+def run_batch_update(
+    destinations: Sequence[Destination],
+    *,
+    data: AnyByStrDict | None = None,
+    vcs_ref: str | VcsRef | None = None,
+    use_prereleases: bool = False,
+    exclude: Sequence[str] = (),
+    skip_if_exists: Sequence[str] = (),
+    pretend: bool = False,
+    conflict: Literal["inline", "rej"] = "inline",
+    context_lines: int = 3,
+    unsafe: bool = False,
+    skip_tasks: bool = False,
+    jobs: int | None = None,
+) -> list[UpdateResult]:
+    """Update many subprojects, with their last answers or the default ones.
+
+    Subprojects are grouped by template, and by the template versions they're
+    updated from and to. The version to update each template to is resolved once,
+    and so is its cached mirror refreshed. The parsed config and the compiled
+    Jinja templates of each template version are shared by all the updates that
+    use it.
+
+    Each update runs in its own process, up to `jobs` at once. A subproject that
+    fails or ends with conflicts doesn't stop the others; its result tells so.
+
+    See [updating many projects][updating-many-projects].
+
+    Args:
+        destinations: Subprojects to update.
+        data: Answers for all the subprojects, over their last answers.
+        vcs_ref: Template reference to update to. If `None`, the latest version.
+        use_prereleases: Consider prereleases as the latest template version.
+        exclude: User-chosen additional [file exclusion patterns][exclude].
+        skip_if_exists: User-chosen additional [file skip patterns][skip_if_exists].
+        pretend: Don't change the subprojects; see [pretend][].
+        conflict: How conflicts are left; see [conflict][].
+        context_lines: Lines of context to detect conflicts; see
+            [context_lines][].
+        unsafe: Allow templates with unsafe features; see [unsafe][].
+        skip_tasks: Don't run the template tasks; see [skip_tasks][].
+        jobs: Maximum number of subprojects to update at once. By default, the
+            number of CPUs.
+
+    Returns:
+        A result for each subproject, in the same order.
+    """
+    results, groups = _group_updates(destinations, vcs_ref, use_prereleases)
+    options = {
+        "data": data or {},
+        "exclude": exclude,
+        "use_prereleases": use_prereleases,
+        "skip_if_exists": skip_if_exists,
+        "pretend": pretend,
+        "conflict": conflict,
+        "context_lines": context_lines,
+        "unsafe": unsafe,
+        "skip_tasks": skip_tasks,
+    }
+    # Updates of the same template version are submitted together, so they're
+    # likely to find its cache filled already
+    positions = [position for group in groups.values() for position in group]
+    with (
+        TemporaryDirectory(prefix=f"{__name__}.cache.") as cache,
+        ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_update_process,
+            initargs=([multiprocessing.Lock() for _ in range(_INDEX_LOCKS)],),
+        ) as executor,
+    ):
+        futures = [
+            executor.submit(_update, results[position], Path(cache), options)
+            for position in positions
+        ]
+        for position, future in zip(positions, futures, strict=True):
+            # The process may have died, without a chance to fill the result
+            if (error := future.exception()) is not None:
+                results[position].error = str(error)
+            else:
+                results[position] = future.result()
+    return results
+
+
+def _group_updates(
+    destinations: Sequence[Destination],
+    vcs_ref: str | VcsRef | None,
+    use_prereleases: bool,
+) -> tuple[list[UpdateResult], dict[tuple[str, str, str], list[int]]]:
+    """Find the template versions that each subproject is updated from and to.
+
+    Returns:
+        A result for each subproject, with its template versions or its error,
+        and the positions of the results grouped by template, and by the
+        versions they're updated from and to.
+    """
+    results = []
+    groups: defaultdict[tuple[str, str, str], list[int]] = defaultdict(list)
+    # Reference to update each template to, or why it couldn't be resolved
+    refs: dict[str, str | Exception] = {}
+    for position, destination in enumerate(destinations):
+        subproject = Subproject(
+            local_abspath=Path(destination.dst_path).absolute(),
+            answers_relpath=destination.answers_file or Path(".copier-answers.yml"),
+        )
+        result = UpdateResult(destination.dst_path, subproject.answers_relpath)
+        results.append(result)
+        try:
+            template = subproject.template
+            if template is None or template.ref is None:
+                raise UserMessageError(
+                    "Cannot update because cannot obtain old template references "
+                    f"from `{subproject.answers_relpath}`."
+                )
+            result.src_path = str(template.url)
+            result.from_ref = template.ref
+            url = template.url_expanded
+            if url not in refs:
+                try:
+                    refs[url] = _prepare_template(template, vcs_ref, use_prereleases)
+                except Exception as error:  # noqa: BLE001
+                    refs[url] = error
+            ref = refs[url]
+            if isinstance(ref, Exception):
+                raise ref
+            result.to_ref = template.ref if vcs_ref == VcsRef.CURRENT else ref
+            groups[url, result.from_ref, result.to_ref].append(position)
+        # One subproject failing must not stop the others
+        except Exception as error:  # noqa: BLE001
+            result.error = str(error)
+        finally:
+            subproject._cleanup()
+    return results, groups
+
+
+def _prepare_template(
+    template: Template, vcs_ref: str | VcsRef | None, use_prereleases: bool
+) -> str:
+    """Get a template ready to update subprojects from it.
+
+    Its cached mirror, if any, is refreshed, so the updates don't need to.
+
+    Returns:
+        The reference to update the subprojects to.
+    """
+    if template.vcs != "git":
+        raise UserMessageError("Updating is only supported in git-tracked templates.")
+    get_object_store(template.url_expanded)
+    if isinstance(vcs_ref, str):
+        return vcs_ref
+    tags = get_remote_tags(template.url_expanded)
+    return select_latest_tag(tags, use_prereleases) or "HEAD"
+
+
+# Locks held while writing the index of a destination repository, in this process.
+# Repositories are spread among them by their top-level folder, so updates in
+# different repositories rarely wait for each other.
+_index_locks: Sequence[AbstractContextManager[Any]] = ()
+_INDEX_LOCKS = 64
+
+
+def _init_update_process(index_locks: Sequence[AbstractContextManager[Any]]) -> None:
+    global _index_locks
+    _index_locks = index_locks
+
+
+@cache
+def _repo_top(path: Path) -> Path:
+    return Path(get_git()("-C", path, "rev-parse", "--show-toplevel").strip())
+
+
+def _index_lock(path: Path) -> AbstractContextManager[Any]:
+    """Get the lock of the Git index of the repository that holds a path."""
+    key = zlib.crc32(os.fsencode(_repo_top(path)))
+    return _index_locks[key % len(_index_locks)]
+
+
+def _update(result: UpdateResult, cache: Path, options: AnyByStrDict) -> UpdateResult:
+    """Update a subproject, in a process of the batch.
+
+    Args:
+        result: Result of the subproject, to fill.
+        cache: Folder where the templates are shared by the processes.
+        options: Arguments for [run_update][copier.run_update].
+    """
+    assert _index_locks
+    start = time.perf_counter()
+    try:
+        with (
+            sharing_git_index(_index_lock),
+            sharing_template_cache(cache),
+            reusing_mirrors(),
+        ):
+            worker = run_update(
+                result.dst_path,
+                answers_file=result.answers_file,
+                vcs_ref=result.to_ref,
+                defaults=True,
+                overwrite=True,
+                quiet=True,
+                **options,
+            )
+        result.conflicts = worker.conflicts
+        result.status = "conflicted" if result.conflicts else "updated"
+    except Exception as error:  # noqa: BLE001
+        result.error = str(error)
+    result.duration = time.perf_counter() - start
+    return result
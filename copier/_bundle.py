@@ -0,0 +1,199 @@
+"""Precompiled template bundles.
+
+A bundle is a directory produced by `copier compile` from a template checkout:
+
+```
+<bundle>/
+├── copier-bundle.yml  # Manifest, with the parsed and merged template config
+├── compiled/          # Jinja templates compiled to Python modules
+└── template/          # Template files, loaded when a compiled module is unusable
+```
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, field
+from importlib.metadata import version
+from pathlib import Path, PurePosixPath
+
+import yaml
+from jinja2 import Environment, ModuleLoader
+from jinja2.exceptions import TemplateSyntaxError
+from pydantic import ValidationError
+from pydantic.dataclasses import dataclass
+
+from . import _yaml
+from ._tools import copier_version
+from ._types import AnyByStrDict
+from .errors import InvalidConfigFileError, UnsupportedVersionError
+
+# Increase it on any backwards-incompatible change to the bundle layout
+BUNDLE_FORMAT = 1
+BUNDLE_MANIFEST = "copier-bundle.yml"
+BUNDLE_COMPILED_DIR = "compiled"
+BUNDLE_TEMPLATE_DIR = "template"
+
+
+@dataclass
+class BundleManifest:
+    """Contents of the manifest of a template bundle.
+
+    Attributes:
+        format:
+            Version of the bundle layout.
+
+        copier_version:
+            Version of Copier that compiled the bundle.
+
+        jinja_version:
+            Version of Jinja that compiled the templates.
+
+        source:
+            Origin of the template checkout.
+
+        commit:
+            Commit description of the template checkout, if it was Git-tracked.
+
+        modes:
+            File modes recorded in the Git index of the template checkout, keyed
+            by POSIX path relative to the template root.
+
+        config:
+            Template config, with all `!include` tags already expanded.
+    """
+
+    format: int
+    copier_version: str
+    jinja_version: str
+    source: str | None = None
+    commit: str | None = None
+    modes: dict[str, int] = field(default_factory=dict)
+    config: AnyByStrDict = field(default_factory=dict)
+
+    @property
+    def compiled_templates_usable(self) -> bool:
+        """Whether compiled templates match the running Copier and Jinja versions."""
+        return self.copier_version == str(copier_version()) and (
+            self.jinja_version == version("jinja2")
+        )
+
+
+def load_bundle_manifest(root: Path) -> BundleManifest | None:
+    """Load the manifest of a template bundle.
+
+    Args:
+        root: Path that could be a template bundle.
+
+    Returns:
+        The bundle manifest, or `None` if `root` is not a template bundle.
+    """
+    manifest_path = root / BUNDLE_MANIFEST
+    if not manifest_path.is_file():
+        return None
+    return parse_bundle_manifest(manifest_path.read_bytes(), manifest_path)
+
+
+def parse_bundle_manifest(contents: bytes, manifest_path: Path) -> BundleManifest:
+    """Parse the manifest of a template bundle.
+
+    Args:
+        contents: Contents of the manifest file.
+        manifest_path: Path of the manifest file, used in errors.
+    """
+    try:
+        manifest = BundleManifest(**_yaml.load(contents))
+    except (TypeError, ValidationError, yaml.YAMLError) as error:
+        raise InvalidConfigFileError(manifest_path, False) from error
+    if manifest.format != BUNDLE_FORMAT:
+        raise UnsupportedVersionError(
+            f"Template bundle format {manifest.format} is not supported by this "
+            f"Copier version, which supports format {BUNDLE_FORMAT}. "
+            "Compile the template again with this Copier version."
+        )
+    return manifest
+
+
+def write_bundle(
+    dst: Path,
+    *,
+    template_root: Path,
+    env: Environment,
+    templates_suffix: str,
+    config: AnyByStrDict,
+    modes: Mapping[PurePosixPath, int],
+    source: str,
+    commit: str | None,
+) -> None:
+    """Write a template bundle.
+
+    Args:
+        dst:
+            Where to write the bundle. It must not exist or be empty.
+
+        template_root:
+            Root of the template checkout.
+
+        env:
+            Jinja environment used to compile the templates, configured as it would
+            be to render them.
+
+        templates_suffix:
+            Suffix of the files that are rendered as Jinja templates.
+
+        config:
+            Template config, with all `!include` tags already expanded.
+
+        modes:
+            File modes recorded in the Git index of the template checkout.
+
+        source:
+            Origin of the template checkout.
+
+        commit:
+            Commit description of the template checkout, if any.
+    """
+    template_dst = dst / BUNDLE_TEMPLATE_DIR
+    shutil.copytree(
+        template_root,
+        template_dst,
+        symlinks=True,
+        ignore=lambda path, _: [".git"] if Path(path) == template_root else [],
+    )
+    compiled_dst = dst / BUNDLE_COMPILED_DIR
+    compiled_dst.mkdir()
+    for name in _template_names(template_dst, templates_suffix):
+        try:
+            source_code = (template_dst / name).read_text("utf-8")
+            code = env.compile(source_code, name, raw=True, defer_init=True)
+        except (UnicodeDecodeError, TemplateSyntaxError):
+            # Not a valid template; it will fail or be copied as usual at render time
+            continue
+        (compiled_dst / ModuleLoader.get_module_filename(name)).write_text(
+            code, "utf-8"
+        )
+    manifest = BundleManifest(
+        format=BUNDLE_FORMAT,
+        copier_version=str(copier_version()),
+        jinja_version=version("jinja2"),
+        config=config,
+        modes={path.as_posix(): mode for path, mode in modes.items()},
+        source=source,
+        commit=commit,
+    )
+    # Write the manifest last; it is what turns the directory into a bundle
+    (dst / BUNDLE_MANIFEST).write_text(
+        _yaml.safe_dump(asdict(manifest), allow_unicode=True, sort_keys=False),
+        "utf-8",
+    )
+
+
+def _template_names(root: Path, templates_suffix: str) -> Iterable[str]:
+    """Get the names of the files that would be loaded as Jinja templates."""
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(dirpath, filename)
+            if path.name.endswith(templates_suffix) and not path.is_symlink():
+                yield path.relative_to(root).as_posix()
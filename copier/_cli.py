@@ -1,6 +1,6 @@
 """Command line entrypoint. This module declares the Copier CLI applications.
 
-Basically, there are 4 different commands you can run:
+Basically, there are 6 different commands you can run:
 
 -   `copier`, the main app, which is a shortcut for the
     `copy` and `update` subapps.
@@ -48,6 +48,31 @@ Basically, there are 4 different commands you can run:
         copier check-update
         ```
 
+-   `copier batch-update` to update many preexisting
+    projects at once, such as all those in a monorepo.
+
+    !!! example
+
+        ```sh
+        copier batch-update --recursive .
+        ```
+
+-   `copier compile` to precompile a template into a bundle.
+
+    !!! example
+
+        ```sh
+        copier compile gh:copier-org/autopretty autopretty-bundle
+        ```
+
+-   `copier inspect` to print the metadata of a template as JSON.
+
+    !!! example
+
+        ```sh
+        copier inspect gh:copier-org/autopretty
+        ```
+
 Below are the docs of each one of those.
 
 CLI help generated from `copier --help-all`:
@@ -59,19 +84,25 @@ copier --help-all
 
 import json
 import sys
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
+from contextlib import ExitStack
+from functools import partial
 from pathlib import Path
 from textwrap import dedent
-from typing import Literal, cast
+from typing import IO, TYPE_CHECKING, Literal, cast
 
-import yaml
 from plumbum import LocalPath, cli, colors
 
-from ._main import get_update_data, run_copy, run_recopy, run_update
+from . import _yaml
+from ._events import Event, EventCallback
+from ._sinks import Sink, TarSink, ZipSink
 from ._tools import copier_version, try_enum
 from ._types import AnyByStrDict, VcsRef
 from .errors import UnsafeTemplateError, UserMessageError
 
+if TYPE_CHECKING:
+    from ._batch import Destination
+
 
 def _handle_exceptions(method: Callable[[], int | None]) -> int:
     """Handle exceptions while running a method."""
@@ -92,6 +123,60 @@ def _handle_exceptions(method: Callable[[], int | None]) -> int:
     return 0
 
 
+def _archive_sink(archive: str, stack: ExitStack) -> Sink:
+    """Open a sink that writes an archive, with the format given by its name.
+
+    Args:
+        archive: Path of the archive, or `-` to write a gzipped tar to stdout.
+        stack: Context where the archive file and the sink are closed.
+    """
+    name = archive.lower()
+    sink_type: Callable[[IO[bytes]], Sink]
+    if name == "-" or name.endswith((".tar.gz", ".tgz")):
+        sink_type = TarSink
+    elif name.endswith(".tar"):
+        sink_type = partial(TarSink, compression="")
+    elif name.endswith((".tar.bz2", ".tbz2")):
+        sink_type = partial(TarSink, compression="bz2")
+    elif name.endswith((".tar.xz", ".txz")):
+        sink_type = partial(TarSink, compression="xz")
+    elif name.endswith(".zip"):
+        sink_type = ZipSink
+    else:
+        raise UserMessageError(
+            f"Unknown archive format for `{archive}`. "
+            "Use `.zip`, `.tar`, `.tar.gz`, `.tar.bz2` or `.tar.xz`."
+        )
+    if archive == "-":
+        return stack.enter_context(sink_type(sys.stdout.buffer))
+    return stack.enter_context(sink_type(stack.enter_context(Path(archive).open("wb"))))
+
+
+def _open_text_output(path: str, stack: ExitStack) -> IO[str]:
+    """Open a text file to write into, or stdout if `path` is `-`."""
+    if path == "-":
+        return sys.stdout
+    return stack.enter_context(Path(path).open("w"))
+
+
+def _event_writer(events: str | None, stack: ExitStack) -> EventCallback | None:
+    """Open a callback that writes progress events as JSON lines.
+
+    Args:
+        events: Path of the file, or `-` to write to stdout.
+        stack: Context where the file is closed.
+    """
+    if events is None:
+        return None
+    stream = _open_text_output(events, stack)
+
+    def _write(event: Event) -> None:
+        stream.write(json.dumps(event.to_dict()) + "\n")
+        stream.flush()
+
+    return _write
+
+
 class CopierApp(cli.Application):
     """The Copier CLI application."""
 
@@ -110,7 +195,12 @@ class CopierApp(cli.Application):
                 """
         )
     )
-    VERSION = str(copier_version())
+
+    @property
+    def VERSION(self) -> str:  # type: ignore[override]
+        """Version of Copier, only looked up when shown."""
+        return str(copier_version())
+
     CALL_MAIN_IF_NESTED_COMMAND = False
 
 
@@ -173,6 +263,47 @@ class _Subcommand(cli.Application):
         default=False,
         help="Skip template tasks execution",
     )
+    force_tasks = cli.Flag(
+        ["--force-tasks"],
+        default=False,
+        help="Run template tasks even if their declared inputs didn't change",
+    )
+    profile = cli.SwitchAttr(
+        ["--profile"],
+        str,
+        default=None,
+        help=(
+            "Write a JSON report of the time spent in each step into this file, "
+            "and a Chrome trace of those steps beside it"
+        ),
+    )
+    trace_git = cli.SwitchAttr(
+        ["--trace-git"],
+        str,
+        default=None,
+        help=(
+            "Log every git command run into this file, as JSON lines, "
+            "and print a summary of them at the end"
+        ),
+    )
+    events = cli.SwitchAttr(
+        ["--events"],
+        str,
+        default=None,
+        help=(
+            "Write progress events into this file as JSON lines; use `-` to "
+            "write them to stdout instead of the usual output"
+        ),
+    )
+    task_jobs = cli.SwitchAttr(
+        ["--task-jobs"],
+        cli.Range(1, 256),
+        default=1,
+        help=(
+            "Maximum number of template tasks and migrations to run at once, "
+            "when their dependencies allow it"
+        ),
+    )
 
     @cli.switch(
         ["-d", "--data"],
@@ -203,8 +334,7 @@ class _Subcommand(cli.Application):
         Arguments:
             path: The path to the YAML file to load.
         """
-        with Path(path).open("rb") as f:
-            file_updates: AnyByStrDict = yaml.safe_load(f)
+        file_updates: AnyByStrDict = _yaml.load(Path(path).read_bytes())
 
         updates_without_cli_overrides = {
             k: v for k, v in file_updates.items() if k not in self.data
@@ -248,6 +378,15 @@ class CopierCopySubApp(_Subcommand):
             "skipped by other options"
         ),
     )
+    archive = cli.SwitchAttr(
+        ["--archive"],
+        str,
+        help=(
+            "Render the project into a zip or tar archive instead of the "
+            "destination, which only names the project; use `-` to write a "
+            "gzipped tar archive to stdout"
+        ),
+    )
 
     def main(self, template_src: str, destination_path: str) -> int:
         """Call [run_copy][copier.run_copy].
@@ -263,24 +402,41 @@ class CopierCopySubApp(_Subcommand):
         """
 
         def inner() -> None:
-            run_copy(
-                template_src,
-                destination_path,
-                data=self.data,
-                answers_file=self.answers_file,
-                vcs_ref=try_enum(VcsRef, self.vcs_ref),
-                exclude=self.exclude,
-                use_prereleases=self.prereleases,
-                skip_if_exists=self.skip,
-                cleanup_on_error=self.cleanup_on_error,
-                defaults=self.force or self.defaults,
-                overwrite=self.force or self.overwrite,
-                pretend=self.pretend,
-                quiet=self.quiet,
-                unsafe=self.unsafe,
-                skip_tasks=self.skip_tasks,
-                ask=self.ask,
-            )
+            # The main module is slow to import, and `--help` doesn't need it
+            from ._main import run_copy
+
+            if self.archive == "-" and self.events == "-":
+                raise UserMessageError(
+                    "Cannot write both the archive and the events to stdout."
+                )
+            with ExitStack() as stack:
+                sink = _archive_sink(self.archive, stack) if self.archive else None
+                run_copy(
+                    template_src,
+                    destination_path,
+                    data=self.data,
+                    answers_file=self.answers_file,
+                    vcs_ref=try_enum(VcsRef, self.vcs_ref),
+                    exclude=self.exclude,
+                    use_prereleases=self.prereleases,
+                    skip_if_exists=self.skip,
+                    cleanup_on_error=self.cleanup_on_error,
+                    defaults=self.force or self.defaults,
+                    overwrite=self.force or self.overwrite,
+                    pretend=self.pretend,
+                    # Output to stdout would corrupt the archive or events
+                    # written there
+                    quiet=self.quiet or "-" in {self.archive, self.events},
+                    unsafe=self.unsafe,
+                    skip_tasks=self.skip_tasks,
+                    task_jobs=self.task_jobs,
+                    force_tasks=self.force_tasks,
+                    profile=self.profile,
+                    trace_git=self.trace_git,
+                    on_event=_event_writer(self.events, stack),
+                    ask=self.ask,
+                    sink=sink,
+                )
 
         return _handle_exceptions(inner)
 
@@ -351,23 +507,31 @@ class CopierRecopySubApp(_Subcommand):
         """
 
         def inner() -> None:
-            run_recopy(
-                destination_path,
-                data=self.data,
-                answers_file=self.answers_file,
-                vcs_ref=try_enum(VcsRef, self.vcs_ref),
-                exclude=self.exclude,
-                use_prereleases=self.prereleases,
-                skip_if_exists=self.skip,
-                defaults=self.force or self.defaults,
-                overwrite=self.force or self.overwrite,
-                pretend=self.pretend,
-                quiet=self.quiet,
-                unsafe=self.unsafe,
-                skip_answered=self.skip_answered,
-                skip_tasks=self.skip_tasks,
-                ask=self.ask,
-            )
+            from ._main import run_recopy
+
+            with ExitStack() as stack:
+                run_recopy(
+                    destination_path,
+                    data=self.data,
+                    answers_file=self.answers_file,
+                    vcs_ref=try_enum(VcsRef, self.vcs_ref),
+                    exclude=self.exclude,
+                    use_prereleases=self.prereleases,
+                    skip_if_exists=self.skip,
+                    defaults=self.force or self.defaults,
+                    overwrite=self.force or self.overwrite,
+                    pretend=self.pretend,
+                    quiet=self.quiet or self.events == "-",
+                    unsafe=self.unsafe,
+                    skip_answered=self.skip_answered,
+                    skip_tasks=self.skip_tasks,
+                    task_jobs=self.task_jobs,
+                    force_tasks=self.force_tasks,
+                    profile=self.profile,
+                    trace_git=self.trace_git,
+                    on_event=_event_writer(self.events, stack),
+                    ask=self.ask,
+                )
 
         return _handle_exceptions(inner)
 
@@ -444,25 +608,33 @@ class CopierUpdateSubApp(_Subcommand):
         """
 
         def inner() -> None:
-            run_update(
-                destination_path,
-                data=self.data,
-                answers_file=self.answers_file,
-                vcs_ref=try_enum(VcsRef, self.vcs_ref),
-                exclude=self.exclude,
-                use_prereleases=self.prereleases,
-                skip_if_exists=self.skip,
-                defaults=self.defaults,
-                overwrite=True,
-                pretend=self.pretend,
-                quiet=self.quiet,
-                conflict=cast(Literal["rej", "inline"], self.conflict),
-                context_lines=self.context_lines,
-                unsafe=self.unsafe,
-                skip_answered=self.skip_answered,
-                skip_tasks=self.skip_tasks,
-                ask=self.ask,
-            )
+            from ._main import run_update
+
+            with ExitStack() as stack:
+                run_update(
+                    destination_path,
+                    data=self.data,
+                    answers_file=self.answers_file,
+                    vcs_ref=try_enum(VcsRef, self.vcs_ref),
+                    exclude=self.exclude,
+                    use_prereleases=self.prereleases,
+                    skip_if_exists=self.skip,
+                    defaults=self.defaults,
+                    overwrite=True,
+                    pretend=self.pretend,
+                    quiet=self.quiet or self.events == "-",
+                    conflict=cast(Literal["rej", "inline"], self.conflict),
+                    context_lines=self.context_lines,
+                    unsafe=self.unsafe,
+                    skip_answered=self.skip_answered,
+                    skip_tasks=self.skip_tasks,
+                    task_jobs=self.task_jobs,
+                    force_tasks=self.force_tasks,
+                    profile=self.profile,
+                    trace_git=self.trace_git,
+                    on_event=_event_writer(self.events, stack),
+                    ask=self.ask,
+                )
 
         return _handle_exceptions(inner)
 
@@ -486,6 +658,11 @@ class CopierCheckUpdateSubApp(cli.Application):
         If that file contains also `_commit` and `destination_path` is a git
         repository, this command will do its best to determine whether a newer
         version is available, applying PEP 440 to the template's history.
+
+        Several destinations can be checked at once: pass many paths, find them
+        below each path with `--recursive`, or read them from `--input`. Then
+        destinations are grouped by template, each template is resolved only
+        once, and a JSON report with a result for each destination is printed.
         """
     )
 
@@ -514,22 +691,47 @@ class CopierCheckUpdateSubApp(cli.Application):
         default="plain",
         help="Output format, either 'plain' (the default) or 'json'.",
     )
+    recursive = cli.Flag(
+        ["-R", "--recursive"],
+        help=(
+            "Check every subproject found below the destination paths, by its "
+            "answers file"
+        ),
+    )
+    input_path = cli.SwitchAttr(
+        ["--input"],
+        default=None,
+        help=(
+            "Also check the destinations in this file of JSON lines, with a "
+            "`dst_path` and an optional `answers_file` each; use `-` for stdin"
+        ),
+    )
+    jobs = cli.SwitchAttr(
+        ["-j", "--jobs"],
+        cli.Range(1, 256),
+        default=8,
+        help="Maximum number of templates to check at once, with many destinations",
+    )
 
-    def main(self, destination_path: str = ".") -> int:
+    def main(self, *destination_paths: str) -> int:
         """Call get_update_data, parse its output, and write to console.
 
         Parameters:
-            destination_path:
+            destination_paths:
                 Only the destination path is needed to check, because the
                 `src_path` comes from [the answers file][the-copier-answersyml-file].
 
-                The subproject must exist. If not specified, the currently
+                The subprojects must exist. If not specified, the currently
                 working directory is used.
         """
+        if self.recursive or self.input_path is not None or len(destination_paths) > 1:
+            return _handle_exceptions(lambda: self._check_many(destination_paths))
 
         def inner() -> int:
+            from ._main import get_update_data
+
             update_available, current_version, latest_version = get_update_data(
-                dst_path=destination_path,
+                dst_path=destination_paths[0] if destination_paths else ".",
                 answers_file=self.answers_file,
                 use_prereleases=self.prereleases,
             )
@@ -565,3 +767,338 @@ class CopierCheckUpdateSubApp(cli.Application):
             return 0
 
         return _handle_exceptions(inner)
+
+    def _check_many(self, destination_paths: Sequence[str]) -> int:
+        """Check many destinations, and print a JSON report.
+
+        Returns:
+            1 if a destination couldn't be checked, 2 if in quiet mode and an
+            update is available, otherwise 0.
+        """
+        from ._batch import check_updates
+
+        destinations = _collect_destinations(
+            destination_paths, self.answers_file, self.recursive, self.input_path
+        )
+        checks = check_updates(destinations, self.prereleases, self.jobs)
+        if not self.quiet:
+            # TODO Unify printing tools
+            print(json.dumps([check.to_dict() for check in checks], indent=2))
+        if any(check.error for check in checks):
+            return 1
+        if self.quiet and any(check.update_available for check in checks):
+            return 2
+        return 0
+
+
+def _collect_destinations(
+    destination_paths: Sequence[str],
+    answers_file: str | None,
+    recursive: bool,
+    input_path: str | None,
+) -> "list[Destination]":
+    """Collect the destinations given to a subcommand that handles many of them.
+
+    Parameters:
+        destination_paths: Paths given in the command line; the current
+            directory if none, and no `input_path` either.
+        answers_file: Answers file path to use, unless the input gives one.
+        recursive: Find the subprojects below each path, by their answers file.
+        input_path: File of JSON lines with more destinations; `-` for stdin.
+    """
+    from ._batch import Destination, find_destinations, read_destinations
+
+    answers_path = None if answers_file is None else Path(answers_file)
+    destinations = []
+    if input_path == "-":
+        destinations += read_destinations(sys.stdin)
+    elif input_path is not None:
+        with Path(input_path).open() as input_file:
+            destinations += read_destinations(input_file)
+    destinations = [
+        Destination(destination.dst_path, destination.answers_file or answers_path)
+        for destination in destinations
+    ]
+    if not destination_paths and input_path is None:
+        destination_paths = (".",)
+    for path in destination_paths:
+        if recursive:
+            destinations += find_destinations(path, answers_path)
+        else:
+            destinations.append(Destination(Path(path), answers_path))
+    return destinations
+
+
+@CopierApp.subcommand("batch-update")
+class CopierBatchUpdateSubApp(cli.Application):
+    """The `copier batch-update` subcommand.
+
+    Use this subcommand to update many existing subprojects at once, such as
+    all those in a monorepo.
+    """
+
+    DESCRIPTION = "Update many subprojects from their original templates"
+    DESCRIPTION_MORE = dedent(
+        """\
+        Pass many paths, find the subprojects below each path with `--recursive`,
+        or read them from `--input`. Each subproject is updated like with
+        `copier update --defaults`, in its own process, and a JSON report with a
+        result for each subproject is printed.
+
+        Subprojects are grouped by template, so each template version is fetched
+        and parsed only once. A subproject that fails or ends with conflicts
+        doesn't stop the others.
+        """
+    )
+
+    answers_file = cli.SwitchAttr(
+        ["-a", "--answers-file"],
+        default=None,
+        help=(
+            "Update using this path (relative to each destination) to find the "
+            "answers file"
+        ),
+    )
+    vcs_ref = cli.SwitchAttr(
+        ["-r", "--vcs-ref"],
+        str,
+        help=(
+            "Git reference to update to. If you do not specify it, the latest git "
+            "tag of each template, as sorted using the PEP 440 algorithm. Use the "
+            "special value `:current:` to keep the current reference."
+        ),
+    )
+    prereleases = cli.Flag(
+        ["-g", "--prereleases"],
+        help="Use prereleases to compare template VCS tags.",
+    )
+    exclude = cli.SwitchAttr(
+        ["-x", "--exclude"],
+        str,
+        list=True,
+        help=(
+            "A name or shell-style pattern matching files or folders "
+            "that must not be copied"
+        ),
+    )
+    skip = cli.SwitchAttr(
+        ["-s", "--skip"],
+        str,
+        list=True,
+        help="Skip specified files if they exist already",
+    )
+    pretend = cli.Flag(["-n", "--pretend"], help="Run but do not make any changes")
+    conflict = cli.SwitchAttr(
+        ["-o", "--conflict"],
+        cli.Set("rej", "inline"),
+        default="inline",
+        help=(
+            "Behavior on conflict: Create .rej files, or add inline conflict markers."
+        ),
+    )
+    context_lines = cli.SwitchAttr(
+        ["-c", "--context-lines"],
+        int,
+        default=3,
+        help=(
+            "Lines of context to use for detecting conflicts. Increase for "
+            "accuracy, decrease for resilience."
+        ),
+    )
+    unsafe = cli.Flag(
+        ["--UNSAFE", "--trust"],
+        help=(
+            "Allow templates with unsafe features (Jinja extensions, migrations, tasks)"
+        ),
+    )
+    skip_tasks = cli.Flag(
+        ["-T", "--skip-tasks"],
+        default=False,
+        help="Skip template tasks execution",
+    )
+    recursive = cli.Flag(
+        ["-R", "--recursive"],
+        help="Update every subproject found below the destination paths",
+    )
+    input_path = cli.SwitchAttr(
+        ["--input"],
+        default=None,
+        help=(
+            "Also update the destinations in this file of JSON lines, with a "
+            "`dst_path` and an optional `answers_file` each; use `-` for stdin"
+        ),
+    )
+    jobs = cli.SwitchAttr(
+        ["-j", "--jobs"],
+        cli.Range(1, 256),
+        default=None,
+        help="Maximum number of subprojects to update at once; the CPUs by default",
+    )
+    quiet = cli.Flag(["-q", "--quiet"], help="Suppress the JSON report")
+
+    def __init__(self, executable: str | None = None) -> None:
+        self.data: AnyByStrDict = {}
+        super().__init__(executable)
+
+    @cli.switch(
+        ["-d", "--data"],
+        str,
+        "VARIABLE=VALUE",
+        list=True,
+        help="Make VARIABLE available as VALUE when rendering the templates",
+    )
+    def data_switch(self, values: Iterable[str]) -> None:
+        """Update [data][] with provided values.
+
+        Arguments:
+            values: The list of values to apply.
+                Each value in the list is of the following form: `NAME=VALUE`.
+        """
+        for arg in values:
+            key, value = arg.split("=", 1)
+            self.data[key] = value
+
+    def main(self, *destination_paths: str) -> int:
+        """Call [run_batch_update][copier.run_batch_update], and print its report.
+
+        Parameters:
+            destination_paths:
+                The subprojects to update, or where to find them with
+                `--recursive`. If not specified, the currently working
+                directory is used.
+
+        Returns:
+            1 if a subproject couldn't be updated, otherwise 0.
+        """
+
+        def inner() -> int:
+            from ._batch import run_batch_update
+
+            results = run_batch_update(
+                _collect_destinations(
+                    destination_paths,
+                    self.answers_file,
+                    self.recursive,
+                    self.input_path,
+                ),
+                data=self.data,
+                vcs_ref=try_enum(VcsRef, self.vcs_ref),
+                use_prereleases=self.prereleases,
+                exclude=self.exclude,
+                skip_if_exists=self.skip,
+                pretend=self.pretend,
+                conflict=cast(Literal["rej", "inline"], self.conflict),
+                context_lines=self.context_lines,
+                unsafe=self.unsafe,
+                skip_tasks=self.skip_tasks,
+                jobs=self.jobs,
+            )
+            if not self.quiet:
+                # TODO Unify printing tools
+                print(json.dumps([result.to_dict() for result in results], indent=2))
+            return 1 if any(result.status == "failed" for result in results) else 0
+
+        return _handle_exceptions(inner)
+
+
+@CopierApp.subcommand("compile")
+class CopierCompileSubApp(cli.Application):
+    """The `copier compile` subcommand.
+
+    Use this subcommand to precompile a template into a bundle, which Copier can
+    generate projects from without parsing its config or compiling its Jinja
+    templates again.
+    """
+
+    DESCRIPTION = "Precompile a template into a bundle."
+
+    vcs_ref = cli.SwitchAttr(
+        ["-r", "--vcs-ref"],
+        str,
+        help=(
+            "Git reference to checkout in `template_src`. "
+            "If you do not specify it, it will try to checkout the latest git tag, "
+            "as sorted using the PEP 440 algorithm. If you want to checkout always "
+            "the latest version, use `--vcs-ref=HEAD`."
+        ),
+    )
+    prereleases = cli.Flag(
+        ["-g", "--prereleases"],
+        help="Use prereleases to compare template VCS tags.",
+    )
+    unsafe = cli.Flag(
+        ["--UNSAFE", "--trust"],
+        help="Allow templates with unsafe features (Jinja extensions)",
+    )
+
+    def main(self, template_src: str, destination_path: str) -> int:
+        """Call [compile_template][copier._main.compile_template].
+
+        Params:
+            template_src:
+                Indicate where to get the template from.
+
+                This can be a git URL or a local path.
+
+            destination_path:
+                Where to write the bundle. It must not exist or be empty.
+        """
+
+        def inner() -> None:
+            from ._main import compile_template
+
+            compile_template(
+                template_src,
+                destination_path,
+                vcs_ref=self.vcs_ref,
+                use_prereleases=self.prereleases,
+                unsafe=self.unsafe,
+            )
+
+        return _handle_exceptions(inner)
+
+
+@CopierApp.subcommand("inspect")
+class CopierInspectSubApp(cli.Application):
+    """The `copier inspect` subcommand.
+
+    Use this subcommand to print the metadata of a template as JSON, without
+    checking it out.
+    """
+
+    DESCRIPTION = "Print the metadata of a template as JSON."
+
+    vcs_ref = cli.SwitchAttr(
+        ["-r", "--vcs-ref"],
+        str,
+        help=(
+            "Git reference to inspect in `template_src`. "
+            "If you do not specify it, it will inspect the latest git tag, "
+            "as sorted using the PEP 440 algorithm."
+        ),
+    )
+    prereleases = cli.Flag(
+        ["-g", "--prereleases"],
+        help="Use prereleases to compare template VCS tags.",
+    )
+
+    def main(self, template_src: str) -> int:
+        """Call [inspect_template][copier._main.inspect_template].
+
+        Params:
+            template_src:
+                Indicate where to get the template from.
+
+                This can be a git URL or a local path.
+        """
+
+        def inner() -> None:
+            from ._main import inspect_template
+
+            metadata = inspect_template(
+                template_src, self.vcs_ref, use_prereleases=self.prereleases
+            )
+            # TODO Unify printing tools
+            print(json.dumps(metadata, indent=2))
+
+        return _handle_exceptions(inner)
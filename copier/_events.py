@@ -0,0 +1,184 @@
+"""Progress events of a Copier run, for hosts that embed it.
+
+Pass a callback as [on_event][] to receive them. Events are only built while a
+callback is listening; see [listening][copier._events.listening].
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, ClassVar, Literal
+
+FileStatus = Literal["planned", "created", "overwritten", "identical", "skipped"]
+"""What happened to a rendered path.
+
+It's `planned` before it's rendered, and one of the others after.
+"""
+
+
+@dataclass(frozen=True)
+class Event:
+    """Base class of all progress events."""
+
+    type: ClassVar[str]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the event into JSON-serializable data, with its `type`."""
+        return {"type": self.type, **asdict(self)}
+
+
+@dataclass(frozen=True)
+class StepStarted(Event):
+    """A step of the run started.
+
+    Attributes:
+        name: What is being done, such as `run_update`, `render`, `clone` or
+            `old copy`.
+        category: Kind of step: `operation`, `phase`, `git` or `update`.
+    """
+
+    type: ClassVar[str] = "step_started"
+
+    name: str
+    category: str
+
+
+@dataclass(frozen=True)
+class StepFinished(Event):
+    """A step of the run finished.
+
+    Attributes:
+        name: What was done.
+        category: Kind of step.
+        duration: Wall clock duration, in seconds.
+        ok: Whether it finished without errors.
+    """
+
+    type: ClassVar[str] = "step_finished"
+
+    name: str
+    category: str
+    duration: float
+    ok: bool
+
+
+@dataclass(frozen=True)
+class FileEvent(Event):
+    """A path is about to be rendered, or was rendered.
+
+    Attributes:
+        path: Path relative to the destination, with `/` separators.
+        kind: Whether it's a `file`, `dir` or `symlink`.
+        status: What happened to it.
+        size: Size of the rendered file contents, in bytes.
+        duration: Wall clock time spent rendering it, in seconds.
+    """
+
+    type: ClassVar[str] = "file"
+
+    path: str
+    kind: str
+    status: FileStatus
+    size: int | None = None
+    duration: float | None = None
+
+
+@dataclass(frozen=True)
+class Totals(Event):
+    """Summary of the paths rendered by an operation, when it ends.
+
+    Attributes:
+        operation: Name of the operation, such as `run_copy`.
+        created: Number of paths created.
+        overwritten: Number of paths overwritten.
+        identical: Number of paths that were already up to date.
+        skipped: Number of paths left untouched, because of `skip_if_exists`
+            or because the user didn't want to overwrite them.
+        bytes: Total size of the files created or overwritten.
+    """
+
+    type: ClassVar[str] = "totals"
+
+    operation: str
+    created: int = 0
+    overwritten: int = 0
+    identical: int = 0
+    skipped: int = 0
+    bytes: int = 0
+
+
+@dataclass(frozen=True)
+class TaskStarted(Event):
+    """A task or migration started.
+
+    Attributes:
+        position: Position of the task among the declared ones, from 0.
+        total: Number of declared tasks.
+        cmd: Rendered command.
+    """
+
+    type: ClassVar[str] = "task_started"
+
+    position: int
+    total: int
+    cmd: str | list[str]
+
+
+@dataclass(frozen=True)
+class TaskFinished(Event):
+    """A task or migration finished.
+
+    Attributes:
+        position: Position of the task among the declared ones, from 0.
+        total: Number of declared tasks.
+        cmd: Rendered command.
+        returncode: Exit code, or `None` if it didn't run.
+        duration: Wall clock duration, in seconds.
+        up_to_date: It didn't run, because its inputs didn't change.
+    """
+
+    type: ClassVar[str] = "task_finished"
+
+    position: int
+    total: int
+    cmd: str | list[str]
+    returncode: int | None
+    duration: float
+    up_to_date: bool = False
+
+
+EventCallback = Callable[[Event], None]
+"""Function that receives the progress events."""
+
+_callback: ContextVar[EventCallback | None] = ContextVar("_callback", default=None)
+
+
+def emitting() -> bool:
+    """Tell if a callback is listening, so events are worth building."""
+    return _callback.get() is not None
+
+
+def emit(event: Event) -> None:
+    """Send an event to the listening callback, if any."""
+    callback = _callback.get()
+    if callback is not None:
+        callback(event)
+
+
+@contextmanager
+def listening(callback: EventCallback | None) -> Iterator[None]:
+    """Send the events emitted in the context to `callback`.
+
+    If `callback` is `None`, the current one, if any, keeps listening.
+    """
+    if callback is None:
+        yield
+        return
+    token = _callback.set(callback)
+    try:
+        yield
+    finally:
+        _callback.reset(token)
@@ -0,0 +1,327 @@
+"""Accounting of the Git commands that Copier runs.
+
+Every Git command comes from [get_git][copier._vcs.get_git], which wraps it in a
+[TracedCommand][copier._gittrace.TracedCommand]. While
+[tracing_git][copier._gittrace.tracing_git] is active, each finished command is
+counted and timed, and optionally logged to a trace file. Commands still running
+when tracing stops, like the one that reads a Git template, are accounted then.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from plumbum import local
+from plumbum.commands.base import BaseCommand
+
+if sys.version_info < (3, 11):
+    from typing_extensions import Self
+else:
+    from typing import Self
+
+TRACE_GIT_ENV_VAR = "COPIER_TRACE_GIT"
+"""Environment variable with the path of a Git trace file, like `--trace-git`."""
+
+# Global options of git that take a separate value
+_OPTIONS_WITH_VALUE = frozenset(
+    {"-C", "-c", "--git-dir", "--work-tree", "--namespace", "--exec-path"}
+)
+
+
+def subcommand(argv: Sequence[str]) -> str:
+    """Get the subcommand of a git command line, like `diff` or `ls-files`."""
+    args = iter(argv[1:])
+    for arg in args:
+        if arg in _OPTIONS_WITH_VALUE:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return ""
+
+
+@dataclass(frozen=True)
+class GitCall:
+    """A Git command, accounted when it finished or when tracing stopped.
+
+    Attributes:
+        argv: Command line.
+        cwd: Working directory.
+        start: When it started, as a Unix timestamp.
+        duration: Wall clock duration, in seconds.
+        returncode: Exit code, or `None` if it was still running.
+        stdout_bytes: Size of its standard output read so far.
+        stderr_bytes: Size of its captured standard error.
+    """
+
+    argv: list[str]
+    cwd: str
+    start: float
+    duration: float
+    returncode: int | None
+    stdout_bytes: int
+    stderr_bytes: int
+
+    @property
+    def subcommand(self) -> str:
+        """Git subcommand, like `diff` or `ls-files`."""
+        return subcommand(self.argv)
+
+
+@dataclass
+class GitTracer:
+    """Collector of the Git commands run while tracing.
+
+    Attributes:
+        calls: Accounted commands.
+        trace: Where to log each command as a JSON line, as soon as it ends.
+    """
+
+    calls: list[GitCall] = field(default_factory=list)
+    trace: IO[str] | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    # Callbacks to account each command still running, by process ID
+    _running: dict[int, Callable[[], None]] = field(default_factory=dict, init=False)
+
+    def record(self, call: GitCall) -> None:
+        """Account a finished command."""
+        with self._lock:
+            self.calls.append(call)
+            if self.trace is not None:
+                self.trace.write(
+                    json.dumps(
+                        {
+                            "subcommand": call.subcommand,
+                            "argv": call.argv,
+                            "cwd": call.cwd,
+                            "start": call.start,
+                            "duration": call.duration,
+                            "returncode": call.returncode,
+                            "stdout_bytes": call.stdout_bytes,
+                            "stderr_bytes": call.stderr_bytes,
+                        }
+                    )
+                    + "\n"
+                )
+                self.trace.flush()
+
+    def record_running(self) -> None:
+        """Account the commands still running, with their output so far."""
+        for record in list(self._running.values()):
+            record()
+
+    def totals(self) -> dict[str, dict[str, float]]:
+        """Get the count, duration and output bytes of each subcommand.
+
+        Subcommands are sorted by total duration, slowest first.
+        """
+        result: dict[str, dict[str, float]] = {}
+        for call in self.calls:
+            total = result.setdefault(
+                call.subcommand, {"count": 0, "duration": 0.0, "bytes": 0}
+            )
+            total["count"] += 1
+            total["duration"] += call.duration
+            total["bytes"] += call.stdout_bytes + call.stderr_bytes
+        return dict(
+            sorted(result.items(), key=lambda item: item[1]["duration"], reverse=True)
+        )
+
+    def summary(self, top: int = 3) -> str:
+        """Describe the Git commands run, in a line.
+
+        Example: `412 git calls, 9.3 s, top: ls-files 5,000× 4.1 s, ...`.
+        """
+        duration = sum(call.duration for call in self.calls)
+        result = f"{len(self.calls):,} git calls, {duration:.1f} s"
+        if self.calls:
+            result += ", top: " + ", ".join(
+                f"{name or '?'} {total['count']:,.0f}× {total['duration']:.1f} s"
+                for name, total in list(self.totals().items())[:top]
+            )
+        return result
+
+
+# Global instead of a context variable, because Git may run in other threads
+_tracer: GitTracer | None = None
+
+
+class _CountingReader:
+    """Pipe that counts what is read from it, and behaves like the pipe otherwise.
+
+    Output read from the pipe directly, instead of through `communicate`, is
+    accounted this way.
+    """
+
+    def __init__(self, pipe: IO[Any]) -> None:
+        self.pipe = pipe
+        self.count = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pipe, name)
+
+    def __enter__(self) -> Self:
+        self.pipe.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.pipe.close()
+
+    def __iter__(self) -> Self:
+        return self
+
+    def __next__(self) -> Any:
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def _counted(self, data: Any) -> Any:
+        self.count += len(data or b"")
+        return data
+
+    def read(self, size: int = -1) -> Any:
+        return self._counted(self.pipe.read(size))
+
+    def read1(self, size: int = -1) -> Any:
+        return self._counted(self.pipe.read1(size))  # type: ignore[attr-defined]
+
+    def readline(self, size: int = -1) -> Any:
+        return self._counted(self.pipe.readline(size))
+
+    def readlines(self, hint: int = -1) -> list[Any]:
+        lines = self.pipe.readlines(hint)
+        self.count += sum(map(len, lines))
+        return lines
+
+    def readinto(self, buffer: Any) -> int:
+        size: int = self.pipe.readinto(buffer)  # type: ignore[attr-defined]
+        self.count += size or 0
+        return size
+
+
+class TracedCommand(BaseCommand):
+    """A command accounted by the active [GitTracer][copier._gittrace.GitTracer].
+
+    It behaves like the wrapped command otherwise.
+    """
+
+    __slots__ = ("cmd",)
+
+    def __init__(self, cmd: BaseCommand) -> None:
+        self.cmd = cmd
+        self.cwd = None
+        self.env = None
+        self.custom_encoding = None
+
+    def __repr__(self) -> str:
+        return f"TracedCommand({self.cmd!r})"
+
+    def _get_encoding(self) -> str | None:
+        return self.cmd._get_encoding()
+
+    def formulate(self, level: int = 0, args: Sequence[Any] = ()) -> list[str]:
+        return self.cmd.formulate(level, args)
+
+    @property
+    def machine(self) -> Any:
+        return self.cmd.machine
+
+    def popen(self, args: Sequence[Any] = (), **kwargs: Any) -> Any:
+        tracer = _tracer
+        if tracer is None:
+            return self.cmd.popen(args, **kwargs)
+        argv = [str(arg) for arg in self.cmd.formulate(0, args)]
+        cwd = str(kwargs.get("cwd") or local.cwd)
+        start, wall_start = time.perf_counter(), time.time()
+        process: Any = self.cmd.popen(args, **kwargs)
+        communicate, wait = process.communicate, process.wait
+        reader = None
+        if process.stdout is not None:
+            process.stdout = reader = _CountingReader(process.stdout)
+        recorded = False
+
+        def _record(
+            stdout: Any = None, stderr: Any = None, *, running: bool = False
+        ) -> None:
+            nonlocal recorded
+            if recorded or (process.returncode is None and not running):
+                return
+            recorded = True
+            read = reader.count if reader else 0
+            tracer._running.pop(process.pid, None)
+            tracer.record(
+                GitCall(
+                    argv=argv,
+                    cwd=cwd,
+                    start=wall_start,
+                    duration=time.perf_counter() - start,
+                    returncode=process.returncode,
+                    stdout_bytes=len(stdout or b"") + read,
+                    stderr_bytes=len(stderr or b""),
+                )
+            )
+
+        def _communicate(*args: Any, **kwargs: Any) -> tuple[Any, Any]:
+            # What `communicate` reads is returned, so it's only counted once
+            read = reader.count if reader else 0
+            stdout, stderr = communicate(*args, **kwargs)
+            if reader:
+                reader.count = read
+            _record(stdout, stderr)
+            return stdout, stderr
+
+        def _wait(*args: Any, **kwargs: Any) -> int:
+            returncode: int = wait(*args, **kwargs)
+            _record()
+            return returncode
+
+        # Plumbum processes finish through one of these methods
+        process.communicate = _communicate
+        process.wait = _wait
+
+        def _record_running() -> None:
+            process.poll()
+            _record(running=True)
+
+        tracer._running[process.pid] = _record_running
+        return process
+
+
+@contextmanager
+def tracing_git(path: Path | None) -> Iterator[GitTracer | None]:
+    """Account the Git commands run in the context.
+
+    Args:
+        path: File where each command is logged as a JSON line. If `None`,
+            the [TRACE_GIT_ENV_VAR][copier._gittrace.TRACE_GIT_ENV_VAR]
+            environment variable is used. If that's not set either, or if
+            already tracing, nothing is done.
+
+    Yields:
+        The active tracer, if one was started.
+    """
+    global _tracer
+    if path is None and (env_path := os.getenv(TRACE_GIT_ENV_VAR)):
+        path = Path(env_path)
+    if path is None or _tracer is not None:
+        yield None
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w") as trace:
+        _tracer = tracer = GitTracer(trace=trace)
+        try:
+            yield tracer
+        finally:
+            _tracer = None
+            tracer.record_running()
+            with tracer._lock:
+                tracer.trace = None
@@ -2,23 +2,31 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, MutableMapping
 from dataclasses import dataclass
-from pathlib import Path, PurePath
+from pathlib import Path, PurePath, PurePosixPath
 from typing import Any
 from weakref import WeakKeyDictionary
 
-from jinja2 import Environment, nodes
-from jinja2.exceptions import UndefinedError
+from jinja2 import Environment, Template, nodes
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+from jinja2.exceptions import TemplateNotFound, UndefinedError
 from jinja2.ext import Extension
-from jinja2.loaders import FileSystemLoader
+from jinja2.loaders import (
+    BaseLoader,
+    FileSystemLoader,
+    ModuleLoader,
+    split_template_path,
+)
 from jinja2.parser import Parser
 from jinja2.sandbox import SandboxedEnvironment as _SandboxedEnvironment
 from pydantic import BaseModel
 
 from copier.errors import ForbiddenPathError, MultipleYieldTagsError
 
+from . import _yaml
 from ._settings import SettingsModel
+from ._types import TemplateTree
 
 # Pydantic's deprecated loaders: `parse_raw` unpickles when asked to, and
 # `parse_file` reads arbitrary paths.
@@ -81,6 +89,89 @@ class CopierTemplateLoader(FileSystemLoader):
         return source, filename, uptodate
 
 
+class TemplateTreeLoader(BaseLoader):
+    """Jinja2 loader for a Copier template read from git objects or an archive."""
+
+    def __init__(self, tree: TemplateTree) -> None:
+        self.tree = tree
+
+    def get_source(
+        self, _environment: Environment, template: str
+    ) -> tuple[str, str, Callable[[], bool]]:
+        """Get the source of a template.
+
+        Args:
+            _environment: The Jinja2 environment.
+            template: The name of the template to load.
+
+        Returns:
+            A tuple containing the template source, the template filename, and a
+            callable that checks if the template is up-to-date.
+        """
+        path = PurePosixPath(*split_template_path(template))
+        try:
+            contents = self.tree.read_bytes(path)
+        except FileNotFoundError:
+            raise TemplateNotFound(template) from None
+        # Translate newlines like the filesystem loader, which reads text files
+        source = contents.decode().replace("\r\n", "\n").replace("\r", "\n")
+        # codespell:ignore-next-line uptodate
+        return source, str(path), lambda: True
+
+
+class CopierModuleLoader(ModuleLoader):
+    """Jinja2 loader for templates precompiled in a Copier template bundle."""
+
+    def load(
+        self,
+        environment: Environment,
+        name: str,
+        globals: MutableMapping[str, Any] | None = None,
+    ) -> Template:
+        """Load a precompiled template.
+
+        Args:
+            environment: The Jinja2 environment.
+            name: The name of the template to load.
+            globals: Global variables for the template.
+
+        Returns:
+            The loaded template.
+        """
+        template = super().load(environment, name, globals)
+        # Precompiled templates skip the `YieldExtension.preprocess` hook
+        ctx = get_yield_context(environment)
+        ctx.yield_name = None
+        ctx.yield_iterable = None
+        return template
+
+
+class CopierBytecodeCache(FileSystemBytecodeCache):
+    """Jinja2 bytecode cache for templates compiled by other Copier processes."""
+
+    def get_bucket(
+        self, environment: Environment, name: str, filename: str | None, source: str
+    ) -> Bucket:
+        """Get the cache bucket of a template.
+
+        Args:
+            environment: The Jinja2 environment.
+            name: The name of the template.
+            filename: The file name of the template, if any.
+            source: The source of the template.
+
+        Returns:
+            The bucket, with the compiled code if it's cached.
+        """
+        bucket = super().get_bucket(environment, name, filename, source)
+        if bucket.code is not None:
+            # Cached templates skip the `YieldExtension.preprocess` hook
+            ctx = get_yield_context(environment)
+            ctx.yield_name = None
+            ctx.yield_iterable = None
+        return bucket
+
+
 @dataclass
 class YieldContext:
     yield_name: str | None = None
@@ -97,6 +188,20 @@ def get_yield_context(env: Environment) -> YieldContext:
     return _yield_contexts[env]
 
 
+class YamlFiltersExtension(Extension):
+    """Jinja2 extension that dumps YAML with Copier's YAML backend.
+
+    It replaces the `to_yaml` and `to_nice_yaml` filters from
+    `jinja2_ansible_filters` with equivalents that use libyaml when available.
+    Extensions loaded later can still replace them.
+    """
+
+    def __init__(self, environment: Environment) -> None:
+        super().__init__(environment)
+        environment.filters["to_yaml"] = _yaml.to_yaml
+        environment.filters["to_nice_yaml"] = _yaml.to_nice_yaml
+
+
 class YieldExtension(Extension):
     """Jinja2 extension for the `yield` tag.
 
@@ -3,61 +3,88 @@
 from __future__ import annotations
 
 import os
-import platform
+import posixpath
 import re
-import stat
 import subprocess
 import sys
-import warnings
-from collections.abc import Callable, Iterable, Mapping, Sequence
-from contextlib import suppress
+import time
+from collections.abc import (
+    Callable,
+    Container,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from contextlib import AbstractContextManager, contextmanager, nullcontext, suppress
 from contextvars import ContextVar
 from dataclasses import field, replace
-from filecmp import dircmp
 from fnmatch import fnmatchcase
 from functools import cached_property, partial, wraps
 from itertools import chain
 from pathlib import Path, PurePath, PurePosixPath, PureWindowsPath
 from shutil import rmtree
-from tempfile import TemporaryDirectory
+from tempfile import TemporaryDirectory, TemporaryFile
 from types import TracebackType
 from typing import (
+    IO,
     Any,
+    Concatenate,
     Final,
     Literal,
     ParamSpec,
     TypeVar,
+    cast,
     get_args,
     overload,
 )
 from unicodedata import normalize
 
 from jinja2.exceptions import TemplateError
+from jinja2.loaders import BaseLoader, ChoiceLoader
 from jinja2.utils import import_string
 from packaging.version import Version
 from pathspec import PathSpec, __version__ as pathspec_version
 from plumbum import ProcessExecutionError, colors
+from plumbum.commands.base import BaseCommand
 from plumbum.machines import local
 from pydantic import ConfigDict, PositiveInt
 from pydantic.dataclasses import dataclass
 from pydantic_core import to_jsonable_python
-from questionary import confirm, unsafe_prompt
 
+from ._bundle import write_bundle
 from ._deprecation import deprecate_answers_file_template_path
+from ._events import (
+    EventCallback,
+    FileEvent,
+    FileStatus,
+    Totals,
+    emit,
+    emitting,
+    listening,
+)
+from ._gittrace import tracing_git
 from ._jinja_ext import (
+    CopierBytecodeCache,
+    CopierModuleLoader,
     CopierTemplateLoader,
     SandboxedEnvironment,
+    TemplateTreeLoader,
+    YamlFiltersExtension,
     YieldExtension,
     get_yield_context,
 )
+from ._profile import profiling, span
 from ._settings import Settings, SettingsModel, is_trusted_repository
+from ._sinks import FileSystemSink, Kind, Sink
 from ._subproject import Subproject
-from ._template import Task, Template
+from ._tasks import TaskRun, TaskState, resolve_dependencies, run_tasks
+from ._template import Task, Template, filter_config, tag_version
 from ._tools import (
     OS,
     Style,
     cast_to_bool,
-    escape_git_path,
+    filter_git_patch,
     normalize_git_path,
     printf,
     scantree,
@@ -74,15 +101,25 @@ from ._types import (
     RelativePath,
     VcsRef,
 )
-from ._user_data import AnswersMap, Question, load_answersfile_data
-from ._vcs import get_git, is_git_available
+from ._user_data import (
+    AnswersMap,
+    Question,
+    RenderCache,
+    load_external_data,
+)
+from ._vcs import (
+    get_git,
+    get_remote_tags,
+    is_git_available,
+    select_latest_tag,
+    valid_version,
+)
 from .errors import (
     ConfigFileError,
     CopierAnswersInterrupt,
     ExtensionNotFoundError,
     ForbiddenPathError,
     InteractiveSessionError,
-    TaskError,
     UnsafeTemplateError,
     UserMessageError,
     YieldTagInFileError,
@@ -97,6 +134,9 @@ _T = TypeVar("_T")
 _P = ParamSpec("_P")
 
 _operation: ContextVar[Operation] = ContextVar("_operation")
+_git_index_locks: ContextVar[Callable[[Path], AbstractContextManager[Any]] | None] = (
+    ContextVar("_git_index_locks", default=None)
+)
 _pathspec_pattern: Final = (
     "gitignore" if Version(pathspec_version) >= Version("1.0.0") else "gitwildmatch"
 )
@@ -122,7 +162,62 @@ def as_operation(value: Operation) -> Callable[[Callable[_P, _T]], Callable[_P,
     return _decorator
 
 
-@dataclass(config=ConfigDict(extra="forbid"))
+@contextmanager
+def sharing_git_index(
+    locks: Callable[[Path], AbstractContextManager[Any]],
+) -> Iterator[None]:
+    """Hold a lock while writing the Git index of the destination.
+
+    Use it when other processes update subprojects in the same Git repository,
+    because Git fails instead of waiting when another process writes the index.
+
+    Args:
+        locks: Get the lock of the repository that holds a path.
+    """
+    token = _git_index_locks.set(locks)
+    try:
+        yield
+    finally:
+        _git_index_locks.reset(token)
+
+
+def _git_index_locked(path: Path) -> AbstractContextManager[Any]:
+    """Get the lock to hold while writing the Git index of the repo of a path."""
+    locks = _git_index_locks.get()
+    return nullcontext() if locks is None else locks(path)
+
+
+def instrumented(
+    func: Callable[Concatenate[Worker, _P], _T],
+) -> Callable[Concatenate[Worker, _P], _T]:
+    """Decorator to time a worker operation, and profile or trace it if asked to.
+
+    See [profile][], [trace_git][] and [on_event][].
+    """
+
+    @wraps(func)
+    def _wrapper(self: Worker, /, *args: _P.args, **kwargs: _P.kwargs) -> _T:
+        tracer = None
+        try:
+            with (
+                tracing_git(self.trace_git) as tracer,
+                listening(self.on_event),
+                profiling(self.profile),
+                span(func.__name__, "operation"),
+            ):
+                result = func(self, *args, **kwargs)
+                if emitting():
+                    emit(Totals(func.__name__, **self._file_totals))
+                return result
+        finally:
+            # Once tracing stops, so commands still running are accounted
+            if tracer is not None and not self.quiet:
+                print(tracer.summary(), file=sys.stderr)
+
+    return _wrapper
+
+
+@dataclass(config=ConfigDict(extra="forbid", arbitrary_types_allowed=True))
 class Worker:
     """Copier process state manager.
 
@@ -239,9 +334,52 @@ class Worker:
         skip_tasks:
             When `True`, skip template tasks execution.
 
+        task_jobs:
+            Maximum number of tasks and migrations that run at once.
+
+            See [task_jobs][].
+
+        force_tasks:
+            When `True`, run tasks that declare `inputs` even if those inputs
+            didn't change since they last succeeded.
+
+            See [force_tasks][].
+
+        profile:
+            Where to write a report of the time spent in each step, as JSON.
+            A Chrome trace of those steps is written beside it.
+
+            See [profile][].
+
+        trace_git:
+            Where to log every Git command run, as JSON lines. A summary of
+            those commands is printed at the end. If `None`, the
+            `COPIER_TRACE_GIT` environment variable is used.
+
+            See [trace_git][].
+
+        on_event:
+            Function called with each progress event of the run, such as a
+            step starting, a file being rendered or a task finishing.
+
+            See [on_event][].
+
         ask:
             List of question names to ask, even if they would be skipped by other
             options. Supports glob-style patterns.
+
+        sink:
+            Where to render the subproject instead of `dst_path`, such as a
+            [TarSink][copier.TarSink] or a [MemorySink][copier.MemorySink].
+            Nothing is written into `dst_path` then, but previous answers are
+            still read from it. Only supported when copying and recopying, and
+            template tasks must be skipped.
+
+            See [rendering into an archive][rendering-into-an-archive].
+
+        conflicts:
+            Paths left with conflicts by the last update, relative to
+            `dst_path`. Filled by [run_update][copier.run_update].
     """
 
     # NOTE: attributes are fully documented in [creating.md](../docs/creating.md)
@@ -267,10 +405,21 @@ class Worker:
     unsafe: bool = False
     skip_answered: bool = False
     skip_tasks: bool = False
+    task_jobs: PositiveInt = 1
+    force_tasks: bool = False
+    profile: Path | None = None
+    trace_git: Path | None = None
+    on_event: EventCallback | None = None
     ask: Sequence[str] = ()
+    sink: Sink | None = None
 
     answers: AnswersMap = field(default_factory=AnswersMap, init=False)
+    conflicts: list[str] = field(default_factory=list, init=False)
     _cleanup_hooks: list[Callable[[], None]] = field(default_factory=list, init=False)
+    _file_totals: dict[str, int] = field(default_factory=dict, init=False)
+    _file_outcome: tuple[FileStatus, int | None] | None = field(
+        default=None, init=False
+    )
 
     def __enter__(self) -> Self:
         """Allow using worker as a context manager."""
@@ -334,19 +483,21 @@ class Worker:
 
         Files will only be parsed lazily on 1st access. This helps avoiding
         circular dependencies when the file name also comes from a variable.
+        Parsed files are cached while they don't change; see
+        [load_external_data][copier._user_data.load_external_data].
         """
 
         def _render(path: str) -> str:
             with Phase.use(Phase.UNDEFINED):
                 return self._render_string(path)
 
+        # Files referenced under several keys are loaded once
+        loaded: dict[Path, Any] = {}
+
         def _load_external_data(path: str) -> Any:
+            resolved = (self.dst_path / (path := _render(path))).resolve()
             if (
-                not (
-                    (self.dst_path / (path := _render(path)))
-                    .resolve()
-                    .is_relative_to(self.subproject.local_abspath)
-                )
+                not resolved.is_relative_to(self.subproject.local_abspath)
                 and not self.unsafe
             ):
                 raise ForbiddenPathError(
@@ -357,7 +508,9 @@ class Worker:
                         "  - API: `trust=True`"
                     ),
                 )
-            return load_answersfile_data(self.dst_path, path, warn_on_missing=True)
+            if resolved not in loaded:
+                loaded[resolved] = load_external_data(self.dst_path, path)
+            return loaded[resolved]
 
         # Given those values are lazily rendered on 1st access then cached
         # the phase value is irrelevant and could be misleading.
@@ -398,50 +551,98 @@ class Worker:
     def _execute_tasks(self, tasks: Sequence[Task]) -> None:
         """Run the given tasks.
 
+        Tasks run in parallel, up to [task_jobs][], when their dependencies
+        allow it; see [tasks][].
+
         Arguments:
             tasks: The list of tasks to run.
         """
         operation = _operation.get()
-        for i, task in enumerate(tasks):
-            extra_context = {f"_{k}": v for k, v in task.extra_vars.items()}
-            extra_context["_copier_operation"] = operation
-
-            if not cast_to_bool(self._render_value(task.condition, extra_context)):
-                continue
+        runs = [
+            self._task_run(i, task, depends_on, operation)
+            for i, (task, depends_on) in enumerate(
+                zip(tasks, resolve_dependencies(tasks), strict=True)
+            )
+        ]
 
-            task_cmd = task.cmd
-            if isinstance(task_cmd, str):
-                task_cmd = self._render_string(task_cmd, extra_context)
-                use_shell = True
+        def _announce(run: TaskRun) -> None:
+            if self.quiet:
+                return
+            if run.up_to_date:
+                message = "Skipping up-to-date task"
             else:
-                task_cmd = [
-                    self._render_string(str(part), extra_context) for part in task_cmd
-                ]
-                use_shell = False
+                message = "Running task"
+            print(
+                colors.info
+                | f" > {message} {run.position + 1} of {len(tasks)}: {run.cmd}",
+                file=sys.stderr,
+            )
 
-            if not self.quiet:
-                print(
-                    colors.info
-                    | f" > Running task {i + 1} of {len(tasks)}: {task_cmd}",
-                    file=sys.stderr,
-                )
-            if self.pretend:
-                continue
-
-            working_directory = (
-                # We can't use _render_path here, as that function has special handling
-                # for files in the template
-                self.subproject.local_abspath
-                / Path(self._render_string(str(task.working_directory), extra_context))
-            ).absolute()
-
-            extra_env = {k[1:].upper(): str(v) for k, v in extra_context.items()}
-            with local.cwd(working_directory), local.env(**extra_env):
-                process = subprocess.run(
-                    task_cmd, shell=use_shell, check=False, env=dict(local.env)
-                )
-                if process.returncode:
-                    raise TaskError.from_process(process)
+        if self.pretend:
+            for run in runs:
+                if not run.skip:
+                    _announce(run)
+            return
+        state = None
+        if any(task.inputs is not None for task in tasks):
+            state = TaskState.load(
+                self.subproject.local_abspath / self.tasks_state_relpath,
+                force=self.force_tasks,
+            )
+        run_tasks(runs, self.task_jobs, _announce, state)
+
+    def _task_run(
+        self,
+        position: int,
+        task: Task,
+        depends_on: frozenset[int],
+        operation: Operation,
+    ) -> TaskRun:
+        """Render a task, so it's ready to run."""
+        extra_context = {f"_{k}": v for k, v in task.extra_vars.items()}
+        extra_context["_copier_operation"] = operation
+        run = TaskRun(
+            position=position,
+            depends_on=depends_on,
+            group=task.group,
+            key=task.id or self._task_key(position, task),
+        )
+        if not cast_to_bool(self._render_value(task.condition, extra_context)):
+            run.skip = True
+            return run
+
+        if isinstance(task.cmd, str):
+            run.cmd = self._render_string(task.cmd, extra_context)
+        else:
+            run.cmd = [
+                self._render_string(str(part), extra_context) for part in task.cmd
+            ]
+        run.cwd = (
+            # We can't use _render_path here, as that function has special handling
+            # for files in the template
+            self.subproject.local_abspath
+            / Path(self._render_string(str(task.working_directory), extra_context))
+        ).absolute()
+        extra_env = {k[1:].upper(): str(v) for k, v in extra_context.items()}
+        run.env = {**local.env, **extra_env}
+        if task.inputs is not None:
+            run.inputs = [
+                self._render_string(pattern, extra_context) for pattern in task.inputs
+            ]
+            run.outputs = [
+                self._render_string(pattern, extra_context) for pattern in task.outputs
+            ]
+        return run
+
+    @staticmethod
+    def _task_key(position: int, task: Task) -> str:
+        """Name a task without `id` in the task state.
+
+        The same command may run in several working directories, so both are
+        part of the name, and so is its position to tell repeated tasks apart.
+        """
+        cmd = task.cmd if isinstance(task.cmd, str) else " ".join(task.cmd)
+        return f"{position + 1}:{task.working_directory.as_posix()}:{cmd}"
 
     def _render_context(self) -> AnyByStrMutableMapping:
         """Produce render context for Jinja."""
@@ -519,6 +720,9 @@ class Worker:
                 file_=sys.stderr,
             )
             return True
+        # Prompt libraries are slow to import, and only needed when prompting
+        from questionary import confirm
+
         try:
             answer = confirm(f" Overwrite {dst_relpath}?", default=True).unsafe_ask()
         except EOFError as err:
@@ -554,15 +758,16 @@ class Worker:
         """
         assert not dst_relpath.is_absolute()
         assert not expected_contents or not is_dir, "Dirs cannot have expected content"
-        dst_abspath = Path(self.subproject.local_abspath, dst_relpath)
-        previous_is_symlink = dst_abspath.is_symlink()
-        try:
-            previous_content: bytes | Path
-            if previous_is_symlink:
-                previous_content = dst_abspath.readlink()
-            else:
-                previous_content = dst_abspath.read_bytes()
-        except FileNotFoundError:
+        kind: Kind = "dir" if is_dir else "symlink" if is_symlink else "file"
+        previous = self._sink.compare(
+            dst_relpath, kind, expected_contents, expected_mode
+        )
+        size = (
+            len(expected_contents)
+            if kind == "file" and isinstance(expected_contents, bytes)
+            else None
+        )
+        if previous is None:
             printf(
                 "create",
                 dst_relpath,
@@ -570,26 +775,9 @@ class Worker:
                 quiet=self.quiet,
                 file_=sys.stderr,
             )
+            self._file_outcome = ("created", size)
             return True
-        except PermissionError as error:
-            # HACK https://bugs.python.org/issue43095
-            if not (error.errno == 13 and platform.system() == "Windows"):
-                raise
-        except IsADirectoryError:
-            assert is_dir
-        mode_matches = True
-        if expected_mode is not None and not previous_is_symlink and not is_dir:
-            try:
-                dst_exec_bits = dst_abspath.stat().st_mode & 0o111
-            except (FileNotFoundError, PermissionError):
-                dst_exec_bits = None
-            else:
-                mode_matches = dst_exec_bits == (expected_mode & 0o111)
-        if is_dir or (
-            previous_content == expected_contents
-            and previous_is_symlink == is_symlink
-            and mode_matches
-        ):
+        if is_dir or previous:
             printf(
                 "identical",
                 dst_relpath,
@@ -597,8 +785,11 @@ class Worker:
                 quiet=self.quiet,
                 file_=sys.stderr,
             )
+            self._file_outcome = ("identical", None)
             return is_dir
-        return self._solve_render_conflict(dst_relpath)
+        allowed = self._solve_render_conflict(dst_relpath)
+        self._file_outcome = ("overwritten", size) if allowed else ("skipped", None)
+        return allowed
 
     def _ask(self) -> None:  # noqa: C901
         """Ask the questions of the questionnaire and record their answers."""
@@ -609,12 +800,17 @@ class Worker:
             metadata=self.template.metadata,
             external=self._external_data(),
         )
+        # Custom extensions may read any variable, so results aren't reused then
+        render_cache = RenderCache(
+            self.jinja_env, track_dependencies=not self.template.jinja_extensions
+        )
 
         for var_name, details in self.template.questions_data.items():
             question = Question(
                 answers=self.answers,
                 context=self._render_context(),
                 jinja_env=self.jinja_env,
+                render_cache=render_cache,
                 settings=self.settings,
                 var_name=var_name,
                 **details,
@@ -659,7 +855,10 @@ class Worker:
                     self.answers.user[var_name] = answer
                     continue
 
-            # Display TUI and ask user interactively only without --defaults
+            # Display TUI and ask user interactively only without --defaults.
+            # Prompt libraries are slow to import, so they're imported here.
+            from questionary import unsafe_prompt
+
             try:
                 new_answer = unsafe_prompt(
                     [question.get_questionary_structure()],
@@ -697,6 +896,14 @@ class Worker:
         context["_copier_conf"]["answers_file"] = ""
         return Path(template.render(**context))
 
+    @property
+    def tasks_state_relpath(self) -> Path:
+        """Relative path of the file that remembers which tasks are up to date.
+
+        It lives beside the answers file. See [tasks][].
+        """
+        return self.answers_relpath.with_suffix(".tasks.json")
+
     @cached_property
     def all_exclusions(self) -> Sequence[str]:
         """Combine default, template and user-chosen exclusions."""
@@ -707,15 +914,39 @@ class Worker:
         """Combine default and template skip-if-exists patterns."""
         return tuple(chain(self.skip_if_exists, self.template.skip_if_exists))
 
+    @cached_property
+    def _jinja_bytecode_cache(self) -> CopierBytecodeCache | None:
+        """Cache of the compiled Jinja templates, shared with other processes.
+
+        See [shared_cache_path][copier._template.Template.shared_cache_path].
+        """
+        if self.template.shared_cache_path is None:
+            return None
+        path = self.template.shared_cache_path / "jinja"
+        path.mkdir(parents=True, exist_ok=True)
+        return CopierBytecodeCache(str(path))
+
     @cached_property
     def jinja_env(self) -> SandboxedEnvironment:
         """Return a pre-configured Jinja environment.
 
         Respects template settings.
         """
-        loader = CopierTemplateLoader(self.template.local_abspath)
+        loader: BaseLoader
+        if self.template.tree is None:
+            loader = CopierTemplateLoader(self.template.local_abspath)
+        else:
+            loader = TemplateTreeLoader(self.template.tree)
+        # Precompiled templates are Python code, so they're only used for trusted
+        # templates; otherwise, bundled templates are compiled from their sources
+        compiled_templates_path = self.template.compiled_templates_path
+        if compiled_templates_path is not None and (
+            self.unsafe or is_trusted_repository(self.settings.trust, self.template.url)
+        ):
+            loader = ChoiceLoader([CopierModuleLoader(compiled_templates_path), loader])
         default_extensions = [
             "jinja2_ansible_filters.AnsibleCoreFiltersExtension",
+            YamlFiltersExtension,
             YieldExtension,
         ]
         extensions = default_extensions + list(self.template.jinja_extensions)
@@ -730,7 +961,12 @@ class Worker:
                     'Supported values are "jinja2.Undefined" and "jinja2.StrictUndefined".'
                 )
         try:
-            env = SandboxedEnvironment(loader=loader, extensions=extensions, **envops)
+            env = SandboxedEnvironment(
+                loader=loader,
+                extensions=extensions,
+                bytecode_cache=self._jinja_bytecode_cache,
+                **envops,
+            )
         except ModuleNotFoundError as error:
             raise ExtensionNotFoundError(
                 f"Copier could not load some Jinja extensions:\n{error}\n"
@@ -790,8 +1026,75 @@ class Worker:
 
     def _render_template(self) -> None:
         """Render the template in the subproject root."""
-        follow_symlinks = not self.template.preserve_symlinks
         dst_root = self.dst_path.resolve()
+        for src_relpath, copy_relpath, is_symlink, is_dir in self._scan_template():
+            dst_relpaths_ctxs = self._render_path(copy_relpath)
+            for dst_relpath, ctx in dst_relpaths_ctxs:
+                dst_abspath = dst_root / dst_relpath
+                if dst_abspath.is_symlink() and self.template.preserve_symlinks:
+                    # If destination path is a symlink, it can safely point outside the
+                    # subproject dir, while still itself existing within the subproject.
+                    # (So long as nothing is templated into it (if it is a directory),
+                    # which would be caught by that path's own check.)
+                    # Therefore avoid resolving the symlink itself:
+                    dst_realpath = dst_abspath.parent.resolve() / dst_abspath.name
+                else:
+                    dst_realpath = dst_abspath.resolve()
+                if not dst_realpath.is_relative_to(dst_root):
+                    raise ForbiddenPathError(path=dst_relpath)
+                if self.match_exclude(dst_relpath):
+                    continue
+                if is_symlink:
+                    with self._file_progress(dst_relpath, "symlink"):
+                        self._render_symlink(src_relpath, dst_relpath)
+                elif is_dir:
+                    with self._file_progress(dst_relpath, "dir"):
+                        self._render_folder(dst_relpath)
+                else:
+                    with (
+                        span(dst_relpath.as_posix(), "file"),
+                        self._file_progress(dst_relpath, "file"),
+                    ):
+                        self._render_file(
+                            src_relpath, dst_relpath, extra_context=ctx or {}
+                        )
+
+    @contextmanager
+    def _file_progress(self, dst_relpath: Path, kind: Kind) -> Iterator[None]:
+        """Count the path rendered in the context, and emit its events.
+
+        Its outcome is recorded when checking if it can be rendered.
+        """
+        events = emitting()
+        path = dst_relpath.as_posix()
+        if events:
+            emit(FileEvent(path, kind, "planned"))
+        self._file_outcome = None
+        start = time.perf_counter()
+        yield
+        if self._file_outcome is None:
+            return
+        status, size = self._file_outcome
+        self._file_totals[status] = self._file_totals.get(status, 0) + 1
+        if size is not None:
+            self._file_totals["bytes"] = self._file_totals.get("bytes", 0) + size
+        if events:
+            emit(FileEvent(path, kind, status, size, time.perf_counter() - start))
+
+    def _scan_template(self) -> Iterator[tuple[Path, Path, bool, bool]]:
+        """Walk the template paths to render.
+
+        Yields:
+            Each path, relative to the template root and to the copy root, and
+            whether it's a symlink to preserve or a directory.
+        """
+        tree = self.template.tree
+        if tree is not None:
+            root = self._template_tree_root
+            for path, is_dir in tree.walk(root):
+                yield Path(path), Path(path.relative_to(root)), False, is_dir
+            return
+        follow_symlinks = not self.template.preserve_symlinks
         for src in scantree(str(self.template_copy_root), follow_symlinks):
             src_abspath = Path(src.path)
             # If the source is a symlink, we are not preserving symlinks, and the
@@ -808,31 +1111,30 @@ class Worker:
                 raise ForbiddenPathError(
                     path=src_abspath.relative_to(self.template_copy_root)
                 )
-            src_relpath = Path(src_abspath).relative_to(self.template.local_abspath)
-            dst_relpaths_ctxs = self._render_path(
-                Path(src_abspath).relative_to(self.template_copy_root)
+            yield (
+                src_abspath.relative_to(self.template.local_abspath),
+                src_abspath.relative_to(self.template_copy_root),
+                src.is_symlink() and self.template.preserve_symlinks,
+                src.is_dir(follow_symlinks=follow_symlinks),
             )
-            for dst_relpath, ctx in dst_relpaths_ctxs:
-                dst_abspath = dst_root / dst_relpath
-                if dst_abspath.is_symlink() and self.template.preserve_symlinks:
-                    # If destination path is a symlink, it can safely point outside the
-                    # subproject dir, while still itself existing within the subproject.
-                    # (So long as nothing is templated into it (if it is a directory),
-                    # which would be caught by that path's own check.)
-                    # Therefore avoid resolving the symlink itself:
-                    dst_realpath = dst_abspath.parent.resolve() / dst_abspath.name
-                else:
-                    dst_realpath = dst_abspath.resolve()
-                if not dst_realpath.is_relative_to(dst_root):
-                    raise ForbiddenPathError(path=dst_relpath)
-                if self.match_exclude(dst_relpath):
-                    continue
-                if src.is_symlink() and self.template.preserve_symlinks:
-                    self._render_symlink(src_relpath, dst_relpath)
-                elif src.is_dir(follow_symlinks=follow_symlinks):
-                    self._render_folder(dst_relpath)
-                else:
-                    self._render_file(src_relpath, dst_relpath, extra_context=ctx or {})
+
+    def _template_path_exists(self, relpath: Path, in_copy_root: bool = False) -> bool:
+        """Tell if a path exists in the template.
+
+        Args:
+            relpath:
+                Path relative to the template root.
+            in_copy_root:
+                Whether `relpath` is relative to the copy root instead.
+        """
+        tree = self.template.tree
+        if tree is None:
+            root = (
+                self.template_copy_root if in_copy_root else self.template.local_abspath
+            )
+            return (root / relpath).exists()
+        tree_root = self._template_tree_root if in_copy_root else PurePosixPath()
+        return tree.exists(tree_root / relpath.as_posix())
 
     def _render_file(  # noqa: C901
         self,
@@ -855,7 +1157,14 @@ class Worker:
         # TODO Get from main.render_file()
         assert not src_relpath.is_absolute()
         assert not dst_relpath.is_absolute()
-        src_abspath = self.template.local_abspath / src_relpath
+        src_posix_relpath = PurePosixPath(src_relpath.as_posix())
+        tree = self.template.tree
+        if tree is None:
+            src_abspath = self.template.local_abspath / src_relpath
+            read_bytes, stat_mode = src_abspath.read_bytes, src_abspath.stat().st_mode
+        else:
+            read_bytes = partial(tree.read_bytes, src_posix_relpath)
+            stat_mode = tree.stat_mode(src_posix_relpath)
         if src_relpath.name.endswith(self.template.templates_suffix):
             try:
                 tpl = self.jinja_env.get_template(src_relpath.as_posix())
@@ -864,7 +1173,7 @@ class Worker:
                     # suffix is not empty, re-raise
                     raise
                 # suffix is empty, fallback to copy
-                new_content = src_abspath.read_bytes()
+                new_content = read_bytes()
             else:
                 new_content = tpl.render(
                     **self._render_context(), **(extra_context or {})
@@ -874,8 +1183,7 @@ class Worker:
                         f"File {src_relpath} contains a yield tag, but it is not allowed."
                     )
         else:
-            new_content = src_abspath.read_bytes()
-        dst_abspath = self.subproject.local_abspath / dst_relpath
+            new_content = read_bytes()
         # Prefer the template's git-index mode over ``stat().st_mode`` so
         # that executable bits committed by the template author are
         # honored even on filesystems that don't represent them on disk
@@ -884,10 +1192,7 @@ class Worker:
         # and as a fallback when the file isn't tracked in the
         # template's git index — e.g. local directory templates without
         # a git repo, or untracked files.
-        stat_mode = src_abspath.stat().st_mode
-        git_mode = self.template.git_index_modes.get(
-            PurePosixPath(src_relpath.as_posix())
-        )
+        git_mode = self.template.git_index_modes.get(src_posix_relpath)
         if git_mode is None:
             src_mode = stat_mode
         else:
@@ -902,24 +1207,8 @@ class Worker:
         ):
             return
         if not self.pretend:
-            dst_abspath.parent.mkdir(parents=True, exist_ok=True)
-            if dst_abspath.is_symlink():
-                # Writing to a symlink just writes to its target, so if we want to
-                # replace a symlink with a file we have to unlink it first
-                dst_abspath.unlink()
-            dst_abspath.write_bytes(new_content)
-            if (dst_mode := dst_abspath.stat().st_mode) != src_mode:
-                try:
-                    dst_abspath.chmod(src_mode)
-                except PermissionError:
-                    # In some filesystems (e.g., gcsfuse), `chmod` is not allowed,
-                    # so we suppress the `PermissionError` here.
-                    warnings.warn(
-                        f"Path permissions for {dst_abspath} cannot be changed from "
-                        f"{stat.filemode(dst_mode)} to {stat.filemode(src_mode)}",
-                        stacklevel=2,
-                    )
-            if is_git_available():
+            self._sink.write_file(dst_relpath, new_content, src_mode)
+            if self.sink is None and is_git_available():
                 self._sync_git_index_executable_bit(dst_relpath, src_mode)
 
     def _sync_git_index_executable_bit(self, dst_relpath: Path, src_mode: int) -> None:
@@ -998,11 +1287,12 @@ class Worker:
             # ``--cacheinfo`` rewrites the entry's mode on the *existing*
             # blob SHA. Unlike ``--chmod``, it does NOT re-read the
             # working tree or restage its content.
-            git(
-                "update-index",
-                "--cacheinfo",
-                f"{new_mode},{current_index_sha},{dst_relpath}",
-            )
+            with _git_index_locked(subproject_root):
+                git(
+                    "update-index",
+                    "--cacheinfo",
+                    f"{new_mode},{current_index_sha},{dst_relpath}",
+                )
         except (OSError, ProcessExecutionError):
             # git not installed, or some other unrelated git failure
             # — silently fall back so we never break the render path.
@@ -1039,17 +1329,9 @@ class Worker:
             return
 
         if not self.pretend:
-            dst_abspath = self.subproject.local_abspath / dst_relpath
-            # symlink_to doesn't overwrite existing files, so delete it first
-            if dst_abspath.is_symlink() or dst_abspath.exists():
-                dst_abspath.unlink()
-            dst_abspath.parent.mkdir(parents=True, exist_ok=True)
-            dst_abspath.symlink_to(dst_target)
-            if sys.platform == "darwin":
-                # Only macOS supports permissions on symlinks.
-                # Other platforms just copy the permission of the target
-                src_mode = src_abspath.lstat().st_mode
-                dst_abspath.lchmod(src_mode)
+            self._sink.write_symlink(
+                dst_relpath, dst_target, src_abspath.lstat().st_mode
+            )
 
     def _render_folder(self, dst_relpath: Path) -> None:
         """Create one folder (without content).
@@ -1061,8 +1343,7 @@ class Worker:
         """
         assert not dst_relpath.is_absolute()
         if not self.pretend and self._render_allowed(dst_relpath, is_dir=True):
-            dst_abspath = self.subproject.local_abspath / dst_relpath
-            dst_abspath.mkdir(parents=True, exist_ok=True)
+            self._sink.make_dir(dst_relpath)
 
     def _render_parts(  # noqa: C901
         self,
@@ -1083,11 +1364,8 @@ class Worker:
         if not parts:
             rendered_path = Path(*rendered_parts)
 
-            templated_sibling = (
-                self.template.local_abspath
-                / f"{rendered_path}{self.template.templates_suffix}"
-            )
-            if is_template or not templated_sibling.exists():
+            templated_sibling = Path(f"{rendered_path}{self.template.templates_suffix}")
+            if is_template or not self._template_path_exists(templated_sibling):
                 yield rendered_path, extra_context
 
             return
@@ -1166,11 +1444,12 @@ class Worker:
                 The relative path to be rendered. Obviously, it can be templated.
         """
         is_template = relpath.name.endswith(self.template.templates_suffix)
-        templated_sibling = (
-            self.template_copy_root / f"{relpath}{self.template.templates_suffix}"
-        )
+        templated_sibling = Path(f"{relpath}{self.template.templates_suffix}")
         # With an empty suffix, the templated sibling always exists.
-        if templated_sibling.exists() and self.template.templates_suffix:
+        if (
+            self._template_path_exists(templated_sibling, in_copy_root=True)
+            and self.template.templates_suffix
+        ):
             return
         if self.template.templates_suffix and is_template:
             relpath = relpath.with_suffix("")
@@ -1232,6 +1511,11 @@ class Worker:
         self._cleanup_hooks.append(result._cleanup)
         return result
 
+    @cached_property
+    def _sink(self) -> Sink:
+        """Get the sink where the subproject is rendered."""
+        return self.sink or FileSystemSink(self.subproject.local_abspath)
+
     @cached_property
     def template(self) -> Template:
         url = self.src_path
@@ -1240,10 +1524,25 @@ class Worker:
                 raise TypeError("Template not found")
             url = str(self.subproject.template.url)
         ref = self.resolved_vcs_ref
-        result = Template(url=url, ref=ref, use_prereleases=self.use_prereleases)
+        result = Template(
+            url=url, ref=ref, use_prereleases=self.use_prereleases, checkout=False
+        )
         self._cleanup_hooks.append(result._cleanup)
         return result
 
+    @cached_property
+    def _template_tree_root(self) -> PurePosixPath:
+        """Path from where to start copying, in the tree of the template.
+
+        It's the equivalent of `template_copy_root` when rendering the template
+        from its tree.
+        """
+        subdir = self._render_string(self.template.subdirectory) or ""
+        path = PurePosixPath(posixpath.normpath(Path(subdir).as_posix()))
+        if Path(subdir).is_absolute() or path.parts[:1] == ("..",):
+            raise ForbiddenPathError(path=Path(subdir))
+        return path
+
     @cached_property
     def template_copy_root(self) -> Path:
         """Absolute path from where to start copying.
@@ -1258,6 +1557,7 @@ class Worker:
 
     # Main operations
     @as_operation("copy")
+    @instrumented
     def run_copy(self) -> None:
         """Generate a subproject from zero, ignoring what was in the folder.
 
@@ -1274,10 +1574,15 @@ class Worker:
             del self.match_exclude
 
         self._check_unsafe("copy")
+        if self.sink is not None and self.template.tasks and not self.skip_tasks:
+            raise UserMessageError(
+                "Template tasks cannot run when rendering into a sink. "
+                "Use `--skip-tasks` to render without them."
+            )
         self._print_message(self.template.message_before_copy)
         with Phase.use(Phase.PROMPT):
             self._ask()
-        was_existing = self.subproject.local_abspath.exists()
+        was_existing = self.sink is not None or self.subproject.local_abspath.exists()
         try:
             if not self.quiet:
                 # TODO Unify printing tools
@@ -1303,6 +1608,7 @@ class Worker:
             print()  # padding space
 
     @as_operation("copy")
+    @instrumented
     def run_recopy(self) -> None:
         """Update a subproject, keeping answers but discarding evolution."""
         if self.subproject.template is None:
@@ -1312,6 +1618,7 @@ class Worker:
             )
         with replace(self, src_path=self.subproject.template.url) as new_worker:
             new_worker.run_copy()
+        self._file_totals = new_worker._file_totals
 
     def _print_template_update_info(self, subproject_template: Template) -> None:
         # TODO Unify printing tools
@@ -1323,13 +1630,16 @@ class Worker:
             print(message, file=sys.stderr)
 
     @as_operation("update")
-    def run_update(self) -> None:
+    @instrumented
+    def run_update(self) -> None:  # noqa: C901
         """Update a subproject that was already generated.
 
         See [updating a project][updating-a-project].
         """
         self._check_unsafe("update")
         # Check all you need is there
+        if self.sink is not None:
+            raise UserMessageError("Updating into a sink is not supported.")
         if self.subproject.vcs != "git":
             raise UserMessageError(
                 "Updating is only supported in git-tracked subprojects."
@@ -1371,9 +1681,86 @@ class Worker:
             # is regenerated to re-render templates.
             del self.match_exclude
 
-        self._apply_update()
+        if (answers := self._noop_update_answers()) is not None:
+            self.answers = answers
+            self._apply_noop_update()
+        else:
+            self._apply_update()
         self._print_message(self.template.message_after_update)
 
+    def _noop_update_answers(self) -> AnswersMap | None:
+        """Get the answers of an update that would leave the subproject untouched.
+
+        That happens when the template resolves to the same commit recorded in
+        the answers file, the answers don't change, and no path skipped if it
+        exists is missing, since the regular update recreates those. Answers can
+        only be known beforehand when running without prompts, so interactive
+        updates always follow the regular path.
+
+        Returns:
+            The answers, or `None` if the update must follow the regular path.
+        """
+        assert self.subproject.template
+        if not self.defaults or self.ask:
+            return None
+        if self.template.commit_hash != self.subproject.template.commit_hash:
+            return None
+        previous = self.answers
+        answers = None
+        try:
+            with Phase.use(Phase.PROMPT):
+                self._ask()
+            if (
+                self._answers_to_remember() == self.subproject._raw_answers
+                and not self._skipped_path_missing()
+            ):
+                answers = self.answers
+        finally:
+            if answers is None:
+                # Forget everything computed with the discarded answers
+                self.answers = previous
+                for name in ("match_exclude", "match_skip"):
+                    with suppress(AttributeError):
+                        delattr(self, name)
+        return answers
+
+    def _skipped_path_missing(self) -> bool:
+        """Tell if a template path that is skipped if it exists is missing."""
+        if not self.all_skip_if_exists:
+            return False
+        dst_root = self.dst_path.resolve()
+        for _, copy_relpath, _, _ in self._scan_template():
+            for dst_relpath, _ in self._render_path(copy_relpath):
+                if (
+                    self.match_skip(dst_relpath)
+                    and not self.match_exclude(dst_relpath)
+                    and not (dst_root / dst_relpath).exists()
+                ):
+                    return True
+        return False
+
+    def _apply_noop_update(self) -> None:
+        """Finish an update that has no template changes to apply.
+
+        Rendering the old and new template versions would produce the same
+        files, so the diff to apply is empty. Only migrations and tasks are
+        executed, just like in a regular update.
+        """
+        if not self.quiet:
+            # TODO Unify printing tools
+            print("Project is already up to date", file=sys.stderr)
+        with Phase.use(Phase.MIGRATE):
+            self._execute_tasks(
+                self.template.migration_tasks("before", self.subproject.template)  # type: ignore[arg-type]
+            )
+        if not self.skip_tasks:
+            with Phase.use(Phase.TASKS):
+                self._execute_tasks(self.template.tasks)
+        with Phase.use(Phase.MIGRATE):
+            self._execute_tasks(
+                self.template.migration_tasks("after", self.subproject.template)  # type: ignore[arg-type]
+            )
+
     def _apply_update(self) -> None:  # noqa: C901
         git = get_git()
         subproject_top = Path(
@@ -1395,21 +1782,33 @@ class Worker:
             ) as new_copy,
         ):
             # Copy old template into a temporary destination
-            with replace(
-                self,
-                dst_path=old_copy / subproject_subdir,
-                data=self.subproject.last_answers,
-                defaults=True,
-                quiet=True,
-                src_path=self.subproject.template.url,  # type: ignore[union-attr]
-                vcs_ref=self.subproject.template.commit,  # type: ignore[union-attr]
-                # Exclude also paths listed in the new template version, so they
-                # won't be included in the diff as deleted paths to prevent deletion.
-                # https://github.com/orgs/copier-org/discussions/2345
-                exclude=[*self.template.exclude, *self.exclude],
-                ask=(),
-            ) as old_worker:
+            with (
+                replace(
+                    self,
+                    dst_path=old_copy / subproject_subdir,
+                    data=self.subproject.last_answers,
+                    defaults=True,
+                    quiet=True,
+                    src_path=self.subproject.template.url,  # type: ignore[union-attr]
+                    vcs_ref=self.subproject.template.commit,  # type: ignore[union-attr]
+                    # Exclude also paths listed in the new template version, so they
+                    # won't be included in the diff as deleted paths to prevent
+                    # deletion.
+                    # https://github.com/orgs/copier-org/discussions/2345
+                    exclude=[*self.template.exclude, *self.exclude],
+                    ask=(),
+                    # Temporary destinations are always rendered to get an accurate
+                    # diff, but tasks are not run in them when pretending.
+                    pretend=False,
+                    skip_tasks=self.skip_tasks or self.pretend,
+                ) as old_worker,
+                span("old copy", "update"),
+            ):
                 old_worker.run_copy()
+            # Task state is only meaningful in the real destination
+            (old_copy / subproject_subdir / self.tasks_state_relpath).unlink(
+                missing_ok=True
+            )
             # Run pre-migration tasks
             with Phase.use(Phase.MIGRATE):
                 self._execute_tasks(
@@ -1417,9 +1816,12 @@ class Worker:
                 )
             # Create a Git tree object from the current (possibly dirty) index
             # and keep the object reference.
-            with local.cwd(subproject_top):
+            with local.cwd(subproject_top), _git_index_locked(subproject_top):
                 subproject_head = git("write-tree").strip()
-            with local.cwd(old_copy):
+            # In a monorepo, the real destination tree contains many paths that
+            # don't belong to the subproject, so limit tree diffs against it.
+            subproject_pathspec = ("--", subproject_subdir)
+            with span("old commit", "update"), local.cwd(old_copy):
                 self._git_initialize_repo()
                 # Configure borrowing Git objects from the real destination.
                 set_git_alternates(subproject_top)
@@ -1438,6 +1840,7 @@ class Worker:
                             "--name-only",
                             "HEAD",
                             subproject_head,
+                            *subproject_pathspec,
                         ).splitlines(),
                     )
                     if not (subproject_top / path).exists()
@@ -1458,41 +1861,51 @@ class Worker:
                 # TODO
                 quiet=True,
             ) as current_worker:
-                current_worker.run_copy()
+                with span("new copy", "update"):
+                    current_worker.run_copy()
+                self._file_totals = current_worker._file_totals
                 self.answers = current_worker.answers
                 self.answers.external = self._external_data()
             # Don't regenerate intentionally deleted paths
             for filename in files_removed:
                 (subproject_top / filename).unlink(missing_ok=True)
             # Render with the same answers in an empty dir to avoid pollution
-            with replace(
-                self,
-                dst_path=new_copy / subproject_subdir,
-                data={
-                    k: v
-                    for k, v in self.answers.combined.items()
-                    if not k.startswith("_")
-                    and k not in self.answers.hidden
-                    and isinstance(k, JSONSerializable)
-                    and isinstance(v, JSONSerializable)
-                },
-                defaults=True,
-                quiet=True,
-                src_path=self.subproject.template.url,  # type: ignore[union-attr]
-                vcs_ref=self.resolved_vcs_ref,
-                ask=(),
-            ) as new_worker:
+            with (
+                replace(
+                    self,
+                    dst_path=new_copy / subproject_subdir,
+                    data={
+                        k: v
+                        for k, v in self.answers.combined.items()
+                        if not k.startswith("_")
+                        and k not in self.answers.hidden
+                        and isinstance(k, JSONSerializable)
+                        and isinstance(v, JSONSerializable)
+                    },
+                    defaults=True,
+                    quiet=True,
+                    src_path=self.subproject.template.url,  # type: ignore[union-attr]
+                    vcs_ref=self.resolved_vcs_ref,
+                    ask=(),
+                    pretend=False,
+                    skip_tasks=self.skip_tasks or self.pretend,
+                ) as new_worker,
+                span("clean new copy", "update"),
+            ):
                 new_worker.run_copy()
+            (new_copy / subproject_subdir / self.tasks_state_relpath).unlink(
+                missing_ok=True
+            )
             # Don't regenerate intentionally deleted paths
             for filename in files_removed:
                 Path(new_copy, filename).unlink(missing_ok=True)
-            with local.cwd(new_copy):
+            with span("new commit", "update"), local.cwd(new_copy):
                 self._git_initialize_repo()
                 new_copy_head = git("rev-parse", "HEAD").strip()
             # Extract diff between temporary destination and real destination
             # with some special handling of newly added files in both the project
             # and the template.
-            with local.cwd(old_copy):
+            with span("diff", "update"), local.cwd(old_copy):
                 # Configure borrowing Git objects from the real destination and
                 # temporary destination of the new template.
                 set_git_alternates(subproject_top, Path(new_copy))
@@ -1507,7 +1920,11 @@ class Worker:
                     "diff-tree", "-r", "--diff-filter=A", "--name-only"
                 ]
                 for filename in (
-                    set(diff_added_cmd("HEAD", subproject_head).splitlines())
+                    set(
+                        diff_added_cmd(
+                            "HEAD", subproject_head, *subproject_pathspec
+                        ).splitlines()
+                    )
                 ) & set(diff_added_cmd("HEAD", new_copy_head).splitlines()):
                     f = Path(filename)
                     f.parent.mkdir(parents=True, exist_ok=True)
@@ -1517,169 +1934,241 @@ class Worker:
                 # Extract diff between temporary destination and real
                 # destination
                 diff_cmd = git[
+                    "-C",
+                    old_copy,
                     "diff-tree",
                     f"--unified={self.context_lines}",
                     "HEAD",
                     subproject_head,
                 ]
-                # Get the list of modified files in the subproject directory
-                # that match the skip-if-exists patterns. These are relative
-                # paths anchored at the Git repo root because they will be used
-                # with `git apply --exclude` later, which expects paths relative
-                # to the repo root. Importantly, the skip-if-exists patterns
-                # are anchored at the subproject root, which may be a
-                # subdirectory of the Git repo, so we need to relativize the
-                # paths accordingly for pattern matching.
-                skip_if_exists_files = [
-                    escape_git_path(f)
-                    for f in map(
+                # Get the list of files touched by the patch. These are relative
+                # paths anchored at the Git repo root, like the paths in the
+                # patch itself.
+                patched_files = list(
+                    map(
                         normalize_git_path,
                         diff_cmd(
-                            "-r", "--no-commit-id", "--name-only", subproject_subdir
+                            "-r", "--no-commit-id", "--name-only", *subproject_pathspec
                         ).splitlines(),
                     )
+                )
+                # Get the patched files that match the skip-if-exists patterns.
+                # They will be dropped from the patch later, which uses paths
+                # relative to the repo root. Importantly, the skip-if-exists
+                # patterns are anchored at the subproject root, which may be a
+                # subdirectory of the Git repo, so we need to relativize the
+                # paths accordingly for pattern matching.
+                skip_if_exists_files = [
+                    f
+                    for f in patched_files
                     if self.match_skip(Path(f).relative_to(subproject_subdir))
                 ]
-                try:
-                    diff = diff_cmd("--inter-hunk-context=-1")
-                except ProcessExecutionError:
-                    print(
-                        colors.warn
-                        | "Make sure Git >= 2.24 is installed to improve updates.",
-                        file=sys.stderr,
-                    )
-                    diff = diff_cmd("--inter-hunk-context=0")
-            compared = dircmp(old_copy, new_copy)
-            # Try to apply cached diff into final destination
-            with local.cwd(subproject_top):
-                apply_cmd = git[
-                    "apply",
-                    "--reject",
-                    "--exclude",
-                    subproject_subdir / self.answers_relpath,
+                # Plan the removal of paths that only exist in the last template
+                # version. Tracked ones are found in the tree diff between both
+                # temporary destinations; ignored ones are not tracked, so they are
+                # checked one by one.
+                old_only_files = [
+                    *map(
+                        normalize_git_path,
+                        git(
+                            "diff-tree",
+                            "-r",
+                            "--diff-filter=D",
+                            "--name-only",
+                            "HEAD",
+                            new_copy_head,
+                        ).splitlines(),
+                    ),
+                    *(
+                        path
+                        for path in map(
+                            normalize_git_path,
+                            git(
+                                "ls-files",
+                                "--others",
+                                "--ignored",
+                                "--exclude-standard",
+                            ).splitlines(),
+                        )
+                        if not Path(new_copy, path).is_symlink()
+                        and not Path(new_copy, path).exists()
+                    ),
                 ]
-                # Exclude modified files that match the skip-if-exists patterns
-                # to exclude them from the patch application.
-                for filename in skip_if_exists_files:
-                    apply_cmd = apply_cmd["--exclude", filename]
-                ignored_files = git["status", "--ignored", "--porcelain"]()
-                # returns "!! file1\n !! file2\n"
-                # adds `--exclude file1 --exclude file2` to `git apply` command
-                for filename in ignored_files.splitlines():
-                    if filename.startswith("!! "):
-                        filepath = filename[3:]
+                files_to_remove = [
+                    path
+                    for path in old_only_files
+                    if (subproject_top / path).is_symlink()
+                    or (subproject_top / path).is_file()
+                ]
+            # Try to apply cached diff into final destination, unless pretending
+            if not self.pretend:
+                with (
+                    span("apply", "update"),
+                    local.cwd(subproject_top),
+                    TemporaryFile() as patch,
+                ):
+                    # Exclude the answers file, the task state file and modified
+                    # files that match the skip-if-exists patterns from the patch
+                    # application.
+                    excluded_files = {
+                        (subproject_subdir / self.answers_relpath).as_posix(),
+                        (subproject_subdir / self.tasks_state_relpath).as_posix(),
+                        *skip_if_exists_files,
+                    }
+                    # Only patched files matter, so check their ignore status
+                    # instead of listing ignored files in the whole repository.
+                    ignored_files = (
+                        git["check-ignore", "--stdin", "-z"] << "\0".join(patched_files)
+                    )(retcode=(0, 1))
+                    # returns "file1\0file2\0"
+                    for filepath in filter(None, ignored_files.split("\0")):
                         # Don't exclude template-generated files that happen to
                         # be gitignored — they should still be updated.
                         # Fixes #2729, regression of #1162.
-                        if (Path(new_copy) / normalize_git_path(filepath)).exists():
-                            continue
-                        apply_cmd = apply_cmd["--exclude", filepath]
-                (apply_cmd << diff)(retcode=None)
-                if self.conflict == "inline":
-                    conflicted = []
-                    old_path = Path(old_copy)
-                    new_path = Path(new_copy)
-                    # `--ignored` so we still find .rej files when the
-                    # destination has a `*.rej` ignore rule.
-                    status = (
-                        git("status", "--porcelain", "--ignored").strip().splitlines()
-                    )
-                    for line in status:
-                        # Filter merge rejections (part 1/2)
-                        if not line.startswith(("?? ", "!! ")):
+                        if (Path(new_copy) / filepath).exists():
                             continue
-                        # Remove prefix
-                        fname = line[3:]
-                        # Normalize name
-                        fname = normalize_git_path(fname)
-                        # Filter merge rejections (part 2/2)
-                        if not fname.endswith(".rej"):
-                            continue
-                        # Remove ".rej" suffix
-                        fname = fname[:-4]
-                        # Undo possible non-rejected chunks
-                        git(
-                            # Ignore hooks to avoid errors from them or
-                            # issues when .pre-commit-config.yaml is changed
-                            "-c",
-                            f"core.hooksPath={os.devnull}",
-                            "checkout",
-                            "--",
-                            fname,
+                        excluded_files.add(filepath)
+                    # Spool the filtered diff to a file instead of holding it in
+                    # memory, because it can be huge after big template changes.
+                    try:
+                        _spool_patch(
+                            diff_cmd["--inter-hunk-context=-1"][subproject_pathspec],
+                            patch,
+                            excluded_files,
                         )
-                        # 3-way-merge the file directly
-                        git(
-                            "merge-file",
-                            "-L",
-                            "before updating",
-                            "-L",
-                            "last update",
-                            "-L",
-                            "after updating",
-                            fname,
-                            old_path / fname,
-                            new_path / fname,
-                            retcode=None,
+                    except ProcessExecutionError:
+                        print(
+                            colors.warn
+                            | "Make sure Git >= 2.24 is installed to improve updates.",
+                            file=sys.stderr,
+                        )
+                        _spool_patch(
+                            diff_cmd["--inter-hunk-context=0"][subproject_pathspec],
+                            patch,
+                            excluded_files,
                         )
-                        # Remove rejection witness
-                        Path(f"{fname}.rej").unlink()
-                        # The 3-way merge might have resolved conflicts automatically,
-                        # so we need to check if the file contains conflict markers
-                        # before storing the file name for marking it as unmerged after
-                        # the loop.
-                        with Path(fname).open("rb") as conflicts_candidate:
-                            if any(
-                                line.rstrip()
-                                in {
-                                    b"<<<<<<< before updating",
-                                    b">>>>>>> after updating",
-                                }
-                                for line in conflicts_candidate
+                    # Without `--index`, this only writes the working tree, so
+                    # only the commands below that write the index lock it
+                    git("apply", "--reject", stdin=patch, retcode=None)
+                    if self.conflict == "inline":
+                        conflicted = []
+                        old_path = Path(old_copy)
+                        new_path = Path(new_copy)
+                        # Only patched files can have merge rejections, so look
+                        # for them directly instead of asking `git status`. This
+                        # also finds them when the destination has a `*.rej`
+                        # ignore rule.
+                        for fname in patched_files:
+                            # Filter merge rejections
+                            if not Path(f"{fname}.rej").exists():
+                                continue
+                            # Undo possible non-rejected chunks
+                            with _git_index_locked(subproject_top):
+                                git(
+                                    # Ignore hooks to avoid errors from them or
+                                    # issues when .pre-commit-config.yaml is
+                                    # changed
+                                    "-c",
+                                    f"core.hooksPath={os.devnull}",
+                                    "checkout",
+                                    "--",
+                                    fname,
+                                )
+                            # 3-way-merge the file directly
+                            git(
+                                "merge-file",
+                                "-L",
+                                "before updating",
+                                "-L",
+                                "last update",
+                                "-L",
+                                "after updating",
+                                fname,
+                                old_path / fname,
+                                new_path / fname,
+                                retcode=None,
+                            )
+                            # Remove rejection witness
+                            Path(f"{fname}.rej").unlink()
+                            # The 3-way merge might have resolved conflicts
+                            # automatically, so we need to check if the file
+                            # contains conflict markers before storing the file
+                            # name for marking it as unmerged after the loop.
+                            with Path(fname).open("rb") as conflicts_candidate:
+                                if any(
+                                    line.rstrip()
+                                    in {
+                                        b"<<<<<<< before updating",
+                                        b">>>>>>> after updating",
+                                    }
+                                    for line in conflicts_candidate
+                                ):
+                                    conflicted.append(fname)
+                        # We ran `git merge-file` outside of a regular merge
+                        # operation, which means no merge conflict is recorded in
+                        # the index. Only the usual stage 0 is recorded, with the
+                        # hash of the current version.
+                        # We therefore update the index with the missing stages:
+                        # 1 = current (before updating)
+                        # 2 = base (last update)
+                        # 3 = other (after updating)
+                        # See this SO post: https://stackoverflow.com/questions/79309642/
+                        # and Git docs: https://git-scm.com/docs/git-update-index#_using_index_info.
+                        if conflicted:
+                            input_lines = []
+                            for line in (
+                                git("ls-files", "--stage", *conflicted)
+                                .strip()
+                                .splitlines()
                             ):
-                                conflicted.append(fname)
-                    # We ran `git merge-file` outside of a regular merge operation,
-                    # which means no merge conflict is recorded in the index.
-                    # Only the usual stage 0 is recorded, with the hash of the current
-                    # version.
-                    # We therefore update the index with the missing stages:
-                    # 1 = current (before updating)
-                    # 2 = base (last update)
-                    # 3 = other (after updating)
-                    # See this SO post: https://stackoverflow.com/questions/79309642/
-                    # and Git docs: https://git-scm.com/docs/git-update-index#_using_index_info.
-                    if conflicted:
-                        input_lines = []
-                        for line in (
-                            git("ls-files", "--stage", *conflicted).strip().splitlines()
-                        ):
-                            perms_sha_mode, path = line.split("\t")
-                            perms, sha, _ = perms_sha_mode.split()
-                            input_lines.append(f"0 {'0' * 40}\t{path}")
-                            input_lines.append(f"{perms} {sha} 2\t{path}")
-                            with suppress(ProcessExecutionError):
-                                # The following command will fail
-                                # if the file did not exist in the previous version.
-                                old_sha = git(
-                                    "hash-object",
-                                    "-w",
-                                    old_path / normalize_git_path(path),
-                                ).strip()
-                                input_lines.append(f"{perms} {old_sha} 1\t{path}")
-                            with suppress(ProcessExecutionError):
-                                # The following command will fail
-                                # if the file was deleted in the latest version.
-                                new_sha = git(
-                                    "hash-object",
-                                    "-w",
-                                    new_path / normalize_git_path(path),
-                                ).strip()
-                                input_lines.append(f"{perms} {new_sha} 3\t{path}")
-                        (
-                            git["update-index", "--index-info"]
-                            << "\n".join(input_lines)
-                        )()
-            # Trigger recursive removal of deleted files in last template version
-            _remove_old_files(subproject_top, compared)
+                                perms_sha_mode, path = line.split("\t")
+                                perms, sha, _ = perms_sha_mode.split()
+                                input_lines.append(f"0 {'0' * 40}\t{path}")
+                                input_lines.append(f"{perms} {sha} 2\t{path}")
+                                with suppress(ProcessExecutionError):
+                                    # The following command will fail
+                                    # if the file did not exist in the previous version.
+                                    old_sha = git(
+                                        "hash-object",
+                                        "-w",
+                                        old_path / normalize_git_path(path),
+                                    ).strip()
+                                    input_lines.append(f"{perms} {old_sha} 1\t{path}")
+                                with suppress(ProcessExecutionError):
+                                    # The following command will fail
+                                    # if the file was deleted in the latest version.
+                                    new_sha = git(
+                                        "hash-object",
+                                        "-w",
+                                        new_path / normalize_git_path(path),
+                                    ).strip()
+                                    input_lines.append(f"{perms} {new_sha} 3\t{path}")
+                            with _git_index_locked(subproject_top):
+                                (
+                                    git["update-index", "--index-info"]
+                                    << "\n".join(input_lines)
+                                )()
+                    else:
+                        conflicted = [
+                            fname
+                            for fname in patched_files
+                            if Path(f"{fname}.rej").exists()
+                        ]
+                    self.conflicts = [
+                        Path(fname).relative_to(subproject_subdir).as_posix()
+                        for fname in conflicted
+                    ]
+            # Remove files deleted in the last template version
+            for path in files_to_remove:
+                printf(
+                    "remove",
+                    Path(path).relative_to(subproject_subdir),
+                    style=Style.WARNING,
+                    quiet=self.quiet,
+                    file_=sys.stderr,
+                )
+            if not self.pretend:
+                _remove_old_files(subproject_top, files_to_remove)
 
         # Run post-migration tasks
         with Phase.use(Phase.MIGRATE):
@@ -1735,7 +2224,13 @@ def run_copy(
     quiet: bool = False,
     unsafe: bool = False,
     skip_tasks: bool = False,
+    task_jobs: PositiveInt = 1,
+    force_tasks: bool = False,
+    profile: Path | str | None = None,
+    trace_git: Path | str | None = None,
+    on_event: EventCallback | None = None,
     ask: Sequence[str] = (),
+    sink: Sink | None = None,
 ) -> Worker:
     """Copy a template to a destination, from zero."""
     with Worker(
@@ -1764,7 +2259,13 @@ def run_copy(
         quiet=quiet,
         unsafe=unsafe,
         skip_tasks=skip_tasks,
+        task_jobs=task_jobs,
+        force_tasks=force_tasks,
+        profile=Path(profile) if profile is not None else None,
+        trace_git=Path(trace_git) if trace_git is not None else None,
+        on_event=on_event,
         ask=ask,
+        sink=sink,
     ) as worker:
         worker.run_copy()
     return worker
@@ -1789,7 +2290,13 @@ def run_recopy(
     unsafe: bool = False,
     skip_answered: bool = False,
     skip_tasks: bool = False,
+    task_jobs: PositiveInt = 1,
+    force_tasks: bool = False,
+    profile: Path | str | None = None,
+    trace_git: Path | str | None = None,
+    on_event: EventCallback | None = None,
     ask: Sequence[str] = (),
+    sink: Sink | None = None,
 ) -> Worker:
     """Update a subproject from its template, discarding subproject evolution."""
     with Worker(
@@ -1818,7 +2325,13 @@ def run_recopy(
         unsafe=unsafe,
         skip_answered=skip_answered,
         skip_tasks=skip_tasks,
+        task_jobs=task_jobs,
+        force_tasks=force_tasks,
+        profile=Path(profile) if profile is not None else None,
+        trace_git=Path(trace_git) if trace_git is not None else None,
+        on_event=on_event,
         ask=ask,
+        sink=sink,
     ) as worker:
         worker.run_recopy()
     return worker
@@ -1845,6 +2358,11 @@ def run_update(
     unsafe: bool = False,
     skip_answered: bool = False,
     skip_tasks: bool = False,
+    task_jobs: PositiveInt = 1,
+    force_tasks: bool = False,
+    profile: Path | str | None = None,
+    trace_git: Path | str | None = None,
+    on_event: EventCallback | None = None,
     ask: Sequence[str] = (),
 ) -> Worker:
     """Update a subproject, from its template."""
@@ -1876,12 +2394,128 @@ def run_update(
         unsafe=unsafe,
         skip_answered=skip_answered,
         skip_tasks=skip_tasks,
+        task_jobs=task_jobs,
+        force_tasks=force_tasks,
+        profile=Path(profile) if profile is not None else None,
+        trace_git=Path(trace_git) if trace_git is not None else None,
+        on_event=on_event,
         ask=ask,
     ) as worker:
         worker.run_update()
     return worker
 
 
+def compile_template(
+    src_path: str,
+    dst_path: Path | str,
+    *,
+    vcs_ref: str | VcsRef | None = None,
+    settings: Settings | SettingsModel | None = None,
+    use_prereleases: bool = False,
+    unsafe: bool = False,
+) -> None:
+    """Precompile a template into a bundle.
+
+    See [compiling a template][compiling-a-template].
+    """
+    dst = Path(dst_path)
+    if dst.exists() and (not dst.is_dir() or any(dst.iterdir())):
+        raise UserMessageError(
+            f"Destination `{dst}` must not exist or be an empty directory."
+        )
+    with Worker(
+        src_path=src_path,
+        dst_path=dst,
+        vcs_ref=vcs_ref,
+        settings=(
+            SettingsModel(defaults=settings.defaults, trust=settings.trust)
+            if isinstance(settings, Settings)
+            else (settings or SettingsModel.from_file())
+        ),
+        use_prereleases=use_prereleases,
+        quiet=True,
+        unsafe=unsafe,
+    ) as worker:
+        template = worker.template
+        if template.bundle is not None:
+            raise UserMessageError("The template is already compiled.")
+        # Compiling loads the Jinja extensions
+        if template.jinja_extensions and not (
+            unsafe or is_trusted_repository(worker.settings.trust, template.url)
+        ):
+            raise UnsafeTemplateError(["jinja_extensions"])
+        # Write next to the destination and move it there once complete, so a
+        # failure never leaves a half-written bundle behind
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        with TemporaryDirectory(prefix=f".{dst.name}.", dir=dst.parent) as tmp:
+            bundle = Path(tmp, dst.name)
+            bundle.mkdir()
+            write_bundle(
+                bundle,
+                template_root=template.local_abspath,
+                env=worker.jinja_env,
+                templates_suffix=template.templates_suffix,
+                config=template._raw_config,
+                modes=template.git_index_modes,
+                source=template.url,
+                commit=template.commit,
+            )
+            with suppress(FileNotFoundError):
+                dst.rmdir()
+            bundle.rename(dst)
+
+
+def inspect_template(
+    src_path: str,
+    vcs_ref: str | None = None,
+    *,
+    use_prereleases: bool = False,
+) -> AnyByStrDict:
+    """Read the metadata of a template, without copying it.
+
+    Git-tracked templates are read straight from the git objects of their repo,
+    so no version is checked out, unless it's the dirty `HEAD` of a local repo.
+
+    Args:
+        src_path:
+            Where to get the template from. This can be a git URL or a local path.
+        vcs_ref:
+            Git reference to read. If `None`, the latest tag sorted by PEP 440.
+        use_prereleases:
+            When `vcs_ref` is `None`, consider prereleases to find the latest tag.
+
+    Returns:
+        A JSON-serializable dict with the template source, commit, version,
+        `_min_copier_version`, questions, tasks and migrations.
+
+    See [inspecting a template][inspecting-a-template].
+    """
+    template = Template(
+        url=src_path, ref=vcs_ref, use_prereleases=use_prereleases, checkout=False
+    )
+    try:
+        # Don't verify `_min_copier_version`; inspecting works with any version
+        config, questions = filter_config(template._raw_config)
+        for key in set(config.get("secret_questions", [])) & questions.keys():
+            questions[key]["secret"] = True
+        result: AnyByStrDict = to_jsonable_python(
+            {
+                "src_path": template.url,
+                "commit": template.commit,
+                "commit_hash": template.commit_hash,
+                "version": template.version and str(template.version),
+                "min_copier_version": config.get("min_copier_version"),
+                "questions": questions,
+                "tasks": config.get("tasks", []),
+                "migrations": config.get("migrations", []),
+            },
+            fallback=str,
+        )
+    finally:
+        template._cleanup()
+    return result
+
+
 def get_update_data(
     dst_path: Path | str = ".",
     answers_file: Path | str | None = None,
@@ -1891,7 +2525,9 @@ def get_update_data(
 
     Returns a tuple containing a bool for if the project has an update,
     a string containing a project's current version, and a string containing
-    the latest version of the template available.
+    the latest version of the template available. Both versions are computed
+    from their commits, so no update is reported when the latest version points
+    to the commit the project already uses.
 
     See [checking a project][checking-a-project].
     """
@@ -1909,6 +2545,16 @@ def get_update_data(
                 "Cannot check because cannot obtain old template references "
                 f"from `{worker.subproject.answers_relpath}`."
             )
+        if worker.template.vcs != "git":
+            raise UserMessageError(
+                "Checking is only supported in git-tracked templates."
+            )
+        # Try to avoid checking out both template versions
+        result = _get_update_data_from_refs(
+            worker.template, worker.subproject.template.ref
+        )
+        if result is not None:
+            return result
         if worker.template.commit is None:
             raise UserMessageError(
                 "Checking is only supported in git-tracked templates."
@@ -1927,48 +2573,117 @@ def get_update_data(
     return (update_available, current_version, latest_version)
 
 
-def _remove_old_files(prefix: Path, cmp: dircmp[str], rm_common: bool = False) -> None:
-    """Remove files and directories only found in "old" template.
+def _get_update_data_from_refs(
+    template: Template, last_commit: str, tags: Mapping[str, str] | None = None
+) -> tuple[bool, str, str] | None:
+    """Get the same data as `get_update_data`, but from Git refs alone.
+
+    Both versions are computed from the remote tags and from the commit description
+    stored in the answers file, so no template version is checked out.
+
+    Args:
+        template:
+            The latest template, without a specific ref.
+        last_commit:
+            The commit description of the template used in the last update.
+        tags:
+            The template tags, as returned by
+            [get_remote_tags][copier._vcs.get_remote_tags]. They're listed if not
+            given.
+
+    Returns:
+        The update data, or `None` if it can't be known without a checkout.
+    """
+    if template.ref is not None:
+        return None
+    if tags is None:
+        tags = get_remote_tags(template.url_expanded)
+    latest_tag = select_latest_tag(tags, template.use_prereleases)
+    if latest_tag is None:
+        return None
+    # The description has the format "<tag>-<count>-g<hash>" or "<tag>"
+    match = re.fullmatch(
+        r"(?P<tag>.+)-(?P<distance>\d+)-g(?P<hash>[0-9a-f]+)", last_commit
+    )
+    if match and match["tag"] in tags:
+        last_tag, distance, last_hash = (
+            match["tag"],
+            int(match["distance"]),
+            match["hash"],
+        )
+    elif last_commit in tags:
+        last_tag, distance, last_hash = last_commit, 0, tags[last_commit]
+    else:
+        return None
+    if not valid_version(last_tag):
+        return None
+    latest_version = tag_version(latest_tag)
+    # A new tag on the same commit is not an update; a checkout of that commit
+    # would have the version of the new tag
+    if tags[latest_tag].startswith(last_hash):
+        return (False, str(latest_version), str(latest_version))
+    current_version = tag_version(last_tag, distance, last_hash)
+    return (
+        latest_version > current_version,
+        str(current_version),
+        str(latest_version),
+    )
+
+
+def _spool_patch(
+    diff_cmd: BaseCommand, patch: IO[bytes], exclude: Container[str]
+) -> None:
+    """Stream a Git patch into a file, without the changes of excluded paths.
+
+    Args:
+        diff_cmd:
+            The Git command that writes the patch to its standard output.
+        patch:
+            The file where the patch is written. It is truncated first, and
+            rewound after writing, so it's ready to be read.
+        exclude:
+            Paths, relative to the repo root, whose changes must be dropped.
+
+    Raises:
+        ProcessExecutionError: If the Git command fails.
+    """
+    patch.seek(0)
+    patch.truncate()
+    # Errors go to a file, so Git never blocks on a full pipe while writing them
+    with TemporaryFile() as stderr:
+        process = diff_cmd.popen(stdout=subprocess.PIPE, stderr=stderr)
+        # The process pipes are binary, despite the type annotations of plumbum
+        stdout = cast(IO[bytes], process.stdout)
+        patch.writelines(filter_git_patch(stdout, exclude.__contains__))
+        process.communicate()
+        if process.returncode:
+            stderr.seek(0)
+            raise ProcessExecutionError(
+                diff_cmd.formulate(), process.returncode, "", stderr.read()
+            )
+    patch.seek(0)
+
 
-    This is an internal helper method used to process a comparison of 2
-    directories, where the left one is considered the "old" one, and the
-    right one is the "new" one.
+def _remove_old_files(prefix: Path, paths: Iterable[str]) -> None:
+    """Remove files only found in the "old" template, in a single pass.
 
-    Then, it will recursively try to remove anything that is only in the old
-    directory.
+    Directories that end up empty after removing those files are removed too.
 
     Args:
         prefix:
-            Where we start removing. It can be different from the directories
-            being compared.
-        cmp:
-            The comparison result.
-        rm_common:
-            Should we remove common files and directories?
+            Where we start removing.
+        paths:
+            Paths of the files to remove, relative to `prefix`.
     """
-    # Gather files and dirs to remove
-    to_rm = []
-    subdirs = {}
-    with suppress(NotADirectoryError, FileNotFoundError):
-        to_rm = cmp.left_only
-        if rm_common:
-            to_rm += cmp.common_files + cmp.common_dirs
-        subdirs = cmp.subdirs
-    # Remove files found only in old template copy
-    for name in to_rm:
-        target = prefix / name
-        if target.is_file():
+    dirs: set[Path] = set()
+    for path in paths:
+        target = prefix / path
+        with suppress(FileNotFoundError):
             target.unlink()
-        else:
-            # Recurse in dirs totally removed in latest template
-            _remove_old_files(target, dircmp(Path(cmp.left, name), target), True)
-            # Remove subdir if it ends empty
-            with suppress(OSError):
-                target.rmdir()  # Raises if dir not empty
-    # Recurse
-    for key, value in subdirs.items():
-        subdir = prefix / key
-        _remove_old_files(subdir, value)
-        # Remove subdir if it ends empty
+        dirs.update(
+            prefix / parent for parent in PurePosixPath(path).parents if parent.parts
+        )
+    # Remove dirs that end empty, deepest first
+    for directory in sorted(dirs, key=lambda path: len(path.parts), reverse=True):
         with suppress(OSError):
-            subdir.rmdir()  # Raises if dir not empty
+            directory.rmdir()  # Raises if dir not empty
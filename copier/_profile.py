@@ -0,0 +1,211 @@
+"""Timing of the steps of a Copier run.
+
+Code wraps its steps in [span][copier._profile.span]. Those spans cost almost
+nothing unless a [Profiler][copier._profile.Profiler] is active, see
+[profiling][copier._profile.profiling], or progress events are listened to, see
+[listening][copier._events.listening].
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ._events import StepFinished, StepStarted, emit, emitting
+
+TOP_FILES = 20
+"""Number of slowest rendered files listed in the report."""
+
+
+@dataclass(frozen=True)
+class Span:
+    """A finished step of a profiled run.
+
+    Attributes:
+        name: What was done, such as a phase or the path of a rendered file.
+        category: Kind of step, such as `phase`, `git`, `update` or `file`.
+        start: Wall clock time when it started, in seconds since profiling
+            started.
+        wall: Wall clock duration, in seconds.
+        cpu: CPU time used by the Copier process meanwhile, in seconds.
+        thread: ID of the thread where it ran.
+        args: Additional details.
+    """
+
+    name: str
+    category: str
+    start: float
+    wall: float
+    cpu: float
+    thread: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Profiler:
+    """Collector of the spans of a run."""
+
+    spans: list[Span] = field(default_factory=list)
+    _origin: float = field(default_factory=time.perf_counter, init=False)
+    _cpu_origin: float = field(default_factory=time.process_time, init=False)
+
+    def add(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        cpu_start: float,
+        args: dict[str, Any],
+    ) -> None:
+        """Record a span that started at the given `perf_counter` and CPU times."""
+        self.spans.append(
+            Span(
+                name=name,
+                category=category,
+                start=start - self._origin,
+                wall=time.perf_counter() - start,
+                cpu=time.process_time() - cpu_start,
+                thread=threading.get_ident(),
+                args=args,
+            )
+        )
+
+    def report(self, top_files: int = TOP_FILES) -> dict[str, Any]:
+        """Summarize the spans.
+
+        Returns:
+            Total wall and CPU times; the times of each category and name of
+            span, slowest first; and the `top_files` slowest rendered files.
+        """
+        totals: dict[tuple[str, str], dict[str, Any]] = {}
+        for span_ in self.spans:
+            if span_.category == "file":
+                continue
+            total = totals.setdefault(
+                (span_.category, span_.name),
+                {"category": span_.category, "name": span_.name, "count": 0},
+            )
+            total["count"] += 1
+            total["wall"] = total.get("wall", 0.0) + span_.wall
+            total["cpu"] = total.get("cpu", 0.0) + span_.cpu
+        files = sorted(
+            (span_ for span_ in self.spans if span_.category == "file"),
+            key=lambda span_: span_.wall,
+            reverse=True,
+        )
+        return {
+            "wall": time.perf_counter() - self._origin,
+            "cpu": time.process_time() - self._cpu_origin,
+            "spans": sorted(totals.values(), key=lambda t: t["wall"], reverse=True),
+            "files": {
+                "count": len(files),
+                "wall": sum(span_.wall for span_ in files),
+                "cpu": sum(span_.cpu for span_ in files),
+                "slowest": [
+                    {"path": span_.name, "wall": span_.wall, "cpu": span_.cpu}
+                    for span_ in files[:top_files]
+                ],
+            },
+        }
+
+    def trace(self) -> dict[str, Any]:
+        """Get the spans as Chrome trace events.
+
+        Open them in `chrome://tracing` or [Perfetto](https://ui.perfetto.dev).
+        """
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": span_.name,
+                    "cat": span_.category,
+                    "ph": "X",
+                    "ts": span_.start * 1e6,
+                    "dur": span_.wall * 1e6,
+                    "pid": pid,
+                    "tid": span_.thread,
+                    "args": {"cpu": span_.cpu, **span_.args},
+                }
+                for span_ in self.spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write(self, path: Path) -> None:
+        """Write the report into `path`, and the trace beside it.
+
+        The trace file is named after the report, with a `.trace.json` suffix.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2) + "\n")
+        trace_path(path).write_text(json.dumps(self.trace()))
+
+
+_profiler: ContextVar[Profiler | None] = ContextVar("profiler", default=None)
+
+
+def trace_path(path: Path) -> Path:
+    """Get the path of the trace file written beside a profiling report."""
+    return path.with_suffix(".trace.json")
+
+
+@contextmanager
+def span(name: str, category: str = "copier", **args: Any) -> Iterator[None]:
+    """Time the code in the context, if profiling or emitting progress events.
+
+    Steps other than rendered files, which have their own events, are
+    announced as [StepStarted][copier._events.StepStarted] and
+    [StepFinished][copier._events.StepFinished] events.
+
+    Args:
+        name: What is being done.
+        category: Kind of step.
+        **args: Additional details to include in the trace.
+    """
+    profiler = _profiler.get()
+    events = category != "file" and emitting()
+    if profiler is None and not events:
+        yield
+        return
+    start, cpu_start = time.perf_counter(), time.process_time()
+    if events:
+        emit(StepStarted(name, category))
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        if profiler is not None:
+            profiler.add(name, category, start, cpu_start, args)
+        if events:
+            emit(StepFinished(name, category, time.perf_counter() - start, ok))
+
+
+@contextmanager
+def profiling(path: Path | None) -> Iterator[Profiler | None]:
+    """Profile the code in the context, and write the results into `path`.
+
+    Nothing is done if `path` is `None` or if already profiling, so nested
+    operations are profiled along with the outermost one.
+
+    Yields:
+        The active profiler, if one was started.
+    """
+    if path is None or _profiler.get() is not None:
+        yield None
+        return
+    profiler = Profiler()
+    token = _profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _profiler.reset(token)
+        profiler.write(path)
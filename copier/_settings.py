@@ -16,6 +16,7 @@ import yaml
 from platformdirs import user_config_path
 from pydantic import BaseModel, Field, ValidationError
 
+from . import _yaml
 from ._tools import OS
 from .errors import MissingSettingsWarning, SettingsError
 
@@ -111,7 +112,7 @@ class SettingsModel(BaseModel):
                         )
                         settings_path = old_settings_path
         if settings_path.is_file():
-            data = yaml.safe_load(settings_path.read_bytes())
+            data = _yaml.load(settings_path.read_bytes())
             return cls.model_validate(data)
         elif env_path:
             warnings.warn(
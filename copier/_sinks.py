@@ -0,0 +1,368 @@
+"""Destinations where Copier writes a rendered project.
+
+By default, a project is rendered into its destination directory. A sink can
+be passed to [run_copy][copier.run_copy] to render it elsewhere instead: into a
+tar or zip archive, streamed to any binary file object, or into memory.
+"""
+
+from __future__ import annotations
+
+import platform
+import stat
+import sys
+import tarfile
+import time
+import warnings
+import zipfile
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from dataclasses import dataclass
+from hashlib import sha256
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from types import TracebackType
+from typing import IO, Literal
+
+if sys.version_info < (3, 11):
+    from typing_extensions import Self
+else:
+    from typing import Self
+
+Kind = Literal["file", "dir", "symlink"]
+"""What a rendered path is."""
+
+TarCompression = Literal["", "gz", "bz2", "xz"]
+"""Compression of a tar archive; empty for none."""
+
+# Modes of the entries in archives that have no mode in the template
+_DIR_MODE = 0o40755
+_SYMLINK_MODE = 0o120777
+
+
+class Sink(ABC):
+    """Destination where a project is rendered.
+
+    All paths are relative to the project root. Sinks can be used as context
+    managers, which [close][copier.Sink.close] them on exit.
+    """
+
+    @abstractmethod
+    def compare(
+        self, relpath: Path, kind: Kind, contents: bytes | Path, mode: int | None
+    ) -> bool | None:
+        """Compare a path with what is already rendered in it.
+
+        Args:
+            relpath: Rendered path.
+            kind: What the path must be.
+            contents: Contents of a file, or target of a symlink.
+            mode: Mode of a file. Only its executable bits are compared.
+
+        Returns:
+            `None` if nothing is rendered there yet, `True` if the same thing is
+            rendered there, or `False` otherwise.
+        """
+
+    @abstractmethod
+    def write_file(self, relpath: Path, contents: bytes, mode: int) -> None:
+        """Write a file, replacing what was rendered in its path."""
+
+    @abstractmethod
+    def write_symlink(self, relpath: Path, target: Path, mode: int) -> None:
+        """Write a symlink, replacing what was rendered in its path."""
+
+    @abstractmethod
+    def make_dir(self, relpath: Path) -> None:
+        """Create a directory, if it doesn't exist yet."""
+
+    def close(self) -> None:  # noqa: B027
+        """Finish writing the project."""
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        type: type[BaseException] | None,
+        value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class FileSystemSink(Sink):
+    """Sink that writes a project into a directory. It's the default one.
+
+    Args:
+        root: Root directory of the project.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def compare(
+        self, relpath: Path, kind: Kind, contents: bytes | Path, mode: int | None
+    ) -> bool | None:
+        """Compare a path with what is already rendered in it."""
+        path = self.root / relpath
+        previous_is_symlink = path.is_symlink()
+        try:
+            previous_contents: bytes | Path
+            if previous_is_symlink:
+                previous_contents = path.readlink()
+            else:
+                previous_contents = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except PermissionError as error:
+            # HACK https://bugs.python.org/issue43095
+            if not (error.errno == 13 and platform.system() == "Windows"):
+                raise
+            return kind == "dir"
+        except IsADirectoryError:
+            return kind == "dir"
+        mode_matches = True
+        if mode is not None and not previous_is_symlink:
+            with suppress(FileNotFoundError, PermissionError):
+                mode_matches = path.stat().st_mode & 0o111 == mode & 0o111
+        return (
+            previous_contents == contents
+            and previous_is_symlink == (kind == "symlink")
+            and mode_matches
+        )
+
+    def write_file(self, relpath: Path, contents: bytes, mode: int) -> None:
+        """Write a file, replacing what was rendered in its path."""
+        path = self.root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.is_symlink():
+            # Writing to a symlink just writes to its target, so if we want to
+            # replace a symlink with a file we have to unlink it first
+            path.unlink()
+        path.write_bytes(contents)
+        if (path_mode := path.stat().st_mode) != mode:
+            try:
+                path.chmod(mode)
+            except PermissionError:
+                # In some filesystems (e.g., gcsfuse), `chmod` is not allowed,
+                # so we suppress the `PermissionError` here.
+                warnings.warn(
+                    f"Path permissions for {path} cannot be changed from "
+                    f"{stat.filemode(path_mode)} to {stat.filemode(mode)}",
+                    stacklevel=2,
+                )
+
+    def write_symlink(self, relpath: Path, target: Path, mode: int) -> None:
+        """Write a symlink, replacing what was rendered in its path."""
+        path = self.root / relpath
+        # symlink_to doesn't overwrite existing files, so delete it first
+        if path.is_symlink() or path.exists():
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.symlink_to(target)
+        if sys.platform == "darwin":
+            # Only macOS supports permissions on symlinks.
+            # Other platforms just copy the permission of the target
+            path.lchmod(mode)
+
+    def make_dir(self, relpath: Path) -> None:
+        """Create a directory, if it doesn't exist yet."""
+        (self.root / relpath).mkdir(parents=True, exist_ok=True)
+
+
+@dataclass(frozen=True)
+class MemoryEntry:
+    """A path rendered into a [MemorySink][copier.MemorySink].
+
+    Attributes:
+        kind: What the path is.
+        contents: Contents of a file.
+        target: Target of a symlink.
+        mode: Mode of the path, like `os.stat().st_mode`.
+    """
+
+    kind: Kind
+    contents: bytes = b""
+    target: Path | None = None
+    mode: int = 0
+
+
+class MemorySink(Sink):
+    """Sink that keeps a project in memory.
+
+    Attributes:
+        entries: Rendered paths, relative to the project root, in render order.
+            Directories are included, also when they're implicitly created by
+            the files inside them.
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[PurePosixPath, MemoryEntry] = {}
+
+    def compare(
+        self, relpath: Path, kind: Kind, contents: bytes | Path, mode: int | None
+    ) -> bool | None:
+        """Compare a path with what is already rendered in it."""
+        previous = self.entries.get(PurePosixPath(relpath.as_posix()))
+        if previous is None:
+            return None
+        if kind == "symlink":
+            return previous.kind == "symlink" and previous.target == contents
+        return (
+            previous.kind == kind
+            and previous.contents == contents
+            and (mode is None or previous.mode & 0o111 == mode & 0o111)
+        )
+
+    def write_file(self, relpath: Path, contents: bytes, mode: int) -> None:
+        """Write a file, replacing what was rendered in its path."""
+        self._add(relpath, MemoryEntry("file", contents, mode=mode))
+
+    def write_symlink(self, relpath: Path, target: Path, mode: int) -> None:
+        """Write a symlink, replacing what was rendered in its path."""
+        self._add(relpath, MemoryEntry("symlink", target=target, mode=mode))
+
+    def make_dir(self, relpath: Path) -> None:
+        """Create a directory, if it doesn't exist yet."""
+        if PurePosixPath(relpath.as_posix()) not in self.entries:
+            self._add(relpath, MemoryEntry("dir", mode=_DIR_MODE))
+
+    def _add(self, relpath: Path, entry: MemoryEntry) -> None:
+        path = PurePosixPath(relpath.as_posix())
+        for parent in reversed(path.parents[:-1]):
+            self.entries.setdefault(parent, MemoryEntry("dir", mode=_DIR_MODE))
+        self.entries[path] = entry
+
+
+class _ArchiveSink(Sink):
+    """Sink that streams a project into an archive.
+
+    Archives can't be rewritten, so only a digest of each written path is kept
+    to compare them. A path rendered twice is added twice to the archive; the
+    last one wins when extracting it.
+    """
+
+    def __init__(self) -> None:
+        self._digests: dict[PurePosixPath, tuple[Kind, bytes, int | None]] = {}
+        self._mtime = time.time()
+
+    def compare(
+        self, relpath: Path, kind: Kind, contents: bytes | Path, mode: int | None
+    ) -> bool | None:
+        """Compare a path with what is already rendered in it."""
+        previous = self._digests.get(PurePosixPath(relpath.as_posix()))
+        if previous is None:
+            return None
+        previous_kind, previous_digest, previous_mode = previous
+        return (
+            previous_kind == kind
+            and previous_digest == _digest(contents)
+            and (
+                mode is None
+                or previous_mode is None
+                or previous_mode & 0o111 == mode & 0o111
+            )
+        )
+
+    def write_file(self, relpath: Path, contents: bytes, mode: int) -> None:
+        """Write a file, replacing what was rendered in its path."""
+        path = self._record(relpath, "file", contents, mode)
+        self._add(path, "file", contents, mode)
+
+    def write_symlink(self, relpath: Path, target: Path, mode: int) -> None:
+        """Write a symlink, replacing what was rendered in its path."""
+        path = self._record(relpath, "symlink", target, None)
+        self._add(path, "symlink", str(target).encode(), mode or _SYMLINK_MODE)
+
+    def make_dir(self, relpath: Path) -> None:
+        """Create a directory, if it doesn't exist yet."""
+        if PurePosixPath(relpath.as_posix()) not in self._digests:
+            path = self._record(relpath, "dir", b"", None)
+            self._add(path, "dir", b"", _DIR_MODE)
+
+    def _record(
+        self, relpath: Path, kind: Kind, contents: bytes | Path, mode: int | None
+    ) -> PurePosixPath:
+        path = PurePosixPath(relpath.as_posix())
+        self._digests[path] = (kind, _digest(contents), mode)
+        return path
+
+    @abstractmethod
+    def _add(self, path: PurePosixPath, kind: Kind, contents: bytes, mode: int) -> None:
+        """Add an entry to the archive."""
+
+
+class TarSink(_ArchiveSink):
+    """Sink that streams a project into a tar archive.
+
+    The archive is finished when the sink is closed. The file object is not
+    closed, so it can be `sys.stdout.buffer` or a network stream, for example.
+
+    Args:
+        fileobj: Binary file object where the archive is written.
+        compression: Compression of the archive; empty for none.
+    """
+
+    def __init__(self, fileobj: IO[bytes], compression: TarCompression = "gz") -> None:
+        super().__init__()
+        # Kept open until the sink is closed
+        self._tar = tarfile.TarFile.open(
+            fileobj=fileobj,
+            mode=f"w|{compression}",  # type: ignore[call-overload]
+        )
+
+    def _add(self, path: PurePosixPath, kind: Kind, contents: bytes, mode: int) -> None:
+        info = tarfile.TarInfo(str(path))
+        info.mtime = int(self._mtime)
+        info.mode = stat.S_IMODE(mode)
+        if kind == "dir":
+            info.type = tarfile.DIRTYPE
+        elif kind == "symlink":
+            info.type = tarfile.SYMTYPE
+            info.linkname = contents.decode()
+        else:
+            info.size = len(contents)
+        self._tar.addfile(info, BytesIO(contents) if kind == "file" else None)
+
+    def close(self) -> None:
+        """Finish writing the archive."""
+        self._tar.close()
+
+
+class ZipSink(_ArchiveSink):
+    """Sink that streams a project into a zip archive.
+
+    The archive is finished when the sink is closed. The file object is not
+    closed, and it doesn't need to be seekable.
+
+    Args:
+        fileobj: Binary file object where the archive is written.
+        compression: Compression method, one of the `zipfile.ZIP_*` constants.
+    """
+
+    def __init__(
+        self, fileobj: IO[bytes], compression: int = zipfile.ZIP_DEFLATED
+    ) -> None:
+        super().__init__()
+        self._zip = zipfile.ZipFile(fileobj, "w", compression=compression)
+
+    def _add(self, path: PurePosixPath, kind: Kind, contents: bytes, mode: int) -> None:
+        name = f"{path}/" if kind == "dir" else str(path)
+        info = zipfile.ZipInfo(name, time.localtime(self._mtime)[:6])
+        info.compress_type = self._zip.compression
+        # Unix mode in the high bits, MS-DOS directory flag in the low ones
+        info.external_attr = (mode & 0xFFFF) << 16 | (0x10 if kind == "dir" else 0)
+        with warnings.catch_warnings():
+            # Paths rendered twice are added twice on purpose
+            warnings.filterwarnings("ignore", "Duplicate name", UserWarning)
+            self._zip.writestr(info, contents)
+
+    def close(self) -> None:
+        """Finish writing the archive."""
+        self._zip.close()
+
+
+def _digest(contents: bytes | Path) -> bytes:
+    if isinstance(contents, Path):
+        contents = str(contents).encode()
+    return sha256(contents).digest()
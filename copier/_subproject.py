@@ -43,8 +43,22 @@ class Subproject:
         """
         if self.vcs == "git":
             with local.cwd(self.local_abspath):
+                # Rename detection is not needed to know if there are changes,
+                # and optional locks would contend with other Git processes in
+                # the same (possibly huge) repository. Untracked files are
+                # listed like by default, whatever `status.showUntrackedFiles`
+                # says: listing all of them only makes it slower, and ignoring
+                # them would hide files that the update could overwrite.
                 return bool(
-                    get_git()("status", self.local_abspath, "--porcelain").strip()
+                    get_git()(
+                        "--no-optional-locks",
+                        "status",
+                        "--porcelain",
+                        "--no-renames",
+                        "--untracked-files=normal",
+                        "--",
+                        self.local_abspath,
+                    ).strip()
                 )
         return False
 
@@ -76,7 +90,7 @@ class Subproject:
         last_url = self.last_answers.get("_src_path")
         last_ref = self.last_answers.get("_commit")
         if last_url:
-            result = Template(url=last_url, ref=last_ref)
+            result = Template(url=last_url, ref=last_ref, checkout=False)
             self._cleanup_hooks.append(result._cleanup)
             return result
         return None
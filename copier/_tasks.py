@@ -0,0 +1,414 @@
+"""Execution of template tasks and migrations.
+
+Tasks run one after another by default. Tasks that declare which other tasks
+they depend on can run in parallel with them; see [tasks][].
+
+Tasks that declare their inputs are skipped when their inputs didn't change
+since they last succeeded. Fingerprints of those inputs are kept in a state
+file beside the answers file; see
+[TaskState][copier._tasks.TaskState].
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from hashlib import sha256
+from pathlib import Path
+
+from ._events import TaskFinished, TaskStarted, emit, emitting
+from ._template import Task
+from .errors import ConfigFileError, TaskError
+
+
+def resolve_dependencies(tasks: Sequence[Task]) -> list[frozenset[int]]:
+    """Find the tasks that each task depends on.
+
+    A task without `depends_on` depends on the one declared before it, so tasks
+    run in order unless told otherwise.
+
+    Returns:
+        The positions of the tasks that each task depends on.
+
+    Raises:
+        ConfigFileError: If a task ID is repeated, or a task depends on an
+            unknown task or one declared after it.
+    """
+    positions: dict[str, int] = {}
+    result = []
+    for position, task in enumerate(tasks):
+        if task.depends_on is None:
+            result.append(frozenset({position - 1} if position else ()))
+        else:
+            dependencies = set()
+            for task_id in task.depends_on:
+                if task_id not in positions:
+                    raise ConfigFileError(
+                        f"Task {task.id or position + 1!r} depends on {task_id!r}, "
+                        "which is not a task declared before it"
+                    )
+                dependencies.add(positions[task_id])
+            result.append(frozenset(dependencies))
+        if task.id is not None:
+            if task.id in positions:
+                raise ConfigFileError(f"Task ID {task.id!r} is repeated")
+            positions[task.id] = position
+    return result
+
+
+@dataclass
+class TaskRun:
+    """A task ready to run, with its command already rendered.
+
+    Attributes:
+        position: Position of the task among the declared ones.
+        cmd: Command to run, in a shell if it's a string.
+        cwd: Directory where the command runs.
+        env: Environment variables of the command.
+        depends_on: Positions of the tasks that must succeed before this one.
+        group: Tasks in the same concurrency group never run at once.
+        skip: Don't run the task; its condition wasn't met.
+        key: Name of the task in the [TaskState][copier._tasks.TaskState].
+        inputs: Glob patterns of the files the task reads, relative to `cwd`.
+            If `None`, the task always runs.
+        outputs: Glob patterns of the paths the task creates, relative to
+            `cwd`. The task runs again if any of them is missing.
+        up_to_date: The task didn't run, because its inputs didn't change.
+        duration: Wall clock duration of its last run, in seconds.
+    """
+
+    position: int
+    cmd: str | Sequence[str] = ""
+    cwd: Path = Path()
+    env: dict[str, str] = field(default_factory=dict)
+    depends_on: frozenset[int] = frozenset()
+    group: str | None = None
+    skip: bool = False
+    key: str = ""
+    inputs: Sequence[str] | None = None
+    outputs: Sequence[str] = ()
+    up_to_date: bool = False
+    duration: float = 0.0
+
+    def run(self, capture: bool) -> subprocess.CompletedProcess[bytes]:
+        """Run the command, capturing its output if `capture` is `True`."""
+        start = time.perf_counter()
+        try:
+            return subprocess.run(
+                self.cmd,
+                shell=isinstance(self.cmd, str),
+                check=False,
+                cwd=self.cwd,
+                env=self.env,
+                capture_output=capture,
+            )
+        finally:
+            self.duration = time.perf_counter() - start
+
+
+def _emit_started(task: TaskRun, total: int) -> None:
+    if emitting():
+        emit(TaskStarted(task.position, total, _event_cmd(task)))
+
+
+def _emit_finished(
+    task: TaskRun, total: int, process: subprocess.CompletedProcess[bytes] | None
+) -> None:
+    if emitting():
+        emit(
+            TaskFinished(
+                task.position,
+                total,
+                _event_cmd(task),
+                returncode=None if process is None else process.returncode,
+                duration=0.0 if process is None else task.duration,
+                up_to_date=task.up_to_date,
+            )
+        )
+
+
+def _event_cmd(task: TaskRun) -> str | list[str]:
+    return task.cmd if isinstance(task.cmd, str) else list(task.cmd)
+
+
+def _file_digest(path: Path) -> str:
+    result = sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(1 << 20):
+            result.update(chunk)
+    return result.hexdigest()
+
+
+@dataclass
+class TaskState:
+    """Fingerprints of the inputs of the tasks that succeeded last time.
+
+    They're stored as JSON in `path`. A fingerprint covers the rendered command,
+    its working directory and the contents of the files matched by its inputs.
+
+    Attributes:
+        path: Path of the state file.
+        force: Run all tasks, even if their inputs didn't change. Their
+            fingerprints are recorded anyway.
+        fingerprints: Fingerprint of each task, by key.
+    """
+
+    path: Path
+    force: bool = False
+    fingerprints: dict[str, str] = field(default_factory=dict)
+    # Fingerprints computed before running each task, by position
+    _pending: dict[int, str] = field(default_factory=dict, init=False, repr=False)
+
+    @classmethod
+    def load(cls, path: Path, force: bool = False) -> TaskState:
+        """Read the state file, which may not exist yet."""
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            data = {}
+        fingerprints = data.get("fingerprints") if isinstance(data, dict) else None
+        if not isinstance(fingerprints, dict):
+            fingerprints = {}
+        return cls(path=path, force=force, fingerprints=fingerprints)
+
+    def _fingerprint(self, task: TaskRun) -> str:
+        assert task.inputs is not None
+        result = sha256()
+        try:
+            cwd = task.cwd.relative_to(self.path.parent).as_posix()
+        except ValueError:
+            cwd = task.cwd.as_posix()
+        cmd = task.cmd if isinstance(task.cmd, str) else list(task.cmd)
+        result.update(json.dumps([cmd, cwd]).encode())
+        files: set[Path] = set()
+        for pattern in task.inputs:
+            for path in task.cwd.glob(pattern):
+                if path.is_dir():
+                    files.update(child for child in path.rglob("*") if child.is_file())
+                elif path.is_file():
+                    files.add(path)
+        for path in sorted(files):
+            result.update(f"\0{path.relative_to(task.cwd).as_posix()}\0".encode())
+            result.update(_file_digest(path).encode())
+        return result.hexdigest()
+
+    def is_up_to_date(self, task: TaskRun) -> bool:
+        """Tell if a task can be skipped, and remember its fingerprint if not.
+
+        Tasks without inputs are never up to date.
+        """
+        if task.inputs is None:
+            return False
+        fingerprint = self._fingerprint(task)
+        if (
+            not self.force
+            and self.fingerprints.get(task.key) == fingerprint
+            and all(any(task.cwd.glob(pattern)) for pattern in task.outputs)
+        ):
+            return True
+        self._pending[task.position] = fingerprint
+        return False
+
+    def record(self, task: TaskRun) -> None:
+        """Remember the fingerprint of a task that succeeded."""
+        if (fingerprint := self._pending.pop(task.position, None)) is not None:
+            self.fingerprints[task.key] = fingerprint
+
+    def save(self, tasks: Sequence[TaskRun]) -> None:
+        """Write the fingerprints of the given tasks into the state file.
+
+        Fingerprints of tasks that don't exist anymore are forgotten.
+        """
+        keys = {task.key for task in tasks if task.inputs is not None}
+        fingerprints = {
+            key: value
+            for key, value in sorted(self.fingerprints.items())
+            if key in keys
+        }
+        if not fingerprints and not self.path.exists():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps({"fingerprints": fingerprints}, indent=2) + "\n"
+        )
+
+
+def run_tasks(
+    tasks: Sequence[TaskRun],
+    jobs: int = 1,
+    announce: Callable[[TaskRun], None] = lambda _: None,
+    state: TaskState | None = None,
+) -> None:
+    """Run tasks, in parallel when their dependencies allow it.
+
+    With a single job, tasks run in order and their output isn't captured.
+    Otherwise, the output of each task is captured and printed, after calling
+    `announce`, in the order of the tasks. When a task fails, no more tasks
+    are started, the running ones are waited for, and its error is raised.
+
+    Args:
+        tasks: Tasks to run, sorted by position.
+        jobs: Maximum number of tasks that run at once.
+        announce: Called before running a task, or before printing its output.
+            Tasks skipped because they're up to date are announced too.
+        state: Fingerprints to skip the tasks whose inputs didn't change. The
+            state file is updated even if a task fails.
+
+    Raises:
+        TaskError: If a task fails.
+    """
+    try:
+        if jobs == 1:
+            _run_serially(tasks, announce, state)
+        else:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                _ParallelRun(tasks, jobs, announce, executor, state).run()
+    finally:
+        if state is not None:
+            state.save(tasks)
+
+
+def _run_serially(
+    tasks: Sequence[TaskRun],
+    announce: Callable[[TaskRun], None],
+    state: TaskState | None,
+) -> None:
+    for task in tasks:
+        if task.skip:
+            continue
+        _emit_started(task, len(tasks))
+        if state is not None and state.is_up_to_date(task):
+            task.up_to_date = True
+            announce(task)
+            _emit_finished(task, len(tasks), None)
+            continue
+        announce(task)
+        process = task.run(capture=False)
+        _emit_finished(task, len(tasks), process)
+        if process.returncode:
+            raise TaskError.from_process(process)
+        if state is not None:
+            state.record(task)
+
+
+class _ParallelRun:
+    """State of tasks running in parallel; see [run_tasks][copier._tasks.run_tasks]."""
+
+    def __init__(
+        self,
+        tasks: Sequence[TaskRun],
+        jobs: int,
+        announce: Callable[[TaskRun], None],
+        executor: ThreadPoolExecutor,
+        state: TaskState | None,
+    ) -> None:
+        self.tasks = tasks
+        self.jobs = jobs
+        self.announce = announce
+        self.executor = executor
+        self.state = state
+        self.pending = list(tasks)
+        self.running: dict[
+            Future[subprocess.CompletedProcess[bytes] | None], TaskRun
+        ] = {}
+        # Processes of the finished tasks by position, `None` for the ones that
+        # were skipped or up to date
+        self.finished: dict[int, subprocess.CompletedProcess[bytes] | None] = {}
+        self.succeeded: set[int] = set()
+        self.failed: subprocess.CompletedProcess[bytes] | None = None
+        self.printed = 0
+
+    def run(self) -> None:
+        """Run all tasks, or until one fails."""
+        while True:
+            if self.failed is None:
+                self._start_ready()
+            if not self.running:
+                break
+            completed, _ = wait(self.running, return_when=FIRST_COMPLETED)
+            for future in completed:
+                self._finish(self.running.pop(future), future.result())
+            # Print the output of the finished tasks, in order
+            while (
+                self.printed < len(self.tasks)
+                and self.tasks[self.printed].position in self.finished
+            ):
+                self._print_output(self.tasks[self.printed])
+                self.printed += 1
+        if self.failed is not None:
+            # Also print the output of the tasks that finished out of order
+            for task in self.tasks[self.printed :]:
+                self._print_output(task)
+            raise TaskError.from_process(self.failed)
+
+    def _finish(
+        self, task: TaskRun, process: subprocess.CompletedProcess[bytes] | None
+    ) -> None:
+        """Record the result of a task that isn't running anymore."""
+        self.finished[task.position] = process
+        _emit_finished(task, len(self.tasks), process)
+        if process is None or not process.returncode:
+            self.succeeded.add(task.position)
+            if process is not None and self.state is not None:
+                self.state.record(task)
+        elif self.failed is None:
+            self.failed = process
+
+    def _start_ready(self) -> None:
+        """Start the tasks whose dependencies succeeded, up to the jobs limit."""
+        # Skipped tasks are done at once, which may make others ready
+        changed = True
+        while changed:
+            changed = False
+            for task in list(self.pending):
+                if not task.depends_on <= self.succeeded or (
+                    task.group is not None
+                    and any(
+                        task.group == other.group for other in self.running.values()
+                    )
+                ):
+                    continue
+                if task.skip:
+                    self.succeeded.add(task.position)
+                    self.finished[task.position] = None
+                elif len(self.running) < self.jobs:
+                    _emit_started(task, len(self.tasks))
+                    self.running[self.executor.submit(self._run, task)] = task
+                else:
+                    continue
+                self.pending.remove(task)
+                changed = True
+
+    def _run(self, task: TaskRun) -> subprocess.CompletedProcess[bytes] | None:
+        """Run a task in a worker thread, unless it's up to date."""
+        if self.state is not None and self.state.is_up_to_date(task):
+            task.up_to_date = True
+            return None
+        return task.run(capture=True)
+
+    def _print_output(self, task: TaskRun) -> None:
+        """Print the captured output of a task, if it ran."""
+        if task.skip or task.position not in self.finished:
+            return
+        self.announce(task)
+        process = self.finished[task.position]
+        if process is None:
+            return
+        for stream, output in (
+            (sys.stdout, process.stdout),
+            (sys.stderr, process.stderr),
+        ):
+            if not output:
+                continue
+            stream.flush()
+            buffer = getattr(stream, "buffer", None)
+            if buffer is None:
+                stream.write(output.decode(errors="replace"))
+            else:
+                buffer.write(output)
+                buffer.flush()
@@ -5,14 +5,17 @@ from __future__ import annotations
 import re
 import sys
 from collections import ChainMap, defaultdict
-from collections.abc import Mapping, Sequence
-from contextlib import suppress
-from dataclasses import field
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from copy import deepcopy
+from dataclasses import field, replace
 from functools import cached_property
+from hashlib import sha256
 from pathlib import Path, PurePosixPath
 from shutil import rmtree
-from tempfile import mkdtemp
-from typing import Any, Literal
+from tempfile import NamedTemporaryFile, mkdtemp
+from typing import Any, Literal, TypeVar
 from warnings import warn
 
 import dunamai
@@ -24,14 +27,28 @@ from plumbum.commands.processes import ProcessExecutionError
 from plumbum.machines import local
 from pydantic.dataclasses import dataclass
 
+from . import _yaml
+from ._archive import ArchiveTree, is_archive
+from ._bundle import (
+    BUNDLE_COMPILED_DIR,
+    BUNDLE_MANIFEST,
+    BUNDLE_TEMPLATE_DIR,
+    BundleManifest,
+    load_bundle_manifest,
+    parse_bundle_manifest,
+)
 from ._tools import copier_version, handle_remove_readonly
-from ._types import AnyByStrDict, VCSTypes
+from ._types import AnyByStrDict, TemplateTree, VCSTypes
 from ._vcs import (
     CLONE_PREFIX,
+    GitTree,
+    _get_cache_dir,
     clone,
     get_git,
     get_latest_tag,
+    get_object_store,
     get_repo,
+    has_dirty_changes,
     is_git_available,
 )
 from .errors import (
@@ -73,6 +90,39 @@ def filter_config(data: AnyByStrDict) -> tuple[AnyByStrDict, AnyByStrDict]:
     return config_data, questions_data
 
 
+@dataclass(frozen=True)
+class _ParsedConfig:
+    """A parsed `copier.yml` file, with the includes it was parsed with."""
+
+    digest: str
+    include_patterns: tuple[str, ...]
+    data: AnyByStrDict
+
+
+# Parsed `copier.yml` files, keyed by their resolved path
+_parsed_configs: dict[Path, _ParsedConfig] = {}
+_PARSED_CONFIGS_MAX = 32
+
+_P = TypeVar("_P", Path, PurePosixPath)
+
+_shared_cache: ContextVar[Path | None] = ContextVar("_shared_cache", default=None)
+
+
+def _config_digest(
+    conf_bytes: bytes,
+    include_patterns: Sequence[str],
+    glob: Callable[[str], Sequence[Path]],
+) -> str:
+    """Get a digest of a `copier.yml` file and all the files it includes."""
+    result = sha256(conf_bytes)
+    for pattern in include_patterns:
+        result.update(b"\0" + pattern.encode())
+        for include_file in glob(pattern):
+            result.update(b"\0" + str(include_file).encode() + b"\0")
+            result.update(include_file.read_bytes())
+    return result.hexdigest()
+
+
 def load_template_config(conf_path: Path, quiet: bool = False) -> AnyByStrDict:
     """Load the `copier.yml` file.
 
@@ -82,6 +132,12 @@ def load_template_config(conf_path: Path, quiet: bool = False) -> AnyByStrDict:
     For example, it supports the `!include` tag with glob includes, and
     merges multiple sections.
 
+    Each included file is parsed once per load, even if it is included many times.
+    The result is cached in memory, and reused while neither the file nor the
+    files it includes change. Templates read from git commits are cached by
+    commit instead; see
+    [load_cached_tree_template_config][copier._template.load_cached_tree_template_config].
+
     Params:
         conf_path: The path to the `copier.yml` file.
         quiet: Used to configure the exception.
@@ -91,18 +147,13 @@ def load_template_config(conf_path: Path, quiet: bool = False) -> AnyByStrDict:
         ForbiddenPathError: When the included YAML file is outside the template
             directory.
     """
+    template_root = conf_path.parent.resolve()
+    globbed: dict[str, list[Path]] = {}
 
-    class _Loader(yaml.SafeLoader):
-        """Intermediate class to avoid monkey-patching main loader."""
-
-    def _include(loader: yaml.Loader, node: yaml.Node) -> Any:
-        if not isinstance(node, yaml.ScalarNode):
-            raise TypeError(f"Unsupported YAML node: {node!r}")
-        include_pattern = str(loader.construct_scalar(node))
-        if PurePosixPath(include_pattern).is_absolute():
-            raise ValueError("YAML include file path must be a relative path")
-        data: list[Any] = []
-        template_root = conf_path.parent.resolve()
+    def _glob(include_pattern: str) -> list[Path]:
+        with suppress(KeyError):
+            return globbed[include_pattern]
+        result = []
         for include_file in template_root.glob(include_pattern):
             include_file = include_file.resolve()
             if not include_file.is_relative_to(template_root):
@@ -110,23 +161,173 @@ def load_template_config(conf_path: Path, quiet: bool = False) -> AnyByStrDict:
                     path=include_file,
                     hint="YAML include file path must be inside the template directory",
                 )
-            data.extend(
-                lflatten(
-                    filter(
-                        None,
-                        yaml.load_all(include_file.read_bytes(), Loader=type(loader)),
-                    )
+            result.append(include_file)
+        globbed[include_pattern] = result
+        return result
+
+    conf_bytes = conf_path.read_bytes()
+    cache_key = conf_path.resolve()
+    cached = _parsed_configs.get(cache_key)
+    if cached is not None and cached.digest == _config_digest(
+        conf_bytes, cached.include_patterns, _glob
+    ):
+        return deepcopy(cached.data)
+    config = _parse_template_config(
+        conf_path, conf_bytes, _glob, Path.read_bytes, quiet
+    )
+    if len(_parsed_configs) >= _PARSED_CONFIGS_MAX:
+        # Forget the oldest entry
+        del _parsed_configs[next(iter(_parsed_configs))]
+    include_patterns = tuple(globbed)
+    _parsed_configs[cache_key] = _ParsedConfig(
+        digest=_config_digest(conf_bytes, include_patterns, _glob),
+        include_patterns=include_patterns,
+        data=deepcopy(config),
+    )
+    return config
+
+
+def load_tree_template_config(tree: TemplateTree, quiet: bool = False) -> AnyByStrDict:
+    """Load the `copier.yml` file of a template that isn't on disk.
+
+    It works like [load_template_config][copier._template.load_template_config],
+    but reads the file and its includes from a git commit or an archive, without
+    checking it out or extracting it.
+
+    Params:
+        tree: The files of the template.
+        quiet: Used to configure the exception.
+
+    Returns:
+        The template config, or an empty dict if the template has no `copier.yml`.
+
+    Raises:
+        InvalidConfigFileError: When the file is formatted badly.
+        MultipleConfigFilesError: When there are several `copier.yml` files.
+        ForbiddenPathError: When the included YAML file is outside the template
+            directory.
+    """
+    conf_paths = [
+        path
+        for path in tree.glob("copier.*")
+        if re.match(r"\.ya?ml", path.suffix, re.IGNORECASE)
+    ]
+    if len(conf_paths) > 1:
+        raise MultipleConfigFilesError(list(map(Path, conf_paths)))
+    if not conf_paths:
+        return {}
+
+    def _glob(include_pattern: str) -> list[PurePosixPath]:
+        if ".." in PurePosixPath(include_pattern).parts:
+            raise ForbiddenPathError(
+                path=Path(include_pattern),
+                hint="YAML include file path must be inside the template directory",
+            )
+        return tree.glob(include_pattern)
+
+    return _parse_template_config(
+        Path(conf_paths[0]),
+        tree.read_bytes(conf_paths[0]),
+        _glob,
+        tree.read_bytes,
+        quiet,
+    )
+
+
+def load_cached_tree_template_config(
+    cache_path: Path, tree: TemplateTree, quiet: bool = False
+) -> AnyByStrDict:
+    """Load the `copier.yml` file of a template that never changes, once for all.
+
+    It works like
+    [load_tree_template_config][copier._template.load_tree_template_config], but
+    the parsed config is saved into `cache_path`, and loaded from there if it
+    exists, so other runs don't parse it again. A git commit never changes, so
+    the cached config is used without checking the files it was parsed from.
+
+    Params:
+        cache_path: Where the parsed config is saved.
+        tree: The files of the template.
+        quiet: Used to configure the exception.
+    """
+    with suppress(OSError, yaml.YAMLError):
+        cached = _yaml.load(cache_path.read_bytes())
+        if isinstance(cached, dict):
+            return cached
+    result = load_tree_template_config(tree, quiet)
+    # The cache is an optimization; a read-only one mustn't break anything
+    with suppress(OSError):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Other processes may be reading it, so it's written atomically
+        with NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_path.parent, delete=False
+        ) as temp_file:
+            temp_file.write(
+                _yaml.safe_dump(result, allow_unicode=True, sort_keys=False)
+            )
+        Path(temp_file.name).replace(cache_path)
+    return result
+
+
+@contextmanager
+def sharing_template_cache(path: Path) -> Iterator[None]:
+    """Share the parsed config and compiled Jinja templates of the templates.
+
+    Templates read from git commits without a checkout save them into `path`, and
+    load them from there when another process saved them already; see
+    [shared_cache_path][copier._template.Template.shared_cache_path].
+    """
+    token = _shared_cache.set(path)
+    try:
+        yield
+    finally:
+        _shared_cache.reset(token)
+
+
+def _parse_template_config(
+    conf_path: Path,
+    conf_bytes: bytes,
+    glob: Callable[[str], Sequence[_P]],
+    read: Callable[[_P], bytes],
+    quiet: bool,
+) -> AnyByStrDict:
+    """Parse the `copier.yml` file, expanding its includes.
+
+    Params:
+        conf_path: The path to the `copier.yml` file.
+        conf_bytes: The contents of the `copier.yml` file.
+        glob: Function to find the files matching an include pattern.
+        read: Function to read the contents of an included file.
+        quiet: Used to configure the exception.
+    """
+    parsed: dict[_P, list[Any]] = {}
+
+    def _include(loader: yaml.SafeLoader, node: yaml.Node) -> Any:
+        if not isinstance(node, yaml.ScalarNode):
+            raise TypeError(f"Unsupported YAML node: {node!r}")
+        include_pattern = str(loader.construct_scalar(node))
+        if PurePosixPath(include_pattern).is_absolute():
+            raise ValueError("YAML include file path must be a relative path")
+        data: list[Any] = []
+        for include_file in glob(include_pattern):
+            if include_file in parsed:
+                # Don't share objects between the places where the file is included
+                data.extend(deepcopy(parsed[include_file]))
+                continue
+            parsed[include_file] = lflatten(
+                filter(
+                    None,
+                    _yaml.load_all(read(include_file), type(loader)),
                 )
             )
+            data.extend(parsed[include_file])
         return data
 
-    _Loader.add_constructor("!include", _include)
-
-    with conf_path.open("rb") as f:
-        try:
-            flattened_result = lflatten(filter(None, yaml.load_all(f, Loader=_Loader)))
-        except yaml.YAMLError as e:
-            raise InvalidConfigFileError(conf_path, quiet) from e
+    loader = _yaml.safe_loader_with({"!include": _include})
+    try:
+        flattened_result = lflatten(filter(None, _yaml.load_all(conf_bytes, loader)))
+    except yaml.YAMLError as e:
+        raise InvalidConfigFileError(conf_path, quiet) from e
 
     merged_options = defaultdict(list)
     for option in (
@@ -173,6 +374,27 @@ def verify_copier_version(version_str: str) -> None:
         )
 
 
+def tag_version(tag: str, distance: int = 0, commit: str | None = None) -> Version:
+    """Get the version of a commit from its nearest tag, without checking it out.
+
+    The result matches the one of [Template.version][copier._template.Template.version]
+    for a checkout of that commit.
+
+    Args:
+        tag:
+            Nearest tag of the commit. It must be a valid PEP 440 version.
+        distance:
+            Number of commits since the tag.
+        commit:
+            Abbreviated hash of the commit, if it's not the tagged one.
+    """
+    result = dunamai.Version.parse(tag, pattern=dunamai.Pattern.DefaultUnprefixed)
+    if distance:
+        result.distance = distance
+        result.commit = commit
+    return Version(result.serialize(style=dunamai.Style.Pep440))
+
+
 @dataclass
 class Task:
     """Object that represents a task to execute.
@@ -195,12 +417,36 @@ class Task:
         working_directory:
             The directory from inside where to execute the task.
             If `None`, the project directory will be used.
+
+        id:
+            Name that other tasks use to depend on this one.
+
+        depends_on:
+            IDs of the tasks, declared before this one, that must succeed
+            before running it. If `None`, it depends on the previous task.
+
+        group:
+            Concurrency group. Tasks in the same group never run at once.
+
+        inputs:
+            Glob patterns of the files that the task reads, relative to its
+            working directory. If given, the task is skipped when those files
+            didn't change since it last succeeded.
+
+        outputs:
+            Glob patterns of the paths that the task creates, relative to its
+            working directory. The task runs again if any of them is missing.
     """
 
     cmd: str | Sequence[str]
     extra_vars: dict[str, Any] = field(default_factory=dict)
     condition: str | bool = True
     working_directory: Path = Path()
+    id: str | None = None
+    depends_on: Sequence[str] | None = None
+    group: str | None = None
+    inputs: Sequence[str] | None = None
+    outputs: Sequence[str] = ()
 
 
 @dataclass
@@ -238,16 +484,30 @@ class Template:
 
             Helpful if you want to test templates before doing a proper release, but you
             need some features that require a proper PEP440 version identifier.
+
+        checkout:
+            When `False`, a git-tracked template is read straight from the git
+            objects of its repo, without checking it out. It's only checked out
+            if its files are needed on disk; see
+            [tree][copier._template.Template.tree].
+
+            Templates in tar or zip archives are always read without extracting
+            them, unless their files are needed on disk.
     """
 
     url: str
     ref: str | None = None
     use_prereleases: bool = False
+    checkout: bool = True
     _temp_clone_path: Path | None = field(
         default=None, init=False, repr=False, compare=False
     )
 
     def _cleanup(self) -> None:
+        # Don't read the trees just to close them
+        for name in ("_git_tree", "_archive_tree"):
+            if (tree := self.__dict__.get(name)) is not None:
+                tree.close()
         temp_clone = self._temp_clone_path
         if temp_clone is None or not temp_clone.exists():
             return
@@ -268,8 +528,17 @@ class Template:
     def _raw_config(self) -> AnyByStrDict:
         """Get template configuration, raw.
 
-        It reads [the `copier.yml` file][the-copieryml-file].
+        It reads [the `copier.yml` file][the-copieryml-file], or the already
+        parsed config of a [template bundle][compiling-a-template].
         """
+        if self.bundle is not None:
+            return self.bundle.config
+        if self._git_tree is not None:
+            return load_cached_tree_template_config(
+                self._config_cache_path, self._git_tree
+            )
+        if self._tree is not None:
+            return load_tree_template_config(self._tree)
         conf_paths = [
             p
             for p in self.local_abspath.glob("copier.*")
@@ -293,9 +562,65 @@ class Template:
         assert not result.is_absolute()
         return result
 
+    @cached_property
+    def bundle(self) -> BundleManifest | None:
+        """Manifest of the template, if it is a precompiled bundle.
+
+        See [compiling a template][compiling-a-template].
+        """
+        if self._tree is not None:
+            manifest_path = PurePosixPath(BUNDLE_MANIFEST)
+            if not self._tree.exists(manifest_path):
+                return None
+            return parse_bundle_manifest(
+                self._tree.read_bytes(manifest_path), Path(manifest_path)
+            )
+        return load_bundle_manifest(self._checkout_abspath)
+
+    @cached_property
+    def shared_cache_path(self) -> Path | None:
+        """Folder where the parsed config and compiled Jinja templates are shared.
+
+        Only templates read from a git commit without a checkout have it, while
+        [sharing_template_cache][copier._template.sharing_template_cache]. It's
+        specific to the commit, so it's shared with other processes that use the
+        same template commit.
+        """
+        cache = _shared_cache.get()
+        if cache is None or self._git_tree is None:
+            return None
+        return cache / self._git_tree.commit
+
+    @cached_property
+    def _config_cache_path(self) -> Path:
+        """Where the parsed config of the template commit is cached.
+
+        It's in the [shared cache][copier._template.Template.shared_cache_path]
+        while there is one, or else beside the cached git mirrors. Configs are
+        parsed differently by other Copier versions, so they don't share them.
+        """
+        assert self._git_tree is not None
+        if self.shared_cache_path is not None:
+            return self.shared_cache_path / "copier.yml"
+        return (
+            _get_cache_dir()
+            / "configs"
+            / str(copier_version())
+            / f"{self._git_tree.commit}.yml"
+        )
+
+    @cached_property
+    def compiled_templates_path(self) -> Path | None:
+        """Path to the precompiled Jinja templates, if they are usable."""
+        if self.bundle is None or not self.bundle.compiled_templates_usable:
+            return None
+        return self._checkout_abspath / BUNDLE_COMPILED_DIR
+
     @cached_property
     def commit(self) -> str | None:
         """If the template is VCS-tracked, get its commit description."""
+        if self._git_tree is not None:
+            return self._git_tree.description
         if self.vcs == "git":
             with local.cwd(self.local_abspath):
                 return get_git()("describe", "--tags", "--always").strip()
@@ -304,6 +629,8 @@ class Template:
     @cached_property
     def commit_hash(self) -> str | None:
         """If the template is VCS-tracked, get its commit full hash."""
+        if self._git_tree is not None:
+            return self._git_tree.commit
         if self.vcs == "git":
             return get_git()("-C", self.local_abspath, "rev-parse", "HEAD").strip()
         return None
@@ -467,10 +794,28 @@ class Template:
                             extra_vars=extra_vars,
                             condition=condition,
                             working_directory=working_directory,
+                            id=migration.get("id"),
+                            depends_on=migration.get("depends_on"),
+                            group=migration.get("group"),
                         )
                     )
-
-        return result
+        # Migrations that don't run in this update can't be waited for
+        not_run = {
+            migration.get("id")
+            for migration in self._raw_config.get("_migrations", [])
+            if isinstance(migration, dict)
+        } - {task.id for task in result}
+        return [
+            replace(
+                task,
+                depends_on=[
+                    task_id for task_id in task.depends_on if task_id not in not_run
+                ],
+            )
+            if task.depends_on
+            else task
+            for task in result
+        ]
 
     @cached_property
     def min_copier_version(self) -> Version | None:
@@ -545,6 +890,11 @@ class Template:
                         extra_vars=extra_vars,
                         condition=task.get("when", "true"),
                         working_directory=Path(task.get("working_directory", ".")),
+                        id=task.get("id"),
+                        depends_on=task.get("depends_on"),
+                        group=task.get("group"),
+                        inputs=task.get("inputs"),
+                        outputs=task.get("outputs", ()),
                     )
                 )
             else:
@@ -578,9 +928,62 @@ class Template:
 
         This may clone it if `url` points to a VCS-tracked template.
         Dirty changes for local VCS-tracked templates will be copied.
+        For template bundles, it points to the bundled template files.
         """
+        if self.bundle is not None:
+            return self._checkout_abspath / BUNDLE_TEMPLATE_DIR
+        return self._checkout_abspath
+
+    @cached_property
+    def _git_tree(self) -> GitTree | None:
+        """Get the files of the template commit, if it must not be checked out."""
+        if self.checkout or self.vcs != "git":
+            return None
+        ref = self.ref or get_latest_tag(self.url_expanded, self.use_prereleases)
+        # Dirty changes are only included in a checkout
+        if has_dirty_changes(self.url_expanded, ref):
+            return None
+        return GitTree(git_dir=get_object_store(self.url_expanded), ref=ref)
+
+    @cached_property
+    def _archive_tree(self) -> ArchiveTree | None:
+        """Get the files of the template archive, if it is one."""
+        if self.vcs is not None or not is_archive(self.url):
+            return None
+        return ArchiveTree(path=Path(self.url).expanduser().absolute())
+
+    @cached_property
+    def _tree(self) -> TemplateTree | None:
+        """Get the files of the template, if they must be read without a checkout."""
+        return self._git_tree or self._archive_tree
+
+    @cached_property
+    def tree(self) -> TemplateTree | None:
+        """Get the tree to render the template from, instead of its files on disk.
+
+        It's a git commit for git-tracked templates when `checkout` is `False`,
+        or the archive for templates in tar or zip archives.
+
+        It's `None` when the template must be rendered from its files on disk,
+        in [local_abspath][copier._template.Template.local_abspath]. That's
+        always the case for plain directories, template bundles and trees with
+        files that differ once on disk; see
+        [GitTree.needs_checkout][copier._vcs.GitTree.needs_checkout] and
+        [ArchiveTree.needs_checkout][copier._archive.ArchiveTree.needs_checkout].
+        """
+        tree = self._tree
+        if tree is None or tree.needs_checkout or self.bundle is not None:
+            return None
+        return tree
+
+    @cached_property
+    def _checkout_abspath(self) -> Path:
+        """Get the absolute path to the template checkout on disk."""
         result = Path(self.url)
-        if self.vcs == "git":
+        if self._archive_tree is not None:
+            self._temp_clone_path = Path(mkdtemp(prefix=CLONE_PREFIX))
+            result = self._archive_tree.extract(self._temp_clone_path)
+        elif self.vcs == "git":
             self._temp_clone_path = Path(mkdtemp(prefix=CLONE_PREFIX))
             result = Path(
                 clone(
@@ -611,10 +1014,21 @@ class Template:
         (as committed by the template author) should consult this
         mapping before falling back to ``Path.stat().st_mode``.
 
+        Template bundles return the modes recorded when compiling them, and
+        template archives the modes of their files.
+
         Returns an empty mapping when the template is not a git
         checkout, when git is unavailable, or when git fails for any
         other reason — callers must be ready to fall back.
         """
+        if self.bundle is not None:
+            return {
+                PurePosixPath(path): mode for path, mode in self.bundle.modes.items()
+            }
+        if self._git_tree is not None:
+            return {path: mode for path, (mode, _) in self._git_tree.files.items()}
+        if self._archive_tree is not None:
+            return self._archive_tree.modes
         if self.vcs != "git":
             return {}
         try:
@@ -650,16 +1064,17 @@ class Template:
         """PEP440-compliant version object."""
         if self.vcs != "git" or not self.commit:
             return None
+        # Leverage dunamai by default; usually it gets best results.
+        # `dunamai.Version.from_git` needs `Pattern.DefaultUnprefixed`
+        # to be PEP440 compliant on version reading
+        pattern = dunamai.Pattern.DefaultUnprefixed
         try:
-            with local.cwd(self.local_abspath):
-                # Leverage dunamai by default; usually it gets best results.
-                # `dunamai.Version.from_git` needs `Pattern.DefaultUnprefixed`
-                # to be PEP440 compliant on version reading
-                return Version(
-                    dunamai.Version.from_git(
-                        pattern=dunamai.Pattern.DefaultUnprefixed
-                    ).serialize(style=dunamai.Style.Pep440)
-                )
+            if self._git_tree is not None:
+                detected = self._git_tree.get_version(pattern)
+            else:
+                with local.cwd(self.local_abspath):
+                    detected = dunamai.Version.from_git(pattern=pattern)
+            return Version(detected.serialize(style=dunamai.Style.Pep440))
         except ValueError:
             # A fully descriptive commit can be easily detected converted into a
             # PEP440 version, because it has the format "<tag>-<count>-g<hash>"
@@ -8,7 +8,7 @@ import platform
 import re
 import stat
 import sys
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterable, Iterator
 from contextlib import suppress
 from decimal import Decimal
 from enum import Enum
@@ -230,6 +230,36 @@ def escape_git_path(path: str) -> str:
     )
 
 
+def filter_git_patch(
+    patch: Iterable[bytes], exclude: Callable[[str], bool]
+) -> Iterator[bytes]:
+    """Drop the changes of excluded paths from a streamed Git patch.
+
+    The patch is processed line by line, so it never has to fit in memory. Each
+    file change starts with a `diff --git a/<path> b/<path>` header line, which
+    is parsed to know the path it applies to. Renames are not supported, so both
+    sides of the header must refer to the same path.
+
+    Args:
+        patch: Lines of a patch produced by `git diff` or `git diff-tree`.
+        exclude: Whether the changes of a path, relative to the repo root and
+            normalized with `normalize_git_path`, should be dropped.
+
+    Yields:
+        The lines of the patch that belong to changes of non-excluded paths.
+    """
+    skipping = False
+    for line in patch:
+        if line.startswith(b"diff --git "):
+            # Both sides have the same length, so the header can be split in half
+            # even if the path contains spaces.
+            sides = line[len(b"diff --git ") :].rstrip(b"\r\n")
+            old_side = sides[: (len(sides) - 1) // 2].decode("utf-8", "surrogateescape")
+            skipping = exclude(normalize_git_path(old_side).removeprefix("a/"))
+        if not skipping:
+            yield line
+
+
 def get_git_objects_dir(path: Path) -> Path:
     """Get the absolute path of a Git repository's objects directory."""
     # FIXME: A lazy import is currently necessary to avoid circular imports with
@@ -6,17 +6,20 @@ from collections.abc import Callable, Iterator, Mapping, MutableMapping, Sequenc
 from contextlib import contextmanager
 from contextvars import ContextVar
 from enum import Enum
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import (
     Annotated,
     Any,
     Literal,
     NewType,
+    Protocol,
     TypeVar,
 )
 
 from pydantic import AfterValidator
 
+from ._profile import span
+
 # simple types
 StrOrPath = str | Path
 AnyByStrDict = dict[str, Any]
@@ -67,6 +70,35 @@ _K = TypeVar("_K")
 _V = TypeVar("_V")
 
 
+class TemplateTree(Protocol):
+    """Files of a template, read without having them on disk.
+
+    All paths are relative to the template root.
+    """
+
+    @property
+    def needs_checkout(self) -> bool:
+        """Tell if the files must be put on disk to get their real contents."""
+
+    def exists(self, path: PurePosixPath) -> bool:
+        """Tell if a file or directory exists."""
+
+    def walk(self, root: PurePosixPath) -> Iterator[tuple[PurePosixPath, bool]]:
+        """Walk the tree of a directory, yielding each path and if it's a dir."""
+
+    def glob(self, pattern: str) -> list[PurePosixPath]:
+        """Get the files that match a glob pattern, like `Path.glob`."""
+
+    def stat_mode(self, path: PurePosixPath) -> int:
+        """Get the mode that a file would have on disk, like `stat`."""
+
+    def read_bytes(self, path: PurePosixPath) -> bytes:
+        """Read the contents of a file."""
+
+    def close(self) -> None:
+        """Release the resources used to read the files."""
+
+
 # HACK https://github.com/copier-org/copier/pull/1880#discussion_r1887491497
 class LazyDict(MutableMapping[_K, _V]):
     """A dict where values are functions that get evaluated only once when requested."""
@@ -110,10 +142,14 @@ class Phase(str, Enum):
     @classmethod
     @contextmanager
     def use(cls, phase: Phase) -> Iterator[None]:
-        """Set the current phase for the duration of a context."""
+        """Set the current phase for the duration of a context.
+
+        The phase is timed when profiling; see [span][copier._profile.span].
+        """
         token = _phase.set(phase)
         try:
-            yield
+            with span(phase.value, "phase"):
+                yield
         finally:
             _phase.reset(token)
 
@@ -4,29 +4,29 @@ from __future__ import annotations
 
 import json
 import warnings
-from collections import ChainMap
-from collections.abc import Callable, Mapping, Sequence
+from collections import ChainMap, UserDict
+from collections.abc import Callable, Container, Mapping, Sequence
+from contextlib import suppress
 from copy import deepcopy
-from dataclasses import field
+from dataclasses import dataclass as std_dataclass, field
 from datetime import datetime, timezone
 from functools import cached_property
 from hashlib import sha512
 from os import urandom
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Literal
 
 import yaml
-from jinja2 import StrictUndefined, UndefinedError
-from prompt_toolkit.lexers import PygmentsLexer
+from jinja2 import StrictUndefined, Template, UndefinedError, meta, nodes
 from pydantic import ConfigDict, Field, field_validator
 from pydantic.dataclasses import dataclass
 from pydantic_core.core_schema import ValidationInfo
-from pygments.lexers.data import JsonLexer, YamlLexer
-from questionary.prompts.common import Choice
 
 from copier._jinja_ext import SandboxedEnvironment, UnsetError
 from copier._settings import SettingsModel
 
+from . import _yaml
 from ._tools import cast_to_bool, cast_to_str, force_str_end
 from ._types import (
     MISSING,
@@ -66,10 +66,45 @@ DEFAULT_DATA: AnyByStrDict = {
 }
 
 
+class _AnswersLayer(UserDict[str, Any]):
+    """Answers from one source of an [AnswersMap][copier._user_data.AnswersMap].
+
+    Every answer set or deleted is reported, to update the combined answers.
+
+    Args:
+        data: Initial answers.
+        on_change: Called with the key of each answer set or deleted.
+    """
+
+    def __init__(
+        self, data: Mapping[str, Any], on_change: Callable[[str], None]
+    ) -> None:
+        self._on_change: Callable[[str], None] | None = None
+        super().__init__(data)
+        self._on_change = on_change
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        if self._on_change is not None:
+            self._on_change(key)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        if self._on_change is not None:
+            self._on_change(key)
+
+
+# Answer sources, sorted by priority
+_ANSWERS_LAYERS = ("user", "init", "metadata", "last", "user_defaults")
+
+
 @dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class AnswersMap:
     """Object that gathers answers from different sources.
 
+    Answers combined from all sources are kept up to date when any of them
+    changes, so reading them is cheap.
+
     Attributes:
         user:
             Answers provided by the user, interactively.
@@ -108,21 +143,53 @@ class AnswersMap:
     user_defaults: AnyByStrMutableMapping = field(default_factory=dict)
     external: LazyDict[str, Any] = field(default_factory=LazyDict)
 
-    @property
-    def combined(self) -> Mapping[str, Any]:
-        """Answers combined from different sources, sorted by priority."""
-        return dict(
+    def __post_init__(self) -> None:
+        for name in _ANSWERS_LAYERS:
+            object.__setattr__(
+                self, name, _AnswersLayer(getattr(self, name), self._update)
+            )
+        self._combined = dict(
             ChainMap(
-                self.user,
-                self.init,
-                self.metadata,
-                self.last,
-                self.user_defaults,
+                *(getattr(self, name) for name in _ANSWERS_LAYERS),
                 {"_external_data": self.external},
                 DEFAULT_DATA,
             )
         )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _ANSWERS_LAYERS:
+            previous = getattr(self, name)
+            value = _AnswersLayer(value, self._update)
+            super().__setattr__(name, value)
+            for key in {*previous, *value}:
+                self._update(key)
+            return
+        super().__setattr__(name, value)
+        if name == "external":
+            self._update("_external_data")
+
+    def _update(self, key: str) -> None:
+        """Update the combined answer of a key after one of its sources changed."""
+        for name in _ANSWERS_LAYERS:
+            layer = getattr(self, name)
+            if key in layer:
+                self._combined[key] = layer[key]
+                return
+        if key == "_external_data":
+            self._combined[key] = self.external
+        elif key in DEFAULT_DATA:
+            self._combined[key] = DEFAULT_DATA[key]
+        else:
+            self._combined.pop(key, None)
+
+    @property
+    def combined(self) -> Mapping[str, Any]:
+        """Answers combined from different sources, sorted by priority.
+
+        It's a read-only view that reflects later changes to any source.
+        """
+        return MappingProxyType(self._combined)
+
     def old_commit(self) -> str | None:
         """Commit when the project was updated from this template the last time."""
         return self.last.get("_commit")
@@ -132,6 +199,190 @@ class AnswersMap:
         self.hidden.add(key)
 
 
+# Templates using these names or filters may render differently every time
+_VOLATILE_NAMES = frozenset({*DEFAULT_DATA, "lipsum"})
+_VOLATILE_FILTERS = frozenset({"ans_random", "random", "random_mac", "shuffle"})
+# Types of the values whose changes can be detected by comparing them
+_COMPARABLE_TYPES = (str, bytes, bool, int, float, list, tuple, dict, set, frozenset)
+
+
+class RenderCache:
+    """Compiled templated values of a questionnaire, and their latest results.
+
+    Each templated value is compiled once. When `track_dependencies` is `True`,
+    the variables that a value references are found in its syntax tree, and
+    its latest result is reused while those variables keep their values.
+
+    Templates that include or import other templates, that use random or
+    time-dependent values, or whose variables hold values that can't be
+    compared, are always rendered again.
+
+    Args:
+        jinja_env: Environment used to compile the templates.
+        track_dependencies: Reuse the results of templates whose variables
+            didn't change. It must be `False` when custom Jinja extensions are
+            loaded, because they can read any variable.
+    """
+
+    def __init__(
+        self, jinja_env: SandboxedEnvironment, track_dependencies: bool = True
+    ) -> None:
+        self.jinja_env = jinja_env
+        self.track_dependencies = track_dependencies
+        self._compiled: dict[str, tuple[Template, tuple[str, ...] | None]] = {}
+        self._results: dict[str, tuple[tuple[Any, ...], str]] = {}
+
+    def compile(self, source: str) -> tuple[Template, tuple[str, ...] | None]:
+        """Compile a template and find the variables it depends on.
+
+        Returns:
+            The compiled template, and the names of the variables it depends
+            on, or `None` if its results can't be reused.
+        """
+        with suppress(KeyError):
+            return self._compiled[source]
+        ast = self.jinja_env.parse(source)
+        dependencies = None
+        if self.track_dependencies and not _is_volatile(ast):
+            dependencies = tuple(sorted(meta.find_undeclared_variables(ast)))
+        result = self._compiled[source] = (
+            self.jinja_env.from_string(ast),
+            dependencies,
+        )
+        return result
+
+    def render(self, source: str, context: Mapping[str, Any]) -> str:
+        """Render a template, reusing its latest result if possible."""
+        template, dependencies = self.compile(source)
+        if dependencies is None:
+            return template.render(context)
+        values = tuple(context.get(name, MISSING) for name in dependencies)
+        latest = self._results.get(source)
+        if latest is not None and all(map(_same_value, latest[0], values)):
+            return latest[1]
+        result = template.render(context)
+        if all(
+            value is MISSING or value is None or type(value) in _COMPARABLE_TYPES
+            for value in values
+        ):
+            # Copied, so changes to mutable answers aren't missed
+            self._results[source] = deepcopy(values), result
+        return result
+
+
+def _same_value(old: Any, new: Any) -> bool:
+    """Tell if a variable keeps the value it had in a previous render."""
+    # Types are compared too, because `1 == True` but they're rendered differently
+    return type(old) is type(new) and old == new
+
+
+def _is_volatile(ast: nodes.Template) -> bool:
+    """Tell if a template may render differently with the same variables."""
+    if any(
+        ast.find_all((nodes.Extends, nodes.Include, nodes.Import, nodes.FromImport))
+    ):
+        return True
+    if any(node.name in _VOLATILE_FILTERS for node in ast.find_all(nodes.Filter)):
+        return True
+    return any(node.name in _VOLATILE_NAMES for node in ast.find_all(nodes.Name))
+
+
+def _contains(lookup: Container[Any], values: Sequence[Any], value: Any) -> bool:
+    """Tell if a value is in `values`, using `lookup` if the value is hashable."""
+    try:
+        return value in lookup
+    except TypeError:
+        return value in values
+
+
+@std_dataclass
+class _Choice:
+    """A formatted choice of a question.
+
+    It's converted into a questionary `Choice` only when prompting, so the
+    prompt libraries aren't imported otherwise.
+    """
+
+    title: str
+    value: Any
+    disabled: str = ""
+
+    def __post_init__(self) -> None:
+        # Like in questionary, a choice without value has its title as value
+        if self.value is None:
+            self.value = self.title
+
+
+class _ChoiceIndex:
+    """Choices of a question, indexed by their values cast to its type.
+
+    Values that can't be hashed, like lists or dicts of YAML questions, are
+    looked up one by one.
+
+    Args:
+        choices: Formatted choices, in order.
+        values: Value of each choice, cast to the question's type.
+    """
+
+    def __init__(self, choices: Sequence[_Choice], values: Sequence[Any]) -> None:
+        self.choices = choices
+        self.values = values
+        # True if any choice with that value is enabled, otherwise the reason
+        # why the first one is disabled
+        self._states: dict[Any, Literal[True] | str] = {}
+        self._unhashable: list[tuple[Any, Literal[True] | str]] = []
+        for choice, value in zip(choices, values, strict=True):
+            state: Literal[True] | str = choice.disabled or True
+            try:
+                previous = self._states.get(value)
+            except TypeError:
+                self._unhashable.append((value, state))
+                continue
+            if previous is None or state is True:
+                self._states[value] = state
+
+    def state(self, value: Any) -> Literal[True] | str | None:
+        """Tell if a value is an enabled choice.
+
+        Returns:
+            `True` if it is, the reason why it's disabled if it's a disabled
+            choice, or `None` if it's not a choice.
+        """
+        result: Literal[True] | str | None = None
+        with suppress(TypeError):
+            result = self._states.get(value)
+        for other, state in self._unhashable:
+            if result is True:
+                break
+            if other == value and (state is True or result is None):
+                result = state
+        return result
+
+    def enabled_values(self) -> list[Any]:
+        """Get the values of the enabled choices, in order."""
+        return [
+            value
+            for choice, value in zip(self.choices, self.values, strict=True)
+            if not choice.disabled
+        ]
+
+    def selected(self, values: Sequence[Any]) -> list[bool]:
+        """Tell which choices have a value found in `values`."""
+        try:
+            lookup: Container[Any] = set(values)
+        except TypeError:
+            lookup = values
+        return [_contains(lookup, values, value) for value in self.values]
+
+    def select(self, values: Sequence[Any]) -> list[Any]:
+        """Get the choice values found in `values`, in the order of the choices."""
+        return [
+            value
+            for value, selected in zip(self.values, self.selected(values), strict=True)
+            if selected
+        ]
+
+
 @dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class Question:
     """One question asked to the user.
@@ -151,6 +402,10 @@ class Question:
         jinja_env:
             The Jinja environment used to rendering answers.
 
+        render_cache:
+            Cache of the compiled templated values, shared by the questions of
+            a questionnaire. If `None`, values are compiled every time.
+
         choices:
             Selections available for the user if the question requires them.
             Can be templated.
@@ -206,6 +461,7 @@ class Question:
     answers: AnswersMap
     context: Mapping[str, Any]
     jinja_env: SandboxedEnvironment
+    render_cache: RenderCache | None = None
     settings: SettingsModel = field(default_factory=SettingsModel)
     choices: Sequence[Any] | dict[Any, Any] | str = field(default_factory=list)
     multiselect: bool = False
@@ -294,7 +550,7 @@ class Question:
             self.validate_answer(result)
         return result
 
-    def get_default_rendered(self) -> bool | str | Choice | None | MissingType:
+    def get_default_rendered(self) -> bool | str | _Choice | None | MissingType:
         """Get default answer rendered for the questionary lib.
 
         The questionary lib expects some specific data types, and returns
@@ -324,16 +580,22 @@ class Question:
         if self.get_type_name() == "json":
             return json.dumps(default, indent=2 if self.get_multiline() else None)
         if self.get_type_name() == "yaml":
-            return yaml.safe_dump(
+            return _yaml.safe_dump(
                 default, default_flow_style=not self.get_multiline(), width=2147483647
             ).strip()
         # All other data has to be str
         return str(default)
 
-    @cached_property
-    def _formatted_choices(self) -> Sequence[Choice]:
+    @property
+    def _formatted_choices(self) -> Sequence[_Choice]:
         """Obtain choices rendered and properly formatted."""
+        return self._choice_index.choices
+
+    @cached_property
+    def _choice_index(self) -> _ChoiceIndex:
+        """Render and format the choices, and index them by their cast values."""
         result = []
+        values = []
         choices = self.choices
         if isinstance(choices, str):
             choices = parse_yaml_string(self.render_value(self.choices))
@@ -359,12 +621,12 @@ class Question:
 
                 disabled = self.render_value(value.get("validator", ""))
                 value = value["value"]
-            c = Choice(name, self.render_value(value), disabled=disabled)
+            c = _Choice(name, self.render_value(value), disabled=disabled)
             # Try to cast the value according to the question's type to raise
             # an error in case the value is incompatible.
-            self.cast_answer(c.value)
+            values.append(self.cast_answer(c.value))
             result.append(c)
-        return result
+        return _ChoiceIndex(result, values)
 
     def get_message(self) -> str:
         """Get the message that will be printed to the user."""
@@ -382,6 +644,10 @@ class Question:
 
     def get_questionary_structure(self) -> AnyByStrDict:  # noqa: C901
         """Get the question in a format that the questionary lib understands."""
+        # Prompt libraries are slow to import, and only needed when prompting
+        from prompt_toolkit.lexers import PygmentsLexer
+        from pygments.lexers.data import JsonLexer, YamlLexer
+        from questionary import Choice
 
         def _validate(answer: str) -> str | Literal[True]:
             try:
@@ -404,6 +670,8 @@ class Question:
             "when": lambda _: self.get_when(),
         }
         default = self.get_default_rendered()
+        if isinstance(default, _Choice):
+            default = default.value
         if default is not MISSING:
             result["default"] = default
         questionary_type = "input"
@@ -416,13 +684,21 @@ class Question:
         if self.choices:
             questionary_type = "checkbox" if self.multiselect else "select"
             choices = self._formatted_choices
+            checked = [False] * len(choices)
             # Select default choices for a multiselect question.
             if self.multiselect and isinstance(
                 default_choices := self.get_default(), list
             ):
-                for choice in (choices := deepcopy(choices)):
-                    choice.checked = self.cast_answer(choice.value) in default_choices
-            result["choices"] = choices
+                checked = self._choice_index.selected(default_choices)
+            result["choices"] = [
+                Choice(
+                    choice.title,
+                    choice.value,
+                    disabled=choice.disabled,
+                    checked=is_checked,
+                )
+                for choice, is_checked in zip(choices, checked, strict=True)
+            ]
         if questionary_type == "input":
             if self.secret:
                 questionary_type = "password"
@@ -479,17 +755,17 @@ class Question:
         `extra_answers` are combined with `self.context` when rendering
         the template.
         """
-        try:
-            template = self.jinja_env.from_string(value)
-        except TypeError:
-            # value was not a string
+        if not isinstance(value, str):
             return (
                 [self.render_value(item) for item in value]
                 if isinstance(value, list)
                 else value
             )
+        context = {**self.context, **(extra_answers or {})}
         try:
-            return template.render({**self.context, **(extra_answers or {})})
+            if self.render_cache is None:
+                return self.jinja_env.from_string(value).render(context)
+            return self.render_cache.render(value, context)
         except UnsetError:
             raise
         except UndefinedError as error:
@@ -505,30 +781,20 @@ class Question:
             if isinstance(answer, str):
                 answer = parse_yaml_list(answer)
             answer = [self._parse_answer(a) for a in answer]
-            choices = (
-                self.cast_answer(choice.value) for choice in self._formatted_choices
-            )
-            return [choice for choice in choices if choice in answer]
+            return self._choice_index.select(answer)
         return self._parse_answer(answer)
 
     def _parse_answer(self, answer: Any) -> Any:
         """Parse a single answer according to the question's type."""
         ans = self.cast_answer(answer)
-        choices = self._formatted_choices
-        if not choices:
+        if not self._formatted_choices:
             return ans
-        choice_error = ""
-        valid = []
-        for choice in choices:
-            cast_ans = self.cast_answer(choice.value)
-            if not choice.disabled:
-                valid.append(cast_ans)
-            if ans == cast_ans:
-                if not choice.disabled:
-                    return ans
-                if not choice_error:
-                    choice_error = choice.disabled
-        error_detail = choice_error if choice_error else f"{ans!r} is not in {valid}"
+        state = self._choice_index.state(ans)
+        if state is True:
+            return ans
+        error_detail = (
+            state or f"{ans!r} is not in {self._choice_index.enabled_values()}"
+        )
         raise ValueError(f"Invalid choice for '{self.var_name}': {error_detail}")
 
 
@@ -539,7 +805,7 @@ def parse_yaml_string(string: str) -> Any:
     to repeat failed questions.
     """
     try:
-        return yaml.safe_load(string)
+        return _yaml.load(string)
     except yaml.error.YAMLError as error:
         raise ValueError(str(error))
 
@@ -558,7 +824,7 @@ def parse_yaml_list(string: str) -> list[str]:
     Raises:
         TypeError: If the YAML string is not a list.
     """
-    node = yaml.compose(string, Loader=yaml.SafeLoader)
+    node = _yaml.compose(string)
 
     if not isinstance(node, yaml.nodes.SequenceNode):
         raise TypeError(f"Not a YAML list: {string!r}")
@@ -591,8 +857,7 @@ def load_answersfile_data(
 ) -> AnyByStrDict:
     """Load answers data from a `$dst_path/$answers_file` file if it exists."""
     try:
-        with Path(dst_path, answers_file).open("rb") as fd:
-            return yaml.safe_load(fd)
+        return _yaml.load(Path(dst_path, answers_file).read_bytes())
     except (FileNotFoundError, IsADirectoryError):
         if warn_on_missing:
             warnings.warn(
@@ -602,6 +867,36 @@ def load_answersfile_data(
         return {}
 
 
+# Parsed external data files, keyed by their resolved path
+_external_data_cache: dict[Path, tuple[tuple[int, int], Any]] = {}
+_EXTERNAL_DATA_CACHE_MAX = 32
+
+
+def load_external_data(dst_path: StrOrPath, data_file: StrOrPath) -> Any:
+    """Load an external data file, parsing it again only if it changed.
+
+    A file is considered unchanged while its modification time and size are
+    the same. Missing files are never cached.
+
+    Returns:
+        A copy of the parsed data, or an empty dict if the file doesn't exist.
+    """
+    path = Path(dst_path, data_file).resolve()
+    try:
+        stat = path.stat()
+    except OSError:
+        return load_answersfile_data(dst_path, data_file, warn_on_missing=True)
+    signature = stat.st_mtime_ns, stat.st_size
+    cached = _external_data_cache.get(path)
+    if cached is None or cached[0] != signature:
+        data = load_answersfile_data(dst_path, data_file, warn_on_missing=True)
+        if len(_external_data_cache) >= _EXTERNAL_DATA_CACHE_MAX:
+            # Forget the oldest entry
+            del _external_data_cache[next(iter(_external_data_cache))]
+        _external_data_cache[path] = cached = signature, data
+    return deepcopy(cached[1])
+
+
 CAST_STR_TO_NATIVE: Mapping[str, Callable[[str], Any]] = {
     "bool": cast_to_bool,
     "float": float,
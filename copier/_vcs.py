@@ -4,21 +4,31 @@ from __future__ import annotations
 
 import os
 import re
+import stat
+import subprocess
 import sys
-from contextlib import suppress
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from functools import cached_property
 from hashlib import sha256
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from shutil import rmtree
 from tempfile import TemporaryDirectory, mkdtemp
+from typing import cast
 from urllib.parse import urlsplit, urlunsplit
 from warnings import warn
 
+import dunamai
 from packaging import version
 from packaging.version import InvalidVersion, Version
 from platformdirs import user_cache_dir
 from plumbum import TF, CommandNotFound, ProcessExecutionError, colors, local
 from plumbum.commands.base import BaseCommand
+from pydantic.dataclasses import dataclass
 
+from ._gittrace import TracedCommand
+from ._profile import span
 from ._tools import handle_remove_readonly
 from ._types import OptBool, OptStrOrPath, StrOrPath
 from .errors import DirtyLocalWarning, ShallowCloneWarning
@@ -31,6 +41,8 @@ CLONE_PREFIX = f"{__name__}.clone."
 # Environment variable to override the on-disk location of the git mirror cache.
 CACHE_DIR_ENV_VAR = "COPIER_CACHE_DIR"
 
+_reusing_mirrors: ContextVar[bool] = ContextVar("_reusing_mirrors", default=False)
+
 
 class _PathStr(str):
     """A string that represents a path."""
@@ -38,11 +50,13 @@ class _PathStr(str):
 
 def get_git(context_dir: OptStrOrPath = None) -> BaseCommand:
     """Gets `git` command, or fails if it's not available."""
-    command = local["git"].with_env(
-        GIT_AUTHOR_NAME=GIT_USER_NAME,
-        GIT_AUTHOR_EMAIL=GIT_USER_EMAIL,
-        GIT_COMMITTER_NAME=GIT_USER_NAME,
-        GIT_COMMITTER_EMAIL=GIT_USER_EMAIL,
+    command: BaseCommand = TracedCommand(
+        local["git"].with_env(
+            GIT_AUTHOR_NAME=GIT_USER_NAME,
+            GIT_AUTHOR_EMAIL=GIT_USER_EMAIL,
+            GIT_COMMITTER_NAME=GIT_USER_NAME,
+            GIT_COMMITTER_EMAIL=GIT_USER_EMAIL,
+        )
     )
     if context_dir:
         command = command["-C", context_dir]
@@ -160,18 +174,16 @@ def get_repo(url: str) -> str | None:
     return None
 
 
-def get_latest_tag(url: str, use_prereleases: OptBool = False) -> str:
-    """Get latest git tag, sorted by PEP 440.
+def get_remote_tags(url: str) -> dict[str, str]:
+    """Get the tags of a git repo, without cloning it.
 
     Args:
         url:
             Git-parseable URL of the repo. As returned by
             [get_repo][copier.vcs.get_repo].
-        use_prereleases:
-            If `False`, skip prerelease git tags.
 
     Returns:
-        The latest git tag, or `HEAD` if no valid tags are found.
+        The tag names, mapped to the full hashes of the commits they point to.
     """
     # For local Git repos, `git ls-remote` requires an absolute path to work correctly,
     # it behaves unexpectedly with some relative paths, especially with parent path
@@ -183,22 +195,61 @@ def get_latest_tag(url: str, use_prereleases: OptBool = False) -> str:
     if isinstance(url, _PathStr):
         url = Path(url).resolve().as_posix()
     git = get_git()
-    all_tags = (
-        tag.split("\t", 1)[1].removeprefix("refs/tags/")
-        for tag in git("ls-remote", "--tags", "--refs", url).splitlines()
-    )
-    all_tags = (tag for tag in all_tags if valid_version(tag))
+    tags: dict[str, str] = {}
+    peeled: dict[str, str] = {}
+    for line in git("ls-remote", "--tags", url).splitlines():
+        hash_, ref = line.split("\t", 1)
+        name = ref.removeprefix("refs/tags/")
+        # Annotated tags are listed twice; the `^{}` entry has the commit hash
+        if name.endswith("^{}"):
+            peeled[name.removesuffix("^{}")] = hash_
+        else:
+            tags[name] = hash_
+    return {name: peeled.get(name, hash_) for name, hash_ in tags.items()}
+
+
+def select_latest_tag(
+    tags: Iterable[str], use_prereleases: OptBool = False
+) -> str | None:
+    """Select the latest git tag, sorted by PEP 440.
+
+    Args:
+        tags:
+            Git tag names.
+        use_prereleases:
+            If `False`, skip prerelease git tags.
+
+    Returns:
+        The latest git tag, or `None` if no valid tags are found.
+    """
+    valid_tags = (tag for tag in tags if valid_version(tag))
     if not use_prereleases:
-        all_tags = (tag for tag in all_tags if not version.parse(tag).is_prerelease)
-    sorted_tags = sorted(all_tags, key=version.parse, reverse=True)
-    try:
-        return str(sorted_tags[0])
-    except IndexError:
+        valid_tags = (tag for tag in valid_tags if not version.parse(tag).is_prerelease)
+    return max(valid_tags, key=version.parse, default=None)
+
+
+@span("latest tag", "git")
+def get_latest_tag(url: str, use_prereleases: OptBool = False) -> str:
+    """Get latest git tag, sorted by PEP 440.
+
+    Args:
+        url:
+            Git-parseable URL of the repo. As returned by
+            [get_repo][copier.vcs.get_repo].
+        use_prereleases:
+            If `False`, skip prerelease git tags.
+
+    Returns:
+        The latest git tag, or `HEAD` if no valid tags are found.
+    """
+    latest_tag = select_latest_tag(get_remote_tags(url), use_prereleases)
+    if latest_tag is None:
         print(
             colors.warn | "No git tags found in template; using HEAD as ref",
             file=sys.stderr,
         )
         return "HEAD"
+    return latest_tag
 
 
 def _get_cache_dir() -> Path:
@@ -276,17 +327,21 @@ def _is_valid_mirror(mirror: Path) -> bool:
     return out == "true"
 
 
+@span("mirror", "git")
 def _get_or_create_mirror(url: str) -> Path:
     """Get a cached `--mirror` clone of `url`, creating or refreshing it.
 
     On first use the remote is mirror-cloned into the cache. On subsequent
     uses the existing mirror is refreshed via `git remote update` and stale
-    worktree registrations are pruned, so no full re-download is needed. A
-    corrupt or partial cache entry is discarded and re-created.
+    worktree registrations are pruned, so no full re-download is needed, unless
+    they are [reused as they are][copier._vcs.reusing_mirrors]. A corrupt or
+    partial cache entry is discarded and re-created.
     """
     git = get_git()
     mirror = _get_mirror_path(url)
     if _is_valid_mirror(mirror):
+        if _reusing_mirrors.get():
+            return mirror
         # Refreshing the existing mirror. Use `--git-dir` explicitly when
         # operating on the bare repository so this works even when Git is
         # configured with `safe.bareRepository=explicit`.
@@ -318,6 +373,21 @@ def _get_or_create_mirror(url: str) -> Path:
     return mirror
 
 
+@contextmanager
+def reusing_mirrors() -> Iterator[None]:
+    """Use the cached git mirrors that exist as they are, without refreshing them.
+
+    Useful when they were just refreshed, e.g. by the process that started this
+    one.
+    """
+    token = _reusing_mirrors.set(True)
+    try:
+        yield
+    finally:
+        _reusing_mirrors.reset(token)
+
+
+@span("worktree", "git")
 def _clone_via_cache(ref: str, location: str, mirror: Path) -> str:
     """Create a temporary worktree of `mirror` at `ref` in `location`.
 
@@ -343,6 +413,7 @@ def _clone_via_cache(ref: str, location: str, mirror: Path) -> str:
     return location
 
 
+@span("clone", "git")
 def clone(url: str, ref: str = "HEAD", location: str | None = None) -> str:
     """Clone repo into some temporary destination.
 
@@ -390,26 +461,22 @@ def clone(url: str, ref: str = "HEAD", location: str | None = None) -> str:
     _clone()
     # Include dirty changes if checking out a local HEAD
     url_abspath = Path(url).absolute()
-    if ref == "HEAD" and url_abspath.is_dir():
-        is_dirty = False
-        with local.cwd(url):
-            is_dirty = bool(git("status", "--porcelain").strip())
-        if is_dirty:
-            with local.cwd(location):
-                git("--git-dir=.git", f"--work-tree={url_abspath}", "add", "-A")
-                git(
-                    "--git-dir=.git",
-                    f"--work-tree={url_abspath}",
-                    "commit",
-                    "-m",
-                    "Copier automated commit for draft changes",
-                    "--no-verify",
-                    "--no-gpg-sign",
-                )
-                warn(
-                    "Dirty template changes included automatically.",
-                    DirtyLocalWarning,
-                )
+    if has_dirty_changes(url, ref):
+        with local.cwd(location):
+            git("--git-dir=.git", f"--work-tree={url_abspath}", "add", "-A")
+            git(
+                "--git-dir=.git",
+                f"--work-tree={url_abspath}",
+                "commit",
+                "-m",
+                "Copier automated commit for draft changes",
+                "--no-verify",
+                "--no-gpg-sign",
+            )
+            warn(
+                "Dirty template changes included automatically.",
+                DirtyLocalWarning,
+            )
 
     with local.cwd(location):
         ## The `git checkout -f <ref>` command doesn't works when repo is local, dirty
@@ -421,6 +488,311 @@ def clone(url: str, ref: str = "HEAD", location: str | None = None) -> str:
     return location
 
 
+def has_dirty_changes(url: str, ref: str) -> bool:
+    """Tell if a checkout of a repo would include dirty changes.
+
+    That's the case when checking out the `HEAD` of a local repo with
+    uncommitted changes.
+
+    Args:
+        url:
+            Git-parseable URL of the repo. As returned by
+            [get_repo][copier.vcs.get_repo].
+        ref:
+            Reference to checkout.
+    """
+    if ref != "HEAD" or not Path(url).absolute().is_dir():
+        return False
+    return bool(get_git(url)("status", "--porcelain").strip())
+
+
+def get_object_store(url: str) -> Path:
+    """Get a git directory with the objects of a repo, without checking it out.
+
+    Remote repositories are read from their cached mirror, which is created or
+    refreshed as needed. Local repositories are read in place; dirty changes
+    are not included, see [has_dirty_changes][copier._vcs.has_dirty_changes].
+
+    Args:
+        url:
+            Git-parseable URL of the repo. As returned by
+            [get_repo][copier.vcs.get_repo].
+    """
+    if _is_remote(url) or is_git_bundle(Path(url)):
+        return _get_or_create_mirror(url)
+    return Path(get_git()("-C", url, "rev-parse", "--absolute-git-dir").strip())
+
+
+def checkout_mode(executable: bool) -> int:
+    """Get the mode of a file written now, like git does on checkout."""
+    permissions = 0o777 if executable else 0o666
+    umask = os.umask(0)
+    os.umask(umask)
+    return stat.S_IFREG | (permissions & ~umask)
+
+
+def glob_regex(pattern: str) -> re.Pattern[str]:
+    """Translate a glob pattern into a regex for POSIX paths.
+
+    It follows the rules of `Path.glob`: `*`, `?` and `[...]` never match a
+    `/`, and a `**` component matches any number of directories.
+    """
+    result = []
+    for part in PurePosixPath(pattern).parts:
+        if part == "**":
+            result.append("(?:[^/]+/)*")
+            continue
+        segment = ""
+        index = 0
+        while index < len(part):
+            char = part[index]
+            index += 1
+            if char == "*":
+                segment += "[^/]*"
+            elif char == "?":
+                segment += "[^/]"
+            elif char == "[" and (end := part.find("]", index + 1)) != -1:
+                chars = part[index:end].replace("\\", "\\\\")
+                if chars.startswith("!"):
+                    chars = "^" + chars[1:]
+                segment += f"[{chars}]"
+                index = end + 1
+            else:
+                segment += re.escape(char)
+        result.append(segment + "/")
+    return re.compile("".join(result).removesuffix("/"))
+
+
+@dataclass
+class GitTree:
+    """Files of a git commit, read from the object database without a checkout.
+
+    Files are read through a long-lived `git cat-file --batch` process, which
+    applies the same conversions as a checkout (e.g. `core.autocrlf`). Call
+    [close][copier._vcs.GitTree.close] to stop it when done.
+
+    Attributes:
+        git_dir:
+            Git directory with the objects, as returned by
+            [get_object_store][copier._vcs.get_object_store].
+
+        ref:
+            Reference to the commit.
+    """
+
+    git_dir: Path
+    ref: str
+
+    @cached_property
+    def _git(self) -> BaseCommand:
+        return get_git()["--git-dir", self.git_dir]
+
+    @cached_property
+    def _batch(self) -> subprocess.Popen[bytes]:
+        command = self._git["cat-file", "--batch", "--filters"]
+        return cast(
+            "subprocess.Popen[bytes]",
+            command.popen(
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            ),
+        )
+
+    @cached_property
+    def commit(self) -> str:
+        """Full hash of the commit."""
+        return str(self._git("rev-parse", "--verify", f"{self.ref}^{{commit}}")).strip()
+
+    @cached_property
+    def description(self) -> str:
+        """Commit description, like `git describe --tags --always` in a checkout."""
+        return str(self._git("describe", "--tags", "--always", self.commit)).strip()
+
+    @cached_property
+    def entries(self) -> dict[PurePosixPath, tuple[int, str, str]]:
+        """Mode, object type and object hash of each path in the commit.
+
+        Directories come before their contents, like when walking a checkout.
+        """
+        result = {}
+        with span("ls-tree", "git"):
+            listing = self._git("ls-tree", "-r", "-t", "-z", "--full-tree", self.commit)
+        for entry in listing.split("\0"):
+            if not entry:
+                continue
+            # Format: "<mode> <type> <hash>\t<path>"
+            meta, path = entry.split("\t", 1)
+            mode, type_, hash_ = meta.split(" ")
+            result[PurePosixPath(path)] = (int(mode, 8), type_, hash_)
+        return result
+
+    @cached_property
+    def files(self) -> dict[PurePosixPath, tuple[int, str]]:
+        """Mode and object hash of each file in the commit, by path."""
+        return {
+            path: (mode, hash_)
+            for path, (mode, type_, hash_) in self.entries.items()
+            if type_ == "blob"
+        }
+
+    @cached_property
+    def needs_checkout(self) -> bool:
+        """Tell if the files must be checked out to get their real contents.
+
+        That's the case for commits with submodules or symlinks, which aren't
+        plain files, or with `.gitattributes` files, which may change the file
+        contents on checkout.
+        """
+        return any(
+            type_ == "commit"
+            or stat.S_ISLNK(mode)
+            or path.name == ".gitattributes"
+            or "\n" in path.as_posix()
+            for path, (mode, type_, _) in self.entries.items()
+        )
+
+    def exists(self, path: PurePosixPath) -> bool:
+        """Tell if a file or directory exists in the commit."""
+        return path in self.entries or not path.parts
+
+    def walk(self, root: PurePosixPath) -> Iterator[tuple[PurePosixPath, bool]]:
+        """Walk the tree of a directory, like a recursive `os.scandir`.
+
+        Yields:
+            Each path below the directory, relative to the commit root, and
+            whether it's a directory.
+
+        Raises:
+            FileNotFoundError: If the directory is not in the commit.
+        """
+        if root.parts and self.entries.get(root, (0, ""))[1] != "tree":
+            raise FileNotFoundError(root)
+        for path, (_, type_, _) in self.entries.items():
+            if path != root and path.is_relative_to(root):
+                yield path, type_ == "tree"
+
+    def glob(self, pattern: str) -> list[PurePosixPath]:
+        """Get the files that match a glob pattern, like `Path.glob`."""
+        regex = glob_regex(pattern)
+        return sorted(path for path in self.files if regex.fullmatch(path.as_posix()))
+
+    def stat_mode(self, path: PurePosixPath) -> int:
+        """Get the mode that a file would have in a checkout, like `stat`."""
+        return checkout_mode(bool(self.files[path][0] & 0o111))
+
+    def read_bytes(self, path: PurePosixPath) -> bytes:
+        """Read the contents of a file.
+
+        Raises:
+            FileNotFoundError: If the file is not in the commit.
+        """
+        try:
+            hash_ = self.files[path][1]
+        except KeyError as error:
+            raise FileNotFoundError(path) from error
+        if "\n" in path.as_posix():
+            # Such paths can't be requested to the batch process
+            return self._read_once(path, hash_)
+        process = self._batch
+        assert process.stdin and process.stdout
+        # The path tells which conversions to apply
+        process.stdin.write(f"{hash_} {path}\n".encode())
+        process.stdin.flush()
+        # Format: "<hash> <type> <size>\n<contents>\n"
+        header = process.stdout.readline().split()
+        if len(header) != 3 or header[1] != b"blob":
+            raise FileNotFoundError(path)
+        contents = process.stdout.read(int(header[2]))
+        process.stdout.read(1)
+        return contents
+
+    def _read_once(self, path: PurePosixPath, hash_: str) -> bytes:
+        command = self._git["cat-file", "--filters", f"--path={path}", hash_]
+        process = command.popen(stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # The process pipes are binary, despite the type annotations of plumbum
+        stdout, stderr = cast(tuple[bytes, bytes], process.communicate())
+        if process.returncode:
+            raise ProcessExecutionError(
+                command.formulate(), process.returncode, "", stderr
+            )
+        return stdout
+
+    def close(self) -> None:
+        """Stop the git process that reads the files, if it's running."""
+        process = self.__dict__.pop("_batch", None)
+        if process is not None:
+            process.communicate()
+
+    def get_version(self, pattern: dunamai.Pattern) -> dunamai.Version:
+        """Detect the version of the commit from its tags.
+
+        It gives the same result as `dunamai.Version.from_git` in a checkout.
+
+        Args:
+            pattern: Pattern of the tags that are versions.
+        """
+        short_commit = str(self._git("rev-parse", "--short", self.commit)).strip()
+        regex = re.compile(pattern.regex())
+        for tag in self._tags_by_distance():
+            if (match := regex.search(tag)) is None or match["base"] is None:
+                continue
+            groups = match.groupdict()
+            stage_revision = None
+            if (stage := groups.get("stage")) is not None:
+                revision = groups.get("revision")
+                stage_revision = (stage, None if revision is None else int(revision))
+            distance = self._git(
+                "rev-list", "--count", f"refs/tags/{tag}..{self.commit}"
+            )
+            return dunamai.Version(
+                match["base"],
+                stage=stage_revision,
+                distance=int(distance),
+                commit=short_commit,
+                tagged_metadata=groups.get("tagged_metadata"),
+                epoch=None if (epoch := groups.get("epoch")) is None else int(epoch),
+            )
+        distance = self._git("rev-list", "--count", self.commit)
+        return dunamai.Version("0.0.0", distance=int(distance), commit=short_commit)
+
+    def _tags_by_distance(self) -> list[str]:
+        """Get the tags merged into the commit, nearest first, then newest first."""
+        offsets = {}
+        log = self._git(
+            "log",
+            "--simplify-by-decoration",
+            "--topo-order",
+            "--decorate=full",
+            "--decorate-refs=refs/tags/",
+            "--format=%H%d",
+            self.commit,
+        )
+        lines = [
+            line for line in log.splitlines() if " (" not in line or "tag: " in line
+        ]
+        for offset, line in enumerate(lines):
+            for decoration in line.partition("(")[2].rstrip(")").split(", "):
+                if decoration.startswith("tag: "):
+                    offsets[decoration.split()[-1]] = offset
+        tags = []
+        listing = self._git(
+            "for-each-ref",
+            "refs/tags/**",
+            "--merged",
+            self.commit,
+            "--format=%(refname)%00%(creatordate:unix)%00%(*committerdate:unix)"
+            "%00%(taggerdate:unix)",
+        )
+        for line in listing.splitlines():
+            ref, *dates = line.split("\0")
+            # Prefer the tagger date, then the commit date, then the creator date
+            date = next((int(date) for date in reversed(dates) if date), 0)
+            tags.append((ref, (-offsets.get(ref, sys.maxsize), date)))
+        tags.sort(key=lambda tag: tag[1], reverse=True)
+        return [ref.removeprefix("refs/tags/") for ref, _ in tags]
+
+
 def valid_version(version_: str) -> bool:
     """Tell if a string is a valid [PEP 440][] version specifier.
 
@@ -0,0 +1,175 @@
+"""YAML loading and dumping, accelerated by libyaml when it is available.
+
+All YAML I/O in Copier goes through this module, so it uses the same backend
+everywhere. PyYAML wheels usually ship with libyaml bindings; when they don't,
+the pure-Python implementation is used instead.
+
+Both backends must load the same data, but libyaml is more lenient with some
+documents (e.g. tabs used as indentation, or `?` in flow collections) and
+differs on a few rare constructs. So libyaml only loads documents free of all of
+them, which is checked against the pure-Python loader in the tests, and the rest
+are loaded by the pure-Python loader. Dumping is cheap next to loading, so data
+is always dumped by the pure-Python emitter, and its output never depends on the
+backend.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import IO, Any, cast
+from weakref import WeakKeyDictionary
+
+import yaml
+
+Stream = str | bytes | IO[str] | IO[bytes]
+
+# Text that libyaml may load differently from the pure-Python loader: characters
+# that aren't printable or break lines in other ways than LF and CRLF, comments
+# right after block scalar headers, non-specific tags, explicit keys, directives,
+# and empty values in flow collections
+_LIBYAML_DIVERGENCES = re.compile(
+    "[^\\r\\n\\x20-\\x7e\\xa0-\\u2027\\u202a-\\ud7ff\\ue000-\\ufefe\\uff00-\\ufffd"
+    "\\U00010000-\\U0010ffff]"
+    r"|\r(?!\n)"
+    r"|[|>][-+0-9]*#"
+    r"|!(?![!\w])"
+    r"|\?(?!\S)"
+    r"|^%"
+    r"|:[,\]}]",
+    re.MULTILINE,
+)
+
+
+@dataclass(frozen=True)
+class YamlBackend:
+    """Set of PyYAML classes used to read YAML.
+
+    Attributes:
+        name: Name of the backend.
+        safe_loader: Loader that only builds plain data.
+    """
+
+    name: str
+    safe_loader: type[yaml.SafeLoader]
+
+
+PYTHON_BACKEND = YamlBackend("python", yaml.SafeLoader)
+LIBYAML_BACKEND: YamlBackend | None = None
+if yaml.__with_libyaml__:
+    LIBYAML_BACKEND = YamlBackend(
+        "libyaml",
+        yaml.CSafeLoader,  # type: ignore[arg-type]
+    )
+
+backend = LIBYAML_BACKEND or PYTHON_BACKEND
+"""Backend used by the functions in this module."""
+
+# Pure-Python loader with the same constructors as each libyaml-based loader
+_python_loaders: WeakKeyDictionary[type[yaml.SafeLoader], type[yaml.SafeLoader]] = (
+    WeakKeyDictionary()
+)
+if LIBYAML_BACKEND is not None:
+    _python_loaders[LIBYAML_BACKEND.safe_loader] = PYTHON_BACKEND.safe_loader
+
+
+def _loader_for(
+    stream: Stream, loader: type[yaml.SafeLoader]
+) -> tuple[str | bytes, type[yaml.SafeLoader]]:
+    """Choose the loader for a stream, reading it if needed.
+
+    Returns:
+        The contents of the stream, and the loader to load them with: the
+        pure-Python twin of `loader` if libyaml could load them differently.
+    """
+    contents = stream if isinstance(stream, (str, bytes)) else stream.read()
+    if loader not in _python_loaders:
+        return contents, loader
+    try:
+        text = contents.decode() if isinstance(contents, bytes) else contents
+    except UnicodeDecodeError:
+        return contents, _python_loaders[loader]
+    if _LIBYAML_DIVERGENCES.search(text) or (
+        "?" in text and ("[" in text or "{" in text)
+    ):
+        return contents, _python_loaders[loader]
+    return contents, loader
+
+
+def load(stream: str | bytes) -> Any:
+    """Parse the first YAML document in a stream into plain data.
+
+    Raises:
+        yaml.YAMLError: If the document is invalid. Errors are always reported
+            by the pure-Python loader, which gives more context about them.
+    """
+    contents, loader = _loader_for(stream, backend.safe_loader)
+    try:
+        return yaml.load(contents, Loader=loader)
+    except yaml.YAMLError:
+        if loader is PYTHON_BACKEND.safe_loader:
+            raise
+    return yaml.load(contents, Loader=PYTHON_BACKEND.safe_loader)
+
+
+def load_all(stream: Stream, loader: type[yaml.SafeLoader] | None = None) -> Any:
+    """Parse all YAML documents in a stream.
+
+    Args:
+        stream: YAML contents.
+        loader: Loader to use, by default the safe loader of the backend.
+    """
+    contents, loader = _loader_for(stream, loader or backend.safe_loader)
+    return yaml.load_all(contents, Loader=loader)
+
+
+def compose(stream: Stream) -> yaml.Node | None:
+    """Parse the first YAML document in a stream into a representation tree."""
+    contents, loader = _loader_for(stream, backend.safe_loader)
+    node: yaml.Node | None = yaml.compose(contents, Loader=loader)
+    return node
+
+
+def safe_dump(data: Any, **kwargs: Any) -> str:
+    """Serialize plain data into a YAML string."""
+    return str(yaml.dump(data, Dumper=yaml.SafeDumper, **kwargs))
+
+
+def dump(data: Any, **kwargs: Any) -> str:
+    """Serialize data into a YAML string, representing Python objects if needed."""
+    return str(yaml.dump(data, Dumper=yaml.Dumper, **kwargs))
+
+
+def safe_loader_with(
+    constructors: dict[str, Callable[[yaml.SafeLoader, yaml.Node], Any]],
+) -> type[yaml.SafeLoader]:
+    """Get a safe loader for the backend, with extra tag constructors.
+
+    Args:
+        constructors: Mapping of YAML tags to their constructor functions.
+    """
+    # Intermediate classes to avoid monkey-patching the backend loaders
+    loader, python_loader = (
+        cast(type[yaml.SafeLoader], type("SafeLoader", (base,), {}))
+        for base in (backend.safe_loader, PYTHON_BACKEND.safe_loader)
+    )
+    for tag, constructor in constructors.items():
+        loader.add_constructor(tag, constructor)
+        python_loader.add_constructor(tag, constructor)
+    if backend is not PYTHON_BACKEND:
+        _python_loaders[loader] = python_loader
+    return loader
+
+
+def to_yaml(data: Any, *_args: Any, **kwargs: Any) -> str:
+    """Jinja filter, same as Ansible's `to_yaml`."""
+    kwargs.setdefault("default_flow_style", None)
+    return dump(data, allow_unicode=True, **kwargs)
+
+
+def to_nice_yaml(data: Any, indent: int = 4, *_args: Any, **kwargs: Any) -> str:
+    """Jinja filter, same as Ansible's `to_nice_yaml`."""
+    return dump(
+        data, indent=indent, allow_unicode=True, default_flow_style=False, **kwargs
+    )
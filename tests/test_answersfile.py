@@ -4,12 +4,15 @@ import json
 from contextlib import AbstractContextManager, nullcontext as does_not_raise
 from pathlib import Path
 from textwrap import dedent
+from typing import Any
 
 import pytest
 import yaml
 
 import copier
-from copier._user_data import load_answersfile_data
+from copier import _user_data
+from copier._types import LazyDict
+from copier._user_data import AnswersMap, load_answersfile_data
 from copier.errors import ForbiddenPathError
 
 from .helpers import BRACKET_ENVOPS_JSON, SUFFIX_TMPL, build_file_tree, git_save
@@ -549,3 +552,59 @@ def test_external_data_path_outside_destination_root_is_unsafe_on_update(
 
     with expected:
         copier.run_update(project, defaults=True, overwrite=True, unsafe=unsafe)
+
+
+def test_answers_map_combined_follows_changes() -> None:
+    answers = AnswersMap(last={"a": 1, "b": 2}, init={"a": 3})
+    combined = answers.combined
+    assert combined["a"] == 3
+    with pytest.raises(TypeError):
+        combined["a"] = 4  # type: ignore[index]
+    answers.user["b"] = 5
+    del answers.init["a"]
+    assert (combined["a"], combined["b"]) == (1, 5)
+    answers.last = {"c": 6}
+    assert "a" not in combined
+    assert (combined["b"], combined["c"]) == (5, 6)
+    answers.external = LazyDict({"data": lambda: 7})
+    assert combined["_external_data"]["data"] == 7
+    assert combined == answers.combined
+
+
+def test_external_data_cached_until_changed(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree(
+        {
+            (src / "copier.yml"): (
+                """\
+                _external_data:
+                    inventory: inventory.yml
+                    same_inventory: ./inventory.yml
+                """
+            ),
+            (src / "zone.txt.jinja"): (
+                "{{ _external_data.inventory.region }}-"
+                "{{ _external_data.same_inventory.zone }}"
+            ),
+            (dst / "inventory.yml"): "{region: eu, zone: a}",
+        }
+    )
+    monkeypatch.setattr(_user_data, "_external_data_cache", {})
+    loads: list[Path] = []
+    load = _user_data.load_answersfile_data
+
+    def _load(dst_path: Path, answers_file: Path, **kwargs: bool) -> Any:
+        loads.append(Path(answers_file))
+        return load(dst_path, answers_file, **kwargs)
+
+    monkeypatch.setattr(_user_data, "load_answersfile_data", _load)
+    copier.run_copy(str(src), dst, defaults=True, overwrite=True)
+    copier.run_copy(str(src), dst, defaults=True, overwrite=True)
+    assert (dst / "zone.txt").read_text() == "eu-a"
+    assert loads == [Path("inventory.yml")]
+    (dst / "inventory.yml").write_text("{region: us, zone: b, extra: true}")
+    copier.run_copy(str(src), dst, defaults=True, overwrite=True)
+    assert (dst / "zone.txt").read_text() == "us-b"
+    assert loads == [Path("inventory.yml")] * 2
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import io
+import shutil
+import stat
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import copier
+from copier import _archive
+from copier._archive import ArchiveTree
+from copier.errors import ForbiddenPathError
+
+from .helpers import build_file_tree
+
+
+def _read_tree(root: Path) -> dict[str, tuple[bytes, int]]:
+    return {
+        path.relative_to(root).as_posix(): (path.read_bytes(), path.stat().st_mode)
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+@pytest.fixture
+def template_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    src = tmp_path_factory.mktemp("src") / "my-template"
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                _subdirectory: template
+                ---
+                !include questions/*.yml
+                """,
+            src / "questions" / "name.yml": """\
+                name:
+                    type: str
+                    default: world
+                """,
+            src / "template" / "hello.txt.jinja": (
+                'Hello {{ name }}!\n{% include "template/part.txt" %}'
+            ),
+            src / "template" / "part.txt": "Part of {{ name }}",
+            src / "template" / "run.sh.jinja": "#!/bin/sh\necho {{ name }}\n",
+            src / "template" / "{{ name }}" / "nested.txt": "nested",
+            src / "template" / ".hidden": "hidden",
+        }
+    )
+    (src / "template" / "run.sh.jinja").chmod(0o755)
+    return src
+
+
+def _make_archive(src: Path, archive: Path) -> Path:
+    if archive.suffix == ".zip":
+        with zipfile.ZipFile(archive, "w") as zip_:
+            for path in sorted(src.rglob("*")):
+                zip_.write(path, Path(src.name, path.relative_to(src)))
+    elif archive.suffix == ".tar":
+        with tarfile.open(archive, "w") as tar:
+            tar.add(src, src.name)
+    else:
+        with tarfile.open(archive, "w:gz") as tar:
+            tar.add(src, src.name)
+    return archive
+
+
+@pytest.fixture
+def forbid_extraction(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _forbid_extraction(*_args: object, **_kwargs: object) -> Path:
+        raise AssertionError("The archive must not be extracted")
+
+    monkeypatch.setattr(ArchiveTree, "extract", _forbid_extraction)
+
+
+@pytest.mark.usefixtures("forbid_extraction")
+@pytest.mark.parametrize("name", ["template.tar.gz", "template.tar", "template.zip"])
+def test_copy_from_archive(
+    template_path: Path, tmp_path_factory: pytest.TempPathFactory, name: str
+) -> None:
+    archive = _make_archive(template_path, tmp_path_factory.mktemp("dist") / name)
+    from_archive, from_dir = map(tmp_path_factory.mktemp, ("archive", "dir"))
+    worker = copier.run_copy(str(archive), from_archive, defaults=True, quiet=True)
+    copier.run_copy(str(template_path), from_dir, defaults=True, quiet=True)
+    assert isinstance(worker.template.tree, ArchiveTree)
+    assert _read_tree(from_archive) == _read_tree(from_dir)
+    assert (from_archive / "hello.txt").read_text() == "Hello world!\nPart of world"
+    assert (from_archive / "world" / "nested.txt").is_file()
+    assert (from_archive / "run.sh").stat().st_mode & 0o111
+
+
+def test_copy_from_archive_with_symlink(
+    template_path: Path, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    (template_path / "template" / "link.txt").symlink_to("part.txt")
+    archive = _make_archive(
+        template_path, tmp_path_factory.mktemp("dist") / "template.tar.gz"
+    )
+    dst = tmp_path_factory.mktemp("dst")
+    worker = copier.run_copy(str(archive), dst, defaults=True, quiet=True)
+    assert worker.template.tree is None
+    assert (dst / "link.txt").read_text() == "Part of {{ name }}"
+    assert (dst / "run.sh").stat().st_mode & 0o111
+
+
+def test_archive_index_is_cached_by_contents(
+    template_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(_archive, "_archive_indexes", {})
+    reads: list[Path] = []
+    read_index = _archive._read_index
+
+    def _read_index(path: Path) -> _archive._ArchiveIndex:
+        reads.append(path)
+        return read_index(path)
+
+    monkeypatch.setattr(_archive, "_read_index", _read_index)
+    archive = _make_archive(template_path, tmp_path / "template.zip")
+    copy = shutil.copy(archive, tmp_path / "copy.zip")
+    assert copier.inspect_template(str(archive))["questions"] == {
+        "name": {"type": "str", "default": "world"}
+    }
+    assert copier.inspect_template(str(copy))["questions"]
+    # Same contents in another path
+    assert reads == [archive]
+    (template_path / "questions" / "age.yml").write_text("age: 1")
+    _make_archive(template_path, archive)
+    assert list(copier.inspect_template(str(archive))["questions"]) == ["age", "name"]
+    assert reads == [archive, archive]
+
+
+def test_archive_member_outside_archive(tmp_path: Path) -> None:
+    archive = tmp_path / "template.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        info = tarfile.TarInfo("../outside.txt")
+        info.size = 4
+        tar.addfile(info, io.BytesIO(b"evil"))
+    with pytest.raises(ForbiddenPathError):
+        copier.run_copy(str(archive), tmp_path / "dst", defaults=True, quiet=True)
+
+
+@pytest.mark.parametrize(
+    "kind, target",
+    [
+        ("symlink", "/etc/passwd"),
+        ("symlink", "../../outside.txt"),
+        ("symlink", "sub/../../../outside.txt"),
+        ("hardlink", "../outside.txt"),
+        ("zip", "../../outside.txt"),
+    ],
+)
+def test_archive_link_outside_archive(tmp_path: Path, kind: str, target: str) -> None:
+    if kind == "zip":
+        archive = tmp_path / "template.zip"
+        with zipfile.ZipFile(archive, "w") as zip_:
+            zip_.writestr("template/copier.yml", "")
+            zip_info = zipfile.ZipInfo("template/link.txt")
+            zip_info.external_attr = (stat.S_IFLNK | 0o777) << 16
+            zip_.writestr(zip_info, target)
+    else:
+        archive = tmp_path / "template.tar"
+        with tarfile.open(archive, "w") as tar:
+            info = tarfile.TarInfo("template/link.txt")
+            info.type = tarfile.SYMTYPE if kind == "symlink" else tarfile.LNKTYPE
+            info.linkname = target
+            tar.addfile(info)
+    with pytest.raises(ForbiddenPathError, match="link.txt"):
+        copier.run_copy(str(archive), tmp_path / "dst", defaults=True, quiet=True)
+    assert not (tmp_path / "dst").exists()
+
+
+def test_archive_link_inside_archive(tmp_path: Path) -> None:
+    archive = tmp_path / "template.tar"
+    with tarfile.open(archive, "w") as tar:
+        for name, data in [("template/copier.yml", b""), ("template/a.txt", b"a")]:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+        info = tarfile.TarInfo("template/sub/link.txt")
+        info.type, info.linkname = tarfile.SYMTYPE, "../a.txt"
+        tar.addfile(info)
+    copier.run_copy(str(archive), tmp_path / "dst", defaults=True, quiet=True)
+    assert (tmp_path / "dst" / "sub" / "link.txt").read_text() == "a"
+
+
+def test_archive_without_root_directory(tmp_path: Path) -> None:
+    build_file_tree(
+        {
+            tmp_path / "src" / "copier.yml": "name: world",
+            tmp_path / "src" / "hello.txt.jinja": "Hello {{ name }}!",
+        }
+    )
+    archive = tmp_path / "template.zip"
+    with zipfile.ZipFile(archive, "w") as zip_:
+        for path in (tmp_path / "src").iterdir():
+            zip_.write(path, path.name)
+    copier.run_copy(str(archive), tmp_path / "dst", defaults=True, quiet=True)
+    assert (tmp_path / "dst" / "hello.txt").read_text() == "Hello world!"
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from threading import Lock
+
+import pytest
+
+import copier
+from copier import Destination, _batch, find_destinations, run_batch_update
+from copier._cli import CopierApp
+from copier._template import Template, sharing_template_cache
+
+from .helpers import build_file_tree, git, git_save
+
+
+@pytest.fixture
+def template_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    src = tmp_path_factory.mktemp("src")
+    build_file_tree(
+        {
+            src / "copier.yml": "name: world",
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "README.md.jinja": "Hello {{ name }}!\nv1\n",
+        }
+    )
+    git_save(src, tag="v1")
+    build_file_tree({src / "README.md.jinja": "Hello {{ name }}!\nv2\n"})
+    git_save(src, tag="v2")
+    return src
+
+
+@pytest.fixture
+def monorepo(template_path: Path, tmp_path: Path) -> Path:
+    for name in ("a", "b", "c"):
+        copier.run_copy(
+            str(template_path),
+            tmp_path / name,
+            data={"name": name},
+            vcs_ref="v1",
+            quiet=True,
+        )
+    build_file_tree({tmp_path / "c" / "README.md": "Hello c!\nmine\n"})
+    build_file_tree({tmp_path / "d" / ".copier-answers.yml": "a: b\n"})
+    git_save(tmp_path)
+    return tmp_path
+
+
+def test_batch_update(monorepo: Path) -> None:
+    results = run_batch_update(find_destinations(monorepo), jobs=2)
+    assert [result.dst_path for result in results] == [
+        monorepo / name for name in ("a", "b", "c", "d")
+    ]
+    a, b, c, d = results
+    assert (a.status, a.from_ref, a.to_ref, a.error) == ("updated", "v1", "v2", None)
+    assert a.duration > 0
+    assert b.status == "updated"
+    assert c.status == "conflicted"
+    assert c.conflicts == ["README.md"]
+    assert d.status == "failed"
+    assert d.error is not None
+    assert d.error.startswith("Cannot update because")
+    assert (monorepo / "a" / "README.md").read_text() == "Hello a!\nv2\n"
+    assert (monorepo / "b" / "README.md").read_text() == "Hello b!\nv2\n"
+    assert "<<<<<<< before updating" in (monorepo / "c" / "README.md").read_text()
+    assert "_commit: v2" in (monorepo / "a" / ".copier-answers.yml").read_text()
+    # Conflicts are recorded in the index of the repository, like in a single update
+    assert git("-C", monorepo, "ls-files", "--unmerged").strip()
+
+
+def test_index_locks_by_repository(
+    monorepo: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    other = tmp_path_factory.mktemp("other")
+    git("-C", other, "init")
+    assert _batch._repo_top(monorepo / "a") == _batch._repo_top(monorepo / "c")
+    assert _batch._repo_top(monorepo / "a").samefile(monorepo)
+    assert _batch._repo_top(other).samefile(other)
+    monkeypatch.setattr(
+        _batch, "_index_locks", [Lock() for _ in range(_batch._INDEX_LOCKS)]
+    )
+    assert _batch._index_lock(monorepo / "a") is _batch._index_lock(monorepo)
+
+
+def test_batch_update_rej(monorepo: Path) -> None:
+    results = run_batch_update(
+        [Destination(monorepo / "c"), Destination(monorepo / "a")], conflict="rej"
+    )
+    assert [(result.status, result.conflicts) for result in results] == [
+        ("conflicted", ["README.md"]),
+        ("updated", []),
+    ]
+    assert (monorepo / "c" / "README.md.rej").is_file()
+
+
+def test_batch_update_cli(monorepo: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    _, retcode = CopierApp.run(
+        [
+            "copier",
+            "batch-update",
+            "--recursive",
+            "--pretend",
+            "--data=name=x",
+            str(monorepo / "a"),
+            str(monorepo / "b"),
+        ],
+        exit=False,
+    )
+    assert retcode == 0
+    report = json.loads(capsys.readouterr().out)
+    assert [(item["dst_path"], item["status"]) for item in report] == [
+        (str(monorepo / "a"), "updated"),
+        (str(monorepo / "b"), "updated"),
+    ]
+    assert (monorepo / "a" / "README.md").read_text() == "Hello a!\nv1\n"
+    _, retcode = CopierApp.run(
+        ["copier", "batch-update", str(monorepo / "d")], exit=False
+    )
+    assert retcode == 1
+
+
+def test_shared_template_cache(template_path: Path, tmp_path: Path) -> None:
+    with sharing_template_cache(tmp_path):
+        template = Template(str(template_path), ref="v1", checkout=False)
+        assert template.shared_cache_path is not None
+        assert template.config_data == {}
+        assert template.questions_data == {"name": {"default": "world"}}
+        config_path = template.shared_cache_path / "copier.yml"
+        assert config_path.is_file()
+        config_path.write_text("name: cached")
+        again = Template(str(template_path), ref="v1", checkout=False)
+        assert again.questions_data == {"name": {"default": "cached"}}
+        template._cleanup()
+        again._cleanup()
+    assert Template(str(template_path), checkout=False).shared_cache_path is None
+
+
+def test_shared_compiled_templates(template_path: Path, tmp_path: Path) -> None:
+    cache = tmp_path / "cache"
+    with sharing_template_cache(cache):
+        copier.run_copy(str(template_path), tmp_path / "a", defaults=True)
+        compiled = list(cache.glob("*/jinja/*"))
+        assert compiled
+        copier.run_copy(str(template_path), tmp_path / "b", defaults=True)
+        assert list(cache.glob("*/jinja/*")) == compiled
+    assert (tmp_path / "b" / "README.md").read_text() == "Hello world!\nv2\n"
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from benchmarks.__main__ import main
+from benchmarks.run import find_regressions
+
+
+def test_benchmarks_run(tmp_path: Path) -> None:
+    history = tmp_path / "history.json"
+    args = ["--size=tiny", "--repeat=1", f"--history={history}"]
+    assert main(args) == 0
+    # Impossibly fast runs are regressions
+    assert main([*args, "--threshold=-1"]) == 1
+    runs = json.loads(history.read_text())
+    assert [run["size"] for run in runs] == ["tiny", "tiny"]
+    assert set(runs[0]["results"]) == {"copy", "recopy", "update"}
+
+
+def test_find_regressions() -> None:
+    history = [
+        {"size": "small", "results": {"copy": {"min": duration}}}
+        for duration in (1.0, 9.0, 1.2, 1.1)
+    ]
+    history.append({"size": "large", "results": {"copy": {"min": 100.0}}})
+    assert find_regressions(history, "small", {"copy": {"min": 1.3}}, 0.2) == {}
+    assert find_regressions(history, "small", {"copy": {"min": 1.5}}, 0.2) == {
+        "copy": (1.15, 1.5)
+    }
+    assert find_regressions(history, "tiny", {"copy": {"min": 1.5}}, 0.2) == {}
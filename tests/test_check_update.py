@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import json
+from pathlib import Path
+
 import pytest
 from plumbum import local
 
+import copier._batch
+import copier._template
+from copier._batch import Destination, check_updates, read_destinations
 from copier._cli import CopierApp
+from copier._main import get_update_data, run_copy
+from copier._vcs import get_remote_tags
+from copier.errors import UserMessageError
 
 from .helpers import build_file_tree, git
 
@@ -548,3 +557,154 @@ def test_with_custom_answers_file_path_opt(
         "New template version available.\nCurrent version is 1.0.0, latest version is 2.0.0."
         in captured.out
     )
+
+
+def test_new_tag_on_same_commit_is_not_an_update(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree(
+        {
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "README.md": "# Version 1.0.0\n",
+        }
+    )
+    with local.cwd(src):
+        git("init")
+        git("add", ".")
+        git("commit", "-m", "v1.0.0")
+        git("tag", "v1.0.0")
+
+    run_copy(str(src), dst, defaults=True, overwrite=True)
+    with local.cwd(src):
+        git("tag", "-a", "-m", "v1.0.1", "v1.0.1")
+
+    update_available, current_version, latest_version = get_update_data(dst)
+    assert not update_available
+    assert current_version == latest_version
+
+
+@pytest.mark.parametrize("vcs_ref", ["v1.0.0", "HEAD"])
+def test_check_update_without_checkout(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path_factory: pytest.TempPathFactory,
+    vcs_ref: str,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree(
+        {
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "README.md": "# Version 1.0.0\n",
+        }
+    )
+    with local.cwd(src):
+        git("init")
+        git("add", ".")
+        git("commit", "-m", "v1.0.0")
+        git("tag", "v1.0.0")
+        git("commit", "--allow-empty", "-m", "unreleased")
+        head = git("rev-parse", "--short", "HEAD").strip()
+
+    run_copy(str(src), dst, defaults=True, overwrite=True, vcs_ref=vcs_ref)
+    with local.cwd(src):
+        git("commit", "--allow-empty", "-m", "v1.1.0")
+        git("tag", "-a", "-m", "v1.1.0", "v1.1.0")
+
+    def _forbid_clone(*_args: object, **_kwargs: object) -> str:
+        raise AssertionError("The template must not be cloned")
+
+    monkeypatch.setattr(copier._template, "clone", _forbid_clone)
+    update_available, current_version, latest_version = get_update_data(dst)
+    assert update_available
+    assert latest_version == "1.1.0"
+    # Same versions as the ones computed by dunamai from a checkout
+    if vcs_ref == "HEAD":
+        assert current_version == f"1.0.0.post1.dev0+{head}"
+    else:
+        assert current_version == "1.0.0"
+
+
+def test_check_many_recursive(
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    template_path: str,
+) -> None:
+    run_copy(template_path, tmp_path / "a", vcs_ref="v1.0.0", quiet=True)
+    run_copy(template_path, tmp_path / "b" / "c", vcs_ref="v2.0.0", quiet=True)
+    run_copy(
+        template_path,
+        tmp_path / "b" / "c",
+        vcs_ref="v1.0.0",
+        answers_file=".copier-answers.other.yml",
+        overwrite=True,
+        quiet=True,
+    )
+    build_file_tree({tmp_path / "d" / ".copier-answers.yml": "a: b\n"})
+    listed = []
+
+    def _get_remote_tags(url: str) -> dict[str, str]:
+        listed.append(url)
+        return get_remote_tags(url)
+
+    monkeypatch.setattr(copier._batch, "get_remote_tags", _get_remote_tags)
+    _, retcode = CopierApp.run(
+        ["copier", "check-update", "--recursive", str(tmp_path)], exit=False
+    )
+    assert retcode == 1
+    assert len(listed) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert [(item["dst_path"], item["answers_file"]) for item in report] == [
+        (str(tmp_path / "a"), ".copier-answers.yml"),
+        (str(tmp_path / "b" / "c"), ".copier-answers.other.yml"),
+        (str(tmp_path / "b" / "c"), ".copier-answers.yml"),
+        (str(tmp_path / "d"), ".copier-answers.yml"),
+    ]
+    assert report[0] == {
+        "dst_path": str(tmp_path / "a"),
+        "answers_file": ".copier-answers.yml",
+        "src_path": template_path,
+        "update_available": True,
+        "current_version": "1.0.0",
+        "latest_version": "2.0.0",
+        "error": None,
+    }
+    assert report[1]["update_available"]
+    assert not report[2]["update_available"]
+    assert report[2]["current_version"] == "2.0.0"
+    assert report[3]["error"].startswith("Cannot check because")
+
+
+def test_check_many_input(
+    capsys: pytest.CaptureFixture[str], tmp_path: Path, template_path: str
+) -> None:
+    run_copy(template_path, tmp_path / "a", vcs_ref="v1.0.0", quiet=True)
+    run_copy(template_path, tmp_path / "b", vcs_ref="v2.0.0", quiet=True)
+    destinations = tmp_path / "destinations.jsonl"
+    destinations.write_text(json.dumps({"dst_path": str(tmp_path / "a")}) + "\n\n")
+    _, retcode = CopierApp.run(
+        [
+            "copier",
+            "check-update",
+            "--quiet",
+            f"--input={destinations}",
+            str(tmp_path / "b"),
+        ],
+        exit=False,
+    )
+    assert retcode == 2
+    assert capsys.readouterr().out == ""
+    checks = check_updates(
+        read_destinations(destinations.read_text().splitlines())
+        + [Destination(tmp_path / "b")]
+    )
+    assert [check.update_available for check in checks] == [True, False]
+
+
+def test_read_destinations_invalid() -> None:
+    with pytest.raises(UserMessageError, match="Invalid destination in line 2"):
+        read_destinations(['{"dst_path": "a"}', '{"answers_file": "b"}'])
@@ -157,6 +157,8 @@ def test_cleanup_on_interrupt_during_git_clone(
             src / "{{ _copier_conf.answers_file }}.jinja": (
                 "{{ _copier_answers|to_yaml }}"
             ),
+            # Symlinks need a checkout of the template
+            src / "link.txt": Path("{{ _copier_conf.answers_file }}.jinja"),
         }
     )
     git_save(src, tag="v1")
@@ -408,6 +408,10 @@ Switches:
                                     extensions, migrations, tasks)
     -a, --answers-file VALUE:str    Update using this path (relative to
                                     `destination_path`) to find the answers file
+    --archive VALUE:str             Render the project into a zip or tar archive
+                                    instead of the destination, which only names
+                                    the project; use `-` to write a gzipped tar
+                                    archive to stdout
     --ask VALUE:str                 Ask the questions matching the given glob-
                                     pattern, even if they would be skipped by
                                     other options; may be given multiple times
@@ -415,12 +419,20 @@ Switches:
                                     rendering the template; may be given
                                     multiple times
     --data-file PATH:ExistingFile   Load data from a YAML file
+    --events VALUE:str              Write progress events into this file as JSON
+                                    lines; use `-` to write them to stdout
+                                    instead of the usual output
     -f, --force                     Same as `--defaults --overwrite`.
+    --force-tasks                   Run template tasks even if their declared
+                                    inputs didn't change
     -g, --prereleases               Use prereleases to compare template VCS
                                     tags.
     -l, --defaults                  Use default answers to questions, which
                                     might be null if not specified.
     -n, --pretend                   Run but do not make any changes
+    --profile VALUE:str             Write a JSON report of the time spent in
+                                    each step into this file, and a Chrome trace
+                                    of those steps beside it
     -q, --quiet                     Suppress status output
     -r, --vcs-ref VALUE:str         Git reference to checkout in `template_src`.
                                     If you do not specify it, it will try to
@@ -433,6 +445,12 @@ Switches:
                                     exists.
     -s, --skip VALUE:str            Skip specified files if they exist already;
                                     may be given multiple times
+    --task-jobs VALUE:[1..256]      Maximum number of template tasks and
+                                    migrations to run at once, when their
+                                    dependencies allow it; the default is 1
+    --trace-git VALUE:str           Log every git command run into this file, as
+                                    JSON lines, and print a summary of them at
+                                    the end
     -w, --overwrite                 Overwrite files that already exist, without
                                     asking.
     -x, --exclude VALUE:str         A name or shell-style pattern matching files
@@ -488,6 +506,11 @@ Switches:
                                     rendering the template; may be given
                                     multiple times
     --data-file PATH:ExistingFile   Load data from a YAML file
+    --events VALUE:str              Write progress events into this file as JSON
+                                    lines; use `-` to write them to stdout
+                                    instead of the usual output
+    --force-tasks                   Run template tasks even if their declared
+                                    inputs didn't change
     -g, --prereleases               Use prereleases to compare template VCS
                                     tags.
     -l, -f, --defaults              Use default answers to questions, which
@@ -496,6 +519,9 @@ Switches:
     -o, --conflict VALUE:{rej, inline} Behavior on conflict: Create .rej files, or
                                     add inline conflict markers.; the default is
                                     inline
+    --profile VALUE:str             Write a JSON report of the time spent in
+                                    each step into this file, and a Chrome trace
+                                    of those steps beside it
     -q, --quiet                     Suppress status output
     -r, --vcs-ref VALUE:str         Git reference to checkout in `template_src`.
                                     If you do not specify it, it will try to
@@ -508,6 +534,12 @@ Switches:
                                     exists.
     -s, --skip VALUE:str            Skip specified files if they exist already;
                                     may be given multiple times
+    --task-jobs VALUE:[1..256]      Maximum number of template tasks and
+                                    migrations to run at once, when their
+                                    dependencies allow it; the default is 1
+    --trace-git VALUE:str           Log every git command run into this file, as
+                                    JSON lines, and print a summary of them at
+                                    the end
     -x, --exclude VALUE:str         A name or shell-style pattern matching files
                                     or folders that must not be copied; may be
                                     given multiple times
@@ -532,8 +564,13 @@ If that file contains also `_commit` and `destination_path` is a git repository,
 this command will do its best to determine whether a newer version is available,
 applying PEP 440 to the template's history.
 
+Several destinations can be checked at once: pass many paths, find them below
+each path with `--recursive`, or read them from `--input`. Then destinations are
+grouped by template, each template is resolved only once, and a JSON report with
+a result for each destination is printed.
+
 Usage:
-    copier check-update [SWITCHES] [destination_path=.]
+    copier check-update [SWITCHES] destination_paths...
 
 Meta-switches:
     --completions SHELL:{bash, fish} Prints shell completion script and quits
@@ -543,11 +580,20 @@ Meta-switches:
     -v, --version                   Prints the program's version and quits
 
 Switches:
+    -R, --recursive                 Check every subproject found below the
+                                    destination paths, by its answers file
     -a, --answers-file VALUE:str    Check for updates using this path (relative
                                     to `destination_path`) to find the answers
                                     file
     -g, --prereleases               Use prereleases to compare template VCS
                                     tags.
+    --input VALUE:str               Also check the destinations in this file of
+                                    JSON lines, with a `dst_path` and an
+                                    optional `answers_file` each; use `-` for
+                                    stdin
+    -j, --jobs VALUE:[1..256]       Maximum number of templates to check at
+                                    once, with many destinations; the default is
+                                    8
     --output-format VALUE:{plain, json} Output format, either 'plain' (the default)
                                     or 'json'.; the default is plain
     -q, --quiet                     Suppress status output, exit with status 2
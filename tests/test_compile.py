@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+from copier._bundle import BUNDLE_MANIFEST
+from copier._cli import CopierApp
+from copier._jinja_ext import CopierModuleLoader
+from copier._main import compile_template, run_copy
+from copier.errors import UnsafeTemplateError, UserMessageError
+
+from .helpers import build_file_tree, git_save
+
+
+@pytest.fixture
+def template_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    src = tmp_path_factory.mktemp("src")
+    build_file_tree(
+        {
+            src / "copier.yml": "_subdirectory: template\n---\n!include questions.yml",
+            src / "questions.yml": """\
+                name:
+                    type: str
+                    default: world
+                items:
+                    type: yaml
+                    default: [a, b]
+                """,
+            src / "template" / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "template" / "hello.txt.jinja": (
+                'Hello {{ name }}!\n{% include "template/part.txt" %}'
+            ),
+            src / "template" / "part.txt": "Part of {{ name }}",
+            src / "template" / "run.sh.jinja": "#!/bin/sh\necho {{ name }}\n",
+            src / "template" / "{% yield i from items %}{{ i }}{% endyield %}.jinja": (
+                "{{ i }}"
+            ),
+        }
+    )
+    (src / "template" / "run.sh.jinja").chmod(0o755)
+    git_save(src, tag="v1")
+    return src
+
+
+@pytest.fixture
+def loaded_modules(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record the names of templates loaded from precompiled modules."""
+    result: list[str] = []
+    load = CopierModuleLoader.load
+
+    def _load(self: CopierModuleLoader, env: Any, name: str, *args: Any) -> Any:
+        template = load(self, env, name, *args)
+        result.append(name)
+        return template
+
+    monkeypatch.setattr(CopierModuleLoader, "load", _load)
+    return result
+
+
+def _read_tree(root: Path) -> dict[str, tuple[str, int]]:
+    return {
+        path.relative_to(root).as_posix(): (path.read_text(), path.stat().st_mode)
+        for path in root.rglob("*")
+        if path.is_file() and path.name != ".copier-answers.yml"
+    }
+
+
+@pytest.mark.parametrize("unsafe", [True, False])
+def test_copy_from_bundle(
+    template_path: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    loaded_modules: list[str],
+    unsafe: bool,
+) -> None:
+    bundle, from_src, from_bundle = map(
+        tmp_path_factory.mktemp, ("bundle", "from_src", "from_bundle")
+    )
+    compile_template(str(template_path), bundle)
+    assert (bundle / BUNDLE_MANIFEST).is_file()
+
+    run_copy(str(template_path), from_src, defaults=True, quiet=True)
+    run_copy(str(bundle), from_bundle, defaults=True, quiet=True, unsafe=unsafe)
+    assert _read_tree(from_bundle) == _read_tree(from_src)
+    assert (from_bundle / "hello.txt").read_text() == "Hello world!\nPart of world"
+    # Precompiled Python modules are only loaded from trusted templates
+    if unsafe:
+        assert sorted(loaded_modules) == [
+            "template/hello.txt.jinja",
+            "template/run.sh.jinja",
+            "template/{% yield i from items %}{{ i }}{% endyield %}.jinja",
+            "template/{{ _copier_conf.answers_file }}.jinja",
+        ]
+    else:
+        assert loaded_modules == []
+
+
+def test_bundle_compiled_by_other_version(
+    template_path: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    loaded_modules: list[str],
+) -> None:
+    bundle, dst = map(tmp_path_factory.mktemp, ("bundle", "dst"))
+    compile_template(str(template_path), bundle)
+    manifest_path = bundle / BUNDLE_MANIFEST
+    manifest = yaml.safe_load(manifest_path.read_text())
+    manifest["jinja_version"] = "0.0.0"
+    manifest_path.write_text(yaml.safe_dump(manifest))
+
+    run_copy(str(bundle), dst, defaults=True, quiet=True, unsafe=True)
+    assert (dst / "hello.txt").read_text() == "Hello world!\nPart of world"
+    assert loaded_modules == []
+
+
+def test_compile_cli(template_path: Path, tmp_path: Path) -> None:
+    bundle = tmp_path / "bundle"
+    _, retcode = CopierApp.run(
+        ["copier", "compile", str(template_path), str(bundle)], exit=False
+    )
+    assert retcode == 0
+    manifest = yaml.safe_load((bundle / BUNDLE_MANIFEST).read_text())
+    assert manifest["commit"] == "v1"
+    assert manifest["config"]["name"] == {"type": "str", "default": "world"}
+
+    # A bundle can't be compiled again, nor overwritten
+    with pytest.raises(UserMessageError, match="already compiled"):
+        compile_template(str(bundle), tmp_path / "other")
+    with pytest.raises(UserMessageError, match="must not exist or be an empty"):
+        compile_template(str(template_path), bundle)
+    (tmp_path / "file").touch()
+    with pytest.raises(UserMessageError, match="must not exist or be an empty"):
+        compile_template(str(template_path), tmp_path / "file")
+
+
+def test_compile_failure_leaves_no_bundle(
+    template_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def _fail(dst: Path, **_kwargs: Any) -> None:
+        (dst / BUNDLE_MANIFEST).write_text("half-written")
+        raise OSError("disk full")
+
+    monkeypatch.setattr("copier._main.write_bundle", _fail)
+    with pytest.raises(OSError, match="disk full"):
+        compile_template(str(template_path), tmp_path / "bundle")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_compile_with_extensions_requires_trust(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, bundle = map(tmp_path_factory.mktemp, ("src", "bundle"))
+    build_file_tree(
+        {
+            src / "copier.yml": "_jinja_extensions: [jinja2.ext.do]",
+            src / "file.txt.jinja": "{% do [].append(1) %}",
+        }
+    )
+    with pytest.raises(UnsafeTemplateError):
+        compile_template(str(src), bundle)
+    compile_template(str(src), bundle, unsafe=True)
+    assert (bundle / BUNDLE_MANIFEST).is_file()
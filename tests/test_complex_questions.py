@@ -614,3 +614,62 @@ def test_omit_answer_for_skipped_question(
     assert answers == {"_src_path": str(src)}
     context = yaml.safe_load((dst / "context.yml").read_text())
     assert context == {"disabled": "hello", "disabled_with_default": "hello"}
+
+
+def test_many_choices_parsed_with_index(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    regions = [f"region-{i}" for i in range(2000)]
+    build_file_tree(
+        {
+            (src / "copier.yml"): yaml.safe_dump(
+                {
+                    "region": {"type": "str", "choices": regions},
+                    "services": {
+                        "type": "str",
+                        "multiselect": True,
+                        "choices": regions,
+                    },
+                    "layouts": {
+                        "type": "yaml",
+                        "multiselect": True,
+                        "choices": {
+                            "flat": [1],
+                            "nested": {"value": {"a": [1]}},
+                            "off": {"value": [2], "validator": "Not ready"},
+                        },
+                    },
+                }
+            ),
+            (src / "{{ _copier_conf.answers_file }}.jinja"): (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+        }
+    )
+    run_copy(
+        str(src),
+        dst,
+        data={
+            "region": "region-1999",
+            "services": ["region-5", "region-1", "region-5"],
+            "layouts": [{"a": [1]}, [1]],
+        },
+        defaults=True,
+        quiet=True,
+    )
+    answers = load_answersfile_data(dst)
+    assert answers["region"] == "region-1999"
+    assert answers["services"] == ["region-1", "region-5"]
+    assert answers["layouts"] == [[1], {"a": [1]}]
+    with pytest.raises(ValueError, match="Not ready"):
+        run_copy(
+            str(src),
+            dst,
+            data={"region": "region-0", "services": [], "layouts": [[2]]},
+            defaults=True,
+            quiet=True,
+            overwrite=True,
+        )
+    with pytest.raises(ValueError, match="'region-x' is not in"):
+        run_copy(str(src), dst, data={"region": "region-x"}, defaults=True, quiet=True)
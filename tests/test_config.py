@@ -8,6 +8,7 @@ from textwrap import dedent
 from typing import Any
 
 import pytest
+import yaml
 from plumbum import local
 from pydantic import ValidationError
 
@@ -21,7 +22,14 @@ from copier.errors import (
     MultipleConfigFilesError,
 )
 
-from .helpers import BRACKET_ENVOPS_JSON, SUFFIX_TMPL, build_file_tree, git_init
+from .helpers import (
+    BRACKET_ENVOPS_JSON,
+    SUFFIX_TMPL,
+    build_file_tree,
+    git,
+    git_init,
+    git_save,
+)
 
 GOOD_ENV_OPS = {
     "autoescape": True,
@@ -381,6 +389,79 @@ def test_include_path_outside_template_root_raises_error(
         copier.run_copy(str(src / "template"), dst, defaults=True)
 
 
+def test_parsed_config_is_cached(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    build_file_tree(
+        {
+            tmp_path / "copier.yml": """\
+                !include common.yml
+                ---
+                !include common.yml
+                ---
+                !include extra/*.yml
+                """,
+            tmp_path / "common.yml": "_exclude: [common]",
+            tmp_path / "extra" / "one.yml": "one: 1",
+        }
+    )
+    parsed: list[bytes] = []
+    load_all = yaml.load_all
+
+    def _load_all(stream: bytes, *args: Any, **kwargs: Any) -> Any:
+        parsed.append(stream)
+        return load_all(stream, *args, **kwargs)
+
+    monkeypatch.setattr(yaml, "load_all", _load_all)
+    conf_path = tmp_path / "copier.yml"
+    config = load_template_config(conf_path)
+    assert config == {"_exclude": ["common", "common"], "one": 1}
+    # Each file is parsed once, even if included many times
+    assert len(parsed) == 3
+
+    # Unchanged files are not parsed again, and results are not shared
+    config["_exclude"].append("modified")
+    assert load_template_config(conf_path) == {
+        "_exclude": ["common", "common"],
+        "one": 1,
+    }
+    assert len(parsed) == 3
+
+    # Changes to included files, or new files matching an include, are noticed
+    (tmp_path / "common.yml").write_text("_exclude: [changed]")
+    (tmp_path / "extra" / "two.yml").write_text("two: 2")
+    assert load_template_config(conf_path) == {
+        "_exclude": ["changed", "changed"],
+        "one": 1,
+        "two": 2,
+    }
+    assert len(parsed) == 7
+
+
+def test_git_template_config_is_cached_by_commit(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src, cache = map(tmp_path_factory.mktemp, ("src", "cache"))
+    monkeypatch.setenv("COPIER_CACHE_DIR", str(cache))
+    build_file_tree(
+        {
+            src / "copier.yml": "!include common.yml",
+            src / "common.yml": "name: world",
+        }
+    )
+    git_save(src, tag="v1")
+    template = Template(str(src), checkout=False)
+    assert template.questions_data == {"name": {"default": "world"}}
+    template._cleanup()
+    (cache_path,) = cache.glob("configs/*/*.yml")
+    assert cache_path.stem == git("-C", src, "rev-parse", "HEAD").strip()
+    # Commits never change, so the cached config is trusted as it is
+    cache_path.write_text("name: cached")
+    again = Template(str(src), checkout=False)
+    assert again.questions_data == {"name": {"default": "cached"}}
+    again._cleanup()
+
+
 def test_config_data_empty() -> None:
     template = Template("tests/demo_config_empty")
     assert template.config_data == {}
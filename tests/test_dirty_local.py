@@ -7,6 +7,7 @@ from pytest_gitconfig.plugin import GitConfig
 
 import copier
 from copier._main import run_copy, run_update
+from copier._subproject import Subproject
 from copier.errors import DirtyLocalWarning, UserMessageError
 
 from .helpers import DATA, PROJECT_TEMPLATE, build_file_tree, git
@@ -316,3 +317,16 @@ def test_parallel_projects_in_subdirs(
                 dst, overwrite=True, data={"question": f"Updated {dst.name} Again"}
             )
         assert (dst / "file.txt").read_text() == f"Updated {dst.name}"
+
+
+def test_untracked_files_make_subproject_dirty(tmp_path: Path) -> None:
+    build_file_tree({tmp_path / "file.txt": "content"})
+    with local.cwd(tmp_path):
+        git("init")
+        git("config", "status.showUntrackedFiles", "no")
+        git("add", "-A")
+        git("commit", "-m", "initial commit")
+    subproject = Subproject(local_abspath=tmp_path)
+    assert not subproject.is_dirty()
+    build_file_tree({tmp_path / "untracked" / "new.txt": "new"})
+    assert subproject.is_dirty()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import copier
+from copier import (
+    Event,
+    FileEvent,
+    StepFinished,
+    StepStarted,
+    TaskFinished,
+    TaskStarted,
+    Totals,
+)
+from copier._cli import CopierApp
+
+from .helpers import build_file_tree, git_save
+
+
+@pytest.fixture
+def template_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    src = tmp_path_factory.mktemp("src")
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                name:
+                    type: str
+                    default: world
+                _tasks:
+                    - touch task-done
+                """,
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "hello.txt.jinja": "Hello {{ name }}!",
+            src / "sub" / "static.txt": "static",
+        }
+    )
+    git_save(src, tag="v1")
+    return src
+
+
+@pytest.mark.parametrize("task_jobs", [1, 2])
+def test_copy_events(template_path: Path, tmp_path: Path, task_jobs: int) -> None:
+    events: list[Event] = []
+    copier.run_copy(
+        str(template_path),
+        tmp_path,
+        defaults=True,
+        unsafe=True,
+        quiet=True,
+        task_jobs=task_jobs,
+        on_event=events.append,
+    )
+    assert events[0] == StepStarted("run_copy", "operation")
+    assert isinstance(events[-1], StepFinished)
+    assert events[-1].ok
+    files = [event for event in events if isinstance(event, FileEvent)]
+    assert [(event.path, event.kind, event.status) for event in files] == [
+        ("hello.txt", "file", "planned"),
+        ("hello.txt", "file", "created"),
+        ("sub", "dir", "planned"),
+        ("sub", "dir", "created"),
+        ("sub/static.txt", "file", "planned"),
+        ("sub/static.txt", "file", "created"),
+        (".copier-answers.yml", "file", "planned"),
+        (".copier-answers.yml", "file", "created"),
+    ]
+    assert files[1].size == len("Hello world!")
+    assert files[1].duration is not None
+    assert files[3].size is None
+    phases = [
+        event.name
+        for event in events
+        if isinstance(event, StepStarted) and event.category == "phase"
+    ]
+    assert phases == ["prompt", "render", "tasks"]
+    assert TaskStarted(0, 1, "touch task-done") in events
+    (task,) = [event for event in events if isinstance(event, TaskFinished)]
+    assert task.returncode == 0
+    assert task.cmd == "touch task-done"
+    (totals,) = [event for event in events if isinstance(event, Totals)]
+    assert totals == Totals(
+        "run_copy",
+        created=4,
+        bytes=sum(
+            (tmp_path / name).stat().st_size
+            for name in ("hello.txt", "sub/static.txt", ".copier-answers.yml")
+        ),
+    )
+
+
+def test_update_events(template_path: Path, tmp_path: Path) -> None:
+    copier.run_copy(str(template_path), tmp_path, defaults=True, unsafe=True)
+    git_save(tmp_path)
+    build_file_tree({template_path / "hello.txt.jinja": "Goodbye {{ name }}!"})
+    git_save(template_path, tag="v2")
+    events: list[Event] = []
+    copier.run_update(
+        tmp_path,
+        defaults=True,
+        overwrite=True,
+        unsafe=True,
+        quiet=True,
+        on_event=events.append,
+    )
+    steps = [
+        event.name
+        for event in events
+        if isinstance(event, StepFinished) and event.category == "update"
+    ]
+    assert steps == [
+        "old copy",
+        "old commit",
+        "new copy",
+        "clean new copy",
+        "new commit",
+        "diff",
+        "apply",
+    ]
+    # Files rendered in the destination, before applying the diff
+    assert events[-2] == Totals(
+        "run_update",
+        overwritten=2,
+        identical=2,
+        bytes=len("Goodbye world!") + (tmp_path / ".copier-answers.yml").stat().st_size,
+    )
+    assert (tmp_path / "hello.txt").read_text() == "Goodbye world!"
+
+
+def test_events_cli(template_path: Path, tmp_path: Path) -> None:
+    events_path = tmp_path / "events.jsonl"
+    _, retcode = CopierApp.run(
+        [
+            "copier",
+            "copy",
+            "--defaults",
+            "--skip-tasks",
+            f"--events={events_path}",
+            str(template_path),
+            str(tmp_path / "dst"),
+        ],
+        exit=False,
+    )
+    assert retcode == 0
+    events = [json.loads(line) for line in events_path.read_text().splitlines()]
+    assert events[0] == {
+        "type": "step_started",
+        "name": "run_copy",
+        "category": "operation",
+    }
+    assert {
+        "type": "file",
+        "path": "hello.txt",
+        "kind": "file",
+        "status": "planned",
+        "size": None,
+        "duration": None,
+    } in events
+    assert events[-1]["type"] == "step_finished"
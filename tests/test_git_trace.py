@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+from typing import IO, Any, cast
+
+import pytest
+
+import copier
+from copier._cli import CopierApp
+from copier._gittrace import TRACE_GIT_ENV_VAR, subcommand, tracing_git
+from copier._vcs import get_git
+
+from .helpers import build_file_tree, git_save
+
+
+@pytest.fixture
+def template_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    src = tmp_path_factory.mktemp("src")
+    build_file_tree(
+        {
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "hello.txt": "Hello",
+        }
+    )
+    git_save(src, tag="v1")
+    return src
+
+
+def _read(path: Path) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        (["git", "status"], "status"),
+        (["git", "-C", "repo", "-c", "a.b=c", "ls-files", "-z"], "ls-files"),
+        (["git", "--no-pager", "--git-dir", ".git", "diff"], "diff"),
+        (["git", "--version"], ""),
+    ],
+)
+def test_subcommand(argv: list[str], expected: str) -> None:
+    assert subcommand(argv) == expected
+
+
+def test_trace_calls(tmp_path: Path) -> None:
+    trace = tmp_path / "trace.jsonl"
+    git = get_git(tmp_path)
+    git("version")
+    with tracing_git(trace) as tracer:
+        assert tracer is not None
+        with tracing_git(tmp_path / "nested.jsonl") as nested:
+            assert nested is None
+        git("init", "--quiet")
+        git("status", retcode=None)
+        git("rev-parse", "--verify", "nonexistent", retcode=None)
+    git("status")
+    assert not (tmp_path / "nested.jsonl").exists()
+    calls = _read(trace)
+    assert [call["subcommand"] for call in calls] == ["init", "status", "rev-parse"]
+    assert calls[0]["argv"][1:] == ["-C", str(tmp_path), "init", "--quiet"]
+    assert calls[1]["returncode"] == 0
+    assert calls[1]["stdout_bytes"] > 0
+    assert calls[2]["returncode"] != 0
+    assert calls[2]["stderr_bytes"] > 0
+    assert all(call["duration"] >= 0 for call in calls)
+    assert tracer.summary().startswith("3 git calls, ")
+    assert set(tracer.totals()) == {"init", "status", "rev-parse"}
+
+
+def test_trace_git_copy(
+    template_path: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    trace = tmp_path / "trace.jsonl"
+    copier.run_copy(str(template_path), tmp_path / "dst", trace_git=trace)
+    calls = _read(trace)
+    assert {"ls-tree", "cat-file"} <= {call["subcommand"] for call in calls}
+    assert f"{len(calls)} git calls, " in capsys.readouterr().err
+
+
+def test_trace_git_env_var(
+    template_path: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    trace = tmp_path / "trace.jsonl"
+    monkeypatch.setenv(TRACE_GIT_ENV_VAR, str(trace))
+    copier.run_copy(str(template_path), tmp_path / "dst", quiet=True)
+    assert _read(trace)
+    assert "git calls" not in capsys.readouterr().err
+
+
+def test_trace_git_cli(template_path: Path, tmp_path: Path) -> None:
+    trace = tmp_path / "trace.jsonl"
+    _, retcode = CopierApp.run(
+        [
+            "copier",
+            "copy",
+            "--quiet",
+            f"--trace-git={trace}",
+            str(template_path),
+            str(tmp_path / "dst"),
+        ],
+        exit=False,
+    )
+    assert retcode == 0
+    assert _read(trace)
+
+
+def test_trace_output_read_from_pipe(tmp_path: Path) -> None:
+    trace = tmp_path / "trace.jsonl"
+    git = get_git(tmp_path)
+    git("init", "--quiet")
+    with tracing_git(trace):
+        process = git["status"].popen(stdout=subprocess.PIPE)
+        output = b"".join(cast(IO[bytes], process.stdout))
+        assert not process.communicate()[0]
+    [call] = _read(trace)
+    assert call["returncode"] == 0
+    assert call["stdout_bytes"] == len(output) > 0
+
+
+def test_trace_running_calls(tmp_path: Path) -> None:
+    trace = tmp_path / "trace.jsonl"
+    git = get_git(tmp_path)
+    git("init", "--quiet")
+    with tracing_git(trace) as tracer:
+        assert tracer is not None
+        process = git["cat-file", "--batch"].popen(
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        stdin, stdout = cast(
+            tuple[IO[bytes], IO[bytes]], (process.stdin, process.stdout)
+        )
+        stdin.write(b"HEAD\n")
+        stdin.flush()
+        missing = stdout.readline()
+    process.communicate()
+    [call] = _read(trace)
+    assert call["subcommand"] == "cat-file"
+    assert call["returncode"] is None
+    assert call["stdout_bytes"] == len(missing) > 0
+    assert tracer.summary().startswith("1 git calls, ")
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+from plumbum import local
+
+import copier
+from copier._template import Template
+from copier._vcs import GitTree
+from copier.errors import DirtyLocalWarning
+
+from .helpers import build_file_tree, git, git_save
+
+
+def _read_tree(root: Path) -> dict[str, tuple[bytes, int]]:
+    return {
+        path.relative_to(root).as_posix(): (path.read_bytes(), path.stat().st_mode)
+        for path in root.rglob("*")
+        if path.is_file() and path.name != ".copier-answers.yml"
+    }
+
+
+@pytest.fixture
+def forbid_clone(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _forbid_clone(*_args: object, **_kwargs: object) -> str:
+        raise AssertionError("The template must not be cloned")
+
+    monkeypatch.setattr(copier._template, "clone", _forbid_clone)
+
+
+@pytest.mark.usefixtures("forbid_clone")
+def test_copy_without_checkout(tmp_path_factory: pytest.TempPathFactory) -> None:
+    src, plain_src, from_git, from_dir = map(
+        tmp_path_factory.mktemp, ("src", "plain_src", "from_git", "from_dir")
+    )
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                _subdirectory: template
+                name:
+                    type: str
+                    default: world
+                items:
+                    type: yaml
+                    default: [a, b]
+                """,
+            src / "template" / "hello.txt.jinja": (
+                'Hello {{ name }}!\n{% include "template/part.txt" %}'
+            ),
+            src / "template" / "part.txt": "Part of {{ name }}",
+            src / "template" / "crlf.txt.jinja": b"{{ name }}\r\nline\r\n",
+            src / "template" / "binary.bin": b"\x00\xff\x00",
+            src / "template" / "run.sh.jinja": "#!/bin/sh\necho {{ name }}\n",
+            src / "template" / "{{ name }}" / "nested.txt": "nested",
+            src / "template" / "{% yield i from items %}{{ i }}{% endyield %}.jinja": (
+                "{{ i }}"
+            ),
+            src / "template" / "shadowed.txt": "raw",
+            src / "template" / "shadowed.txt.jinja": "rendered {{ name }}",
+        }
+    )
+    (src / "template" / "run.sh.jinja").chmod(0o755)
+    git_save(src, tag="v1")
+    shutil.copytree(
+        src, plain_src, ignore=shutil.ignore_patterns(".git"), dirs_exist_ok=True
+    )
+
+    worker = copier.run_copy(str(src), from_git, defaults=True, quiet=True)
+    copier.run_copy(str(plain_src), from_dir, defaults=True, quiet=True)
+    assert isinstance(worker.template.tree, GitTree)
+    assert _read_tree(from_git) == _read_tree(from_dir)
+    assert (from_git / "hello.txt").read_text() == "Hello world!\nPart of world"
+    assert (from_git / "shadowed.txt").read_text() == "rendered world"
+    assert (from_git / "world" / "nested.txt").is_file()
+    assert sorted(path.name for path in from_git.glob("[ab]")) == ["a", "b"]
+    # The process reading the git objects is stopped when done
+    assert "_batch" not in worker.template.tree.__dict__
+
+
+def test_copy_with_symlink_checks_out(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree(
+        {
+            src / "copier.yml": "_preserve_symlinks: true",
+            src / "target.txt": "target",
+            src / "link.txt": Path("target.txt"),
+        }
+    )
+    git_save(src, tag="v1")
+    worker = copier.run_copy(str(src), dst, defaults=True, quiet=True)
+    assert worker.template.tree is None
+    assert (dst / "link.txt").readlink() == Path("target.txt")
+
+
+def test_copy_dirty_template_checks_out(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree({src / "file.txt": "committed"})
+    git_save(src)
+    (src / "file.txt").write_text("dirty")
+    with pytest.warns(DirtyLocalWarning):
+        copier.run_copy(str(src), dst, defaults=True, quiet=True, vcs_ref="HEAD")
+    assert (dst / "file.txt").read_text() == "dirty"
+
+
+@pytest.mark.parametrize(
+    "tags",
+    [
+        (),
+        ("v1.0.0",),
+        ("v1.0.0", "not-a-version"),
+        ("1.0.0", "1.1.0a1"),
+        ("v1.0.0", "v2.0.0+build"),
+    ],
+)
+@pytest.mark.parametrize("annotated", [False, True])
+def test_version_without_checkout(
+    tmp_path: Path, tags: tuple[str, ...], annotated: bool
+) -> None:
+    build_file_tree({tmp_path / "file.txt": "content"})
+    git_save(tmp_path)
+    with local.cwd(tmp_path):
+        for tag in tags:
+            git("commit", "--allow-empty", "-m", f"Before {tag}")
+            git("tag", *(["-a", "-m", tag] if annotated else []), tag)
+        git("commit", "--allow-empty", "-m", "Untagged")
+    for ref in ("HEAD", "HEAD~1", *tags):
+        from_git = Template(str(tmp_path), ref=ref, checkout=False)
+        checkout = Template(str(tmp_path), ref=ref)
+        try:
+            assert from_git.version == checkout.version
+            assert from_git.commit == checkout.commit
+        finally:
+            from_git._cleanup()
+            checkout._cleanup()
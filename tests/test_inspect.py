@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import copier
+from copier._cli import CopierApp
+from copier._template import Template
+from copier.errors import ForbiddenPathError
+
+from .helpers import build_file_tree, git_save
+
+
+@pytest.fixture
+def template_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    src = tmp_path_factory.mktemp("src")
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                _min_copier_version: "9.0.0"
+                _secret_questions: [password]
+                _tasks:
+                    - echo hello
+                _migrations:
+                    - version: v2
+                      command: echo migrating
+                ---
+                !include includes/*.yml
+                """,
+            src / "includes" / "name.yml": """\
+                name:
+                    type: str
+                    default: world
+                """,
+            src / "includes" / "password.yml": "password: secret",
+            src / "hello.txt.jinja": "Hello {{ name }}!",
+        }
+    )
+    git_save(src, tag="v1")
+    (src / "includes" / "age.yml").write_text("age:\n    type: int\n")
+    git_save(src, tag="v2")
+    git_save(src, allow_empty=True)
+    return src
+
+
+@pytest.fixture(autouse=True)
+def forbid_clone(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _forbid_clone(*_args: object, **_kwargs: object) -> str:
+        raise AssertionError("The template must not be cloned")
+
+    monkeypatch.setattr(copier._template, "clone", _forbid_clone)
+
+
+def test_inspect_template(template_path: Path) -> None:
+    metadata = copier.inspect_template(str(template_path), "v1")
+    assert metadata == {
+        "src_path": str(template_path),
+        "commit": "v1",
+        "commit_hash": metadata["commit_hash"],
+        "version": "1",
+        "min_copier_version": "9.0.0",
+        "questions": {
+            "name": {"type": "str", "default": "world"},
+            "password": {"default": "secret", "secret": True},
+        },
+        "tasks": ["echo hello"],
+        "migrations": [{"version": "v2", "command": "echo migrating"}],
+    }
+    # The latest tag is inspected by default
+    metadata = copier.inspect_template(str(template_path))
+    assert metadata["commit"] == "v2"
+    assert list(metadata["questions"]) == ["age", "name", "password"]
+
+
+def test_inspect_untagged_commit(
+    template_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    metadata = copier.inspect_template(str(template_path), "HEAD")
+    assert metadata["commit"].startswith("v2-1-g")
+    # Same version as the one computed from a checkout
+    monkeypatch.undo()
+    template = Template(str(template_path), ref="HEAD")
+    try:
+        assert metadata["version"] == str(template.version)
+        assert metadata["commit_hash"] == template.commit_hash
+    finally:
+        template._cleanup()
+
+
+def test_inspect_local_directory(tmp_path: Path) -> None:
+    build_file_tree({tmp_path / "copier.yaml": "question: answer"})
+    metadata = copier.inspect_template(str(tmp_path))
+    assert metadata["commit"] is None
+    assert metadata["version"] is None
+    assert metadata["questions"] == {"question": {"default": "answer"}}
+
+
+def test_inspect_include_outside_template(tmp_path: Path) -> None:
+    build_file_tree({tmp_path / "copier.yml": "!include ../outside.yml"})
+    git_save(tmp_path)
+    with pytest.raises(ForbiddenPathError):
+        copier.inspect_template(str(tmp_path), "HEAD")
+
+
+def test_inspect_cli(template_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    _, retcode = CopierApp.run(
+        ["copier", "inspect", "--vcs-ref=v1", str(template_path)], exit=False
+    )
+    assert retcode == 0
+    metadata = json.loads(capsys.readouterr().out)
+    assert metadata["commit"] == "v1"
+    assert metadata["questions"]["name"] == {"type": "str", "default": "world"}
@@ -35,7 +35,7 @@ def test_keyboard_interrupt(
     worker = Worker(str(src), dst, defaults=False)
 
     with (
-        patch("copier._main.unsafe_prompt", side_effect=side_effect),
+        patch("questionary.unsafe_prompt", side_effect=side_effect),
         pytest.raises(KeyboardInterrupt),
     ):
         worker.run_copy()
@@ -60,7 +60,7 @@ def test_multiple_questions_interrupt(tmp_path_factory: pytest.TempPathFactory)
     worker = Worker(str(src), dst, defaults=False)
 
     with patch(
-        "copier._main.unsafe_prompt",
+        "questionary.unsafe_prompt",
         side_effect=[
             {"question1": "foobar"},
             {"question2": "yosemite"},
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from .helpers import build_file_tree
+
+PROMPT_MODULES = {"questionary", "prompt_toolkit", "pygments"}
+
+
+def _imported_after(code: str) -> set[str]:
+    """Get the modules imported by a fresh interpreter after running `code`."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(*sys.modules)"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(result.stdout.split())
+
+
+def _top_levels(modules: set[str]) -> set[str]:
+    return {module.split(".")[0] for module in modules}
+
+
+@pytest.mark.parametrize(
+    "code, unwanted",
+    [
+        (
+            "import copier",
+            {*PROMPT_MODULES, "jinja2", "jinja2_ansible_filters", "copier._main"},
+        ),
+        (
+            "import copier._cli",
+            {*PROMPT_MODULES, "jinja2", "jinja2_ansible_filters", "copier._main"},
+        ),
+        ("import copier._main", {*PROMPT_MODULES, "jinja2_ansible_filters"}),
+    ],
+)
+def test_lazy_imports(code: str, unwanted: set[str]) -> None:
+    imported = _imported_after(code)
+    assert not (imported | _top_levels(imported)) & unwanted
+
+
+def test_no_prompt_modules_without_prompts(tmp_path: Path) -> None:
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                choice:
+                    type: str
+                    choices: [one, two]
+                    default: two
+                many:
+                    type: str
+                    choices: [one, two]
+                    multiselect: true
+                    default: [one]
+                config:
+                    type: yaml
+                    default: {a: 1}
+                """,
+            src / "result.txt.jinja": "{{ choice }} {{ many }} {{ config }}",
+        }
+    )
+    imported = _imported_after(
+        f"import copier\ncopier.run_copy({str(src)!r}, {str(dst)!r}, defaults=True)"
+    )
+    assert (dst / "result.txt").read_text() == "two ['one'] {'a': 1}"
+    assert not _top_levels(imported) & PROMPT_MODULES
@@ -605,3 +605,36 @@ def test_copier_phase_variable(tmp_path_factory: pytest.TempPathFactory) -> None
         run_update(defaults=True, overwrite=True, unsafe=True)
 
     assert (dst / "migrate").is_file()
+
+
+def test_migration_dependencies(tmp_path_factory: pytest.TempPathFactory) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    with local.cwd(src):
+        build_file_tree(
+            {
+                **COPIER_ANSWERS_FILE,
+                "copier.yml": (
+                    """\
+                    _migrations:
+                    -   version: v1
+                        id: old
+                        command: touch old
+                    -   id: first
+                        command: touch first
+                    -   depends_on: [old, first]
+                        command: cp first second
+                    """
+                ),
+            }
+        )
+        git_save(tag="v1")
+    with local.cwd(dst):
+        run_copy(src_path=str(src))
+        git_save()
+    with local.cwd(src):
+        git_save(tag="v2", allow_empty=True)
+    with local.cwd(dst):
+        run_update(defaults=True, overwrite=True, unsafe=True, task_jobs=2)
+    # The dependency on a migration that didn't run is ignored
+    assert not (dst / "old").exists()
+    assert (dst / "second").is_file()
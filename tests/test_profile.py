@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import copier
+from copier._cli import CopierApp
+from copier._profile import Profiler, profiling, span
+
+from .helpers import build_file_tree, git_save
+
+
+@pytest.fixture
+def template_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    src = tmp_path_factory.mktemp("src")
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                name:
+                    type: str
+                    default: world
+                _tasks:
+                    - touch task-done
+                """,
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "hello.txt.jinja": "Hello {{ name }}!",
+            src / "static.txt": "static",
+        }
+    )
+    git_save(src, tag="v1")
+    return src
+
+
+def _names(report: dict[str, Any], category: str) -> set[str]:
+    return {total["name"] for total in report["spans"] if total["category"] == category}
+
+
+def test_profile_copy(template_path: Path, tmp_path: Path) -> None:
+    profile = tmp_path / "profile.json"
+    copier.run_copy(
+        str(template_path),
+        tmp_path / "dst",
+        defaults=True,
+        unsafe=True,
+        quiet=True,
+        profile=profile,
+    )
+    report = json.loads(profile.read_text())
+    assert _names(report, "phase") == {"prompt", "render", "tasks"}
+    assert _names(report, "operation") == {"run_copy"}
+    # Git templates are read without cloning them
+    assert _names(report, "git") == {"latest tag", "ls-tree"}
+    assert report["wall"] >= report["spans"][0]["wall"] > 0
+    assert report["files"]["count"] == 3
+    assert {file["path"] for file in report["files"]["slowest"]} == {
+        ".copier-answers.yml",
+        "hello.txt",
+        "static.txt",
+    }
+    trace = json.loads(profile.with_suffix(".trace.json").read_text())
+    events = trace["traceEvents"]
+    assert {event["ph"] for event in events} == {"X"}
+    assert {"render", "hello.txt", "run_copy"} <= {event["name"] for event in events}
+
+
+def test_profile_update(template_path: Path, tmp_path: Path) -> None:
+    dst = tmp_path / "dst"
+    copier.run_copy(str(template_path), dst, defaults=True, unsafe=True, quiet=True)
+    git_save(dst)
+    (template_path / "static.txt").write_text("changed")
+    git_save(template_path, tag="v2")
+    profile = tmp_path / "profile.json"
+    copier.run_update(
+        dst, defaults=True, overwrite=True, unsafe=True, quiet=True, profile=profile
+    )
+    report = json.loads(profile.read_text())
+    assert {"old copy", "new copy", "clean new copy", "diff", "apply"} <= _names(
+        report, "update"
+    )
+    # Nested copies are profiled with the update
+    operations = {
+        total["name"]: total["count"]
+        for total in report["spans"]
+        if total["category"] == "operation"
+    }
+    assert operations == {"run_update": 1, "run_copy": 3}
+
+
+def test_profile_cli(template_path: Path, tmp_path: Path) -> None:
+    profile = tmp_path / "profile.json"
+    _, retcode = CopierApp.run(
+        [
+            "copier",
+            "copy",
+            "--defaults",
+            "--UNSAFE",
+            f"--profile={profile}",
+            str(template_path),
+            str(tmp_path / "dst"),
+        ],
+        exit=False,
+    )
+    assert retcode == 0
+    assert json.loads(profile.read_text())["files"]["count"] == 3
+    assert profile.with_suffix(".trace.json").is_file()
+
+
+def test_spans_only_recorded_when_profiling(tmp_path: Path) -> None:
+    with span("ignored"):
+        pass
+    with profiling(tmp_path / "profile.json") as profiler:
+        assert isinstance(profiler, Profiler)
+        with span("outer"), profiling(tmp_path / "nested.json") as nested:
+            assert nested is None
+            with span("inner", "file", size=3):
+                pass
+    assert [span_.name for span_ in profiler.spans] == ["inner", "outer"]
+    assert profiler.spans[0].args == {"size": 3}
+    assert not (tmp_path / "nested.json").exists()
+    assert (tmp_path / "profile.json").is_file()
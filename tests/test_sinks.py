@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import io
+import re
+import stat
+import tarfile
+import zipfile
+from collections.abc import Callable
+from pathlib import Path, PurePosixPath
+
+import pytest
+
+import copier
+from copier._cli import CopierApp
+from copier._main import Worker
+from copier.errors import UserMessageError
+
+from .helpers import build_file_tree, git_save
+
+
+@pytest.fixture
+def template_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    src = tmp_path_factory.mktemp("src")
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                _preserve_symlinks: true
+                name:
+                    type: str
+                    default: world
+                """,
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "hello.txt.jinja": "Hello {{ name }}!",
+            src / "run.sh": "#!/bin/sh\necho hello\n",
+            src / "{{ name }}" / "nested.txt": "nested",
+            src / "empty" / "{{ name }}.txt.jinja": "",
+            src / "link.txt": Path("hello.txt"),
+        }
+    )
+    (src / "run.sh").chmod(0o755)
+    git_save(src, tag="v1")
+    return src
+
+
+def _read_dir(root: Path) -> dict[str, tuple[str, bytes, int]]:
+    result = {}
+    for path in root.rglob("*"):
+        relpath = path.relative_to(root).as_posix()
+        if path.is_symlink():
+            result[relpath] = ("symlink", str(path.readlink()).encode(), 0)
+        elif path.is_dir():
+            result[relpath] = ("dir", b"", 0)
+        else:
+            result[relpath] = ("file", path.read_bytes(), path.stat().st_mode & 0o111)
+    return result
+
+
+def _read_tar(data: bytes) -> dict[str, tuple[str, bytes, int]]:
+    result = {}
+    with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+        for info in tar:
+            if info.issym():
+                result[info.name] = ("symlink", info.linkname.encode(), 0)
+            elif info.isdir():
+                result[info.name] = ("dir", b"", 0)
+            else:
+                file = tar.extractfile(info)
+                assert file
+                result[info.name] = ("file", file.read(), info.mode & 0o111)
+    return result
+
+
+def _read_zip(data: bytes) -> dict[str, tuple[str, bytes, int]]:
+    result = {}
+    with zipfile.ZipFile(io.BytesIO(data)) as zip_:
+        for info in zip_.infolist():
+            mode = info.external_attr >> 16
+            if stat.S_ISLNK(mode):
+                result[info.filename] = ("symlink", zip_.read(info), 0)
+            elif info.is_dir():
+                result[info.filename.rstrip("/")] = ("dir", b"", 0)
+            else:
+                result[info.filename] = ("file", zip_.read(info), mode & 0o111)
+    return result
+
+
+def test_sinks_match_directory(
+    template_path: Path, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    dst, unused = map(tmp_path_factory.mktemp, ("dst", "unused"))
+    copier.run_copy(str(template_path), dst, defaults=True, quiet=True)
+    expected = _read_dir(dst)
+    assert expected["link.txt"] == ("symlink", b"hello.txt", 0)
+    assert expected["run.sh"][2] == 0o111
+
+    memory = copier.MemorySink()
+    copier.run_copy(str(template_path), unused, defaults=True, quiet=True, sink=memory)
+    assert {
+        path.as_posix(): (
+            entry.kind,
+            str(entry.target).encode() if entry.target else entry.contents,
+            entry.mode & 0o111 if entry.kind == "file" else 0,
+        )
+        for path, entry in memory.entries.items()
+    } == expected
+
+    tar_data = io.BytesIO()
+    with copier.TarSink(tar_data) as sink:
+        copier.run_copy(
+            str(template_path), unused, defaults=True, quiet=True, sink=sink
+        )
+    assert _read_tar(tar_data.getvalue()) == expected
+
+    zip_data = io.BytesIO()
+    with copier.ZipSink(zip_data) as sink:
+        copier.run_copy(
+            str(template_path), unused, defaults=True, quiet=True, sink=sink
+        )
+    assert _read_zip(zip_data.getvalue()) == expected
+    assert not any(unused.iterdir())
+
+
+def test_sink_reports_identical_files(
+    template_path: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    sink = copier.MemorySink()
+    copier.run_copy(str(template_path), tmp_path, defaults=True, sink=sink)
+    capsys.readouterr()
+    copier.run_copy(
+        str(template_path), tmp_path, data={"name": "moon"}, overwrite=True, sink=sink
+    )
+    _, err = capsys.readouterr()
+    assert re.search(r"identical[^\s]*  run\.sh", err)
+    assert re.search(r"overwrite[^\s]*  hello\.txt", err)
+    assert re.search(r"create[^\s]*  moon[/\\]nested\.txt", err)
+    assert not any(tmp_path.iterdir())
+    assert sink.entries[PurePosixPath("hello.txt")].contents == b"Hello moon!"
+
+
+def test_sink_requires_skipping_tasks(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree(
+        {
+            src / "copier.yml": "_tasks: [touch created-by-task]",
+            src / "file.txt": "content",
+        }
+    )
+    with pytest.raises(UserMessageError, match="--skip-tasks"):
+        copier.run_copy(str(src), dst, unsafe=True, sink=copier.MemorySink())
+    sink = copier.MemorySink()
+    copier.run_copy(str(src), dst, unsafe=True, skip_tasks=True, quiet=True, sink=sink)
+    assert list(sink.entries) == [PurePosixPath("file.txt")]
+
+
+def test_update_into_sink_fails(
+    template_path: Path, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    dst = tmp_path_factory.mktemp("dst")
+    copier.run_copy(str(template_path), dst, defaults=True, quiet=True)
+    git_save(dst)
+    with (
+        pytest.raises(UserMessageError, match="sink"),
+        Worker(dst_path=dst, sink=copier.MemorySink()) as worker,
+    ):
+        worker.run_update()
+
+
+@pytest.mark.parametrize(
+    "name, opener",
+    [
+        ("project.zip", _read_zip),
+        ("project.tar", _read_tar),
+        ("project.tgz", _read_tar),
+        ("project.tar.bz2", _read_tar),
+        ("project.tar.xz", _read_tar),
+    ],
+)
+def test_archive_cli(
+    template_path: Path,
+    tmp_path: Path,
+    name: str,
+    opener: Callable[[bytes], dict[str, tuple[str, bytes, int]]],
+) -> None:
+    archive = tmp_path / name
+    _, retcode = CopierApp.run(
+        [
+            "copier",
+            "copy",
+            "--defaults",
+            f"--archive={archive}",
+            str(template_path),
+            str(tmp_path / "project"),
+        ],
+        exit=False,
+    )
+    assert retcode == 0
+    assert not (tmp_path / "project").exists()
+    assert opener(archive.read_bytes())["hello.txt"] == ("file", b"Hello world!", 0)
+
+
+def test_archive_cli_unknown_format(template_path: Path, tmp_path: Path) -> None:
+    _, retcode = CopierApp.run(
+        [
+            "copier",
+            "copy",
+            "--defaults",
+            f"--archive={tmp_path / 'project.rar'}",
+            str(template_path),
+            str(tmp_path / "project"),
+        ],
+        exit=False,
+    )
+    assert retcode == 1
+    assert not (tmp_path / "project.rar").exists()
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 import pytest
 import yaml
 
 import copier
 from copier._cli import CopierApp
+from copier.errors import ConfigFileError, TaskError
 
-from .helpers import BRACKET_ENVOPS_JSON, SUFFIX_TMPL, build_file_tree
+from .helpers import BRACKET_ENVOPS_JSON, SUFFIX_TMPL, build_file_tree, git_save
 
 
 @pytest.fixture(scope="module")
@@ -204,3 +206,241 @@ def test_copier_phase_variable(tmp_path_factory: pytest.TempPathFactory) -> None
     )
     copier.run_copy(str(src), dst, unsafe=True)
     assert (dst / "tasks").exists()
+
+
+def _python_task(code: str, **options: Any) -> dict[str, Any]:
+    return {"command": ["{{ _copier_python }}", "-c", code], **options}
+
+
+def _wait_for(name: str) -> str:
+    return (
+        "import pathlib, time\n"
+        "for _ in range(200):\n"
+        f"    if pathlib.Path({name!r}).exists(): break\n"
+        "    time.sleep(0.05)\n"
+        "else: raise SystemExit(1)\n"
+    )
+
+
+def test_independent_tasks_run_in_parallel(
+    tmp_path_factory: pytest.TempPathFactory, capfd: pytest.CaptureFixture[str]
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    tasks = [
+        # Each one waits for the other, so they only succeed if run at once
+        _python_task(
+            "open('a', 'w').close()\n" + _wait_for("b") + "print('output of a')",
+            id="a",
+            depends_on=[],
+        ),
+        _python_task(
+            "open('b', 'w').close()\n" + _wait_for("a") + "print('output of b')",
+            id="b",
+            depends_on=[],
+        ),
+        _python_task("print('output of c')", depends_on=["a", "b"]),
+    ]
+    build_file_tree({src / "copier.yml": yaml.safe_dump({"_tasks": tasks})})
+    copier.run_copy(str(src), dst, unsafe=True, task_jobs=2)
+    out, err = capfd.readouterr()
+    assert [line for line in out.splitlines() if line] == [
+        "output of a",
+        "output of b",
+        "output of c",
+    ]
+    assert err.index("task 1 of 3") < err.index("task 2 of 3") < err.index("task 3")
+
+
+def test_parallel_tasks_fail_fast(tmp_path_factory: pytest.TempPathFactory) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    tasks = [
+        _python_task("raise SystemExit(3)", id="fails", depends_on=[]),
+        _python_task("open('independent', 'w').close()", depends_on=[]),
+        _python_task("open('dependent', 'w').close()", depends_on=["fails"]),
+        _python_task("open('next', 'w').close()"),
+    ]
+    build_file_tree({src / "copier.yml": yaml.safe_dump({"_tasks": tasks})})
+    with pytest.raises(TaskError) as error:
+        copier.run_copy(str(src), dst, unsafe=True, task_jobs=2)
+    assert error.value.returncode == 3
+    assert not (dst / "dependent").exists()
+    assert not (dst / "next").exists()
+
+
+def test_tasks_in_same_group_dont_overlap(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    log = (
+        "import time\n"
+        "with open('log', 'a') as f: f.write('start ')\n"
+        "time.sleep(0.2)\n"
+        "with open('log', 'a') as f: f.write('end ')\n"
+    )
+    tasks = [
+        _python_task(log, depends_on=[], group="lock"),
+        _python_task(log, depends_on=[], group="lock"),
+        _python_task(log, depends_on=[], group="lock", when=False),
+    ]
+    build_file_tree({src / "copier.yml": yaml.safe_dump({"_tasks": tasks})})
+    copier.run_copy(str(src), dst, unsafe=True, task_jobs=3)
+    assert (dst / "log").read_text() == "start end start end "
+
+
+@pytest.mark.parametrize(
+    "tasks, message",
+    [
+        ([{"command": "true", "depends_on": ["missing"]}], "not a task declared"),
+        (
+            [
+                {"command": "true", "depends_on": ["later"]},
+                {"command": "true", "id": "later"},
+            ],
+            "not a task declared",
+        ),
+        (
+            [{"command": "true", "id": "twice"}, {"command": "true", "id": "twice"}],
+            "repeated",
+        ),
+    ],
+)
+def test_invalid_task_dependencies(
+    tmp_path_factory: pytest.TempPathFactory,
+    tasks: list[dict[str, Any]],
+    message: str,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree({src / "copier.yml": yaml.safe_dump({"_tasks": tasks})})
+    with pytest.raises(ConfigFileError, match=message):
+        copier.run_copy(str(src), dst, unsafe=True)
+
+
+def test_cli_task_jobs(tmp_path_factory: pytest.TempPathFactory) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    tasks = [
+        _python_task("open('a', 'w').close()\n" + _wait_for("b"), depends_on=[]),
+        _python_task("open('b', 'w').close()\n" + _wait_for("a"), depends_on=[]),
+    ]
+    build_file_tree({src / "copier.yml": yaml.safe_dump({"_tasks": tasks})})
+    _, retcode = CopierApp.run(
+        ["copier", "copy", "--UNSAFE", "--task-jobs=2", str(src), str(dst)],
+        exit=False,
+    )
+    assert retcode == 0
+    assert (dst / "a").exists()
+    assert (dst / "b").exists()
+
+
+@pytest.mark.parametrize("task_jobs", [1, 2])
+def test_tasks_skipped_when_inputs_unchanged(
+    tmp_path_factory: pytest.TempPathFactory,
+    capfd: pytest.CaptureFixture[str],
+    task_jobs: int,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    install = (
+        "import pathlib\n"
+        "with open('log', 'a') as f: f.write('install ')\n"
+        "pathlib.Path('node_modules').mkdir(exist_ok=True)\n"
+    )
+    tasks = [
+        _python_task(
+            install, inputs=["package.json"], outputs=["node_modules"], id="install"
+        ),
+        _python_task("open('log', 'a').write('always ')"),
+    ]
+    build_file_tree(
+        {
+            src / "copier.yml": yaml.safe_dump({"version": "1", "_tasks": tasks}),
+            src / "package.json.jinja": '{"version": "{{ version }}"}',
+        }
+    )
+
+    def _copy(**kwargs: Any) -> str:
+        copier.run_copy(
+            str(src),
+            dst,
+            defaults=True,
+            overwrite=True,
+            unsafe=True,
+            task_jobs=task_jobs,
+            **kwargs,
+        )
+        log = (dst / "log").read_text()
+        (dst / "log").unlink()
+        return log
+
+    assert _copy() == "install always "
+    assert (dst / ".copier-answers.tasks.json").is_file()
+    capfd.readouterr()
+    # Same inputs
+    assert _copy() == "always "
+    assert "Skipping up-to-date task 1 of 2" in capfd.readouterr().err
+    # Changed inputs
+    assert _copy(data={"version": "2"}) == "install always "
+    assert _copy(data={"version": "2"}) == "always "
+    # Missing outputs
+    (dst / "node_modules").rmdir()
+    assert _copy(data={"version": "2"}) == "install always "
+    # Forced run
+    assert _copy(data={"version": "2"}, force_tasks=True) == "install always "
+    assert _copy(data={"version": "2"}) == "always "
+
+
+def test_tasks_without_id_skipped_per_working_directory(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    tasks = [
+        _python_task(
+            "open('log', 'a').write('ran ')",
+            inputs=["package.json"],
+            working_directory=name,
+        )
+        for name in ("a", "b")
+    ]
+    build_file_tree(
+        {
+            src / "copier.yml": yaml.safe_dump({"_tasks": tasks}),
+            src / "a" / "package.json": "{}",
+            src / "b" / "package.json": "{}",
+        }
+    )
+    for _ in range(3):
+        copier.run_copy(str(src), dst, defaults=True, overwrite=True, unsafe=True)
+    assert (dst / "a" / "log").read_text() == "ran "
+    assert (dst / "b" / "log").read_text() == "ran "
+    state = json.loads((dst / ".copier-answers.tasks.json").read_text())
+    assert len(state["fingerprints"]) == 2
+
+
+def test_task_state_ignored_by_update(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    tasks = [
+        _python_task(
+            "open('log', 'a').write('install ')",
+            inputs=["package.json"],
+            outputs=["log"],
+        )
+    ]
+    build_file_tree(
+        {
+            src / "copier.yml": yaml.safe_dump({"_tasks": tasks}),
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "package.json": "{}",
+            src / "README.md": "v1",
+        }
+    )
+    git_save(src, tag="v1")
+    copier.run_copy(str(src), dst, defaults=True, unsafe=True)
+    git_save(dst)
+    (src / "README.md").write_text("v2")
+    git_save(src, tag="v2")
+    copier.run_update(dst, defaults=True, overwrite=True, unsafe=True)
+    assert (dst / "README.md").read_text() == "v2"
+    assert (dst / "log").read_text() == "install "
+    assert not list(dst.glob("*.rej"))
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 from collections.abc import Sequence
 from datetime import datetime, timezone
+from typing import Any
 
 import pexpect
 import pytest
@@ -10,9 +11,10 @@ import yaml
 from pexpect.popen_spawn import PopenSpawn
 from plumbum import local
 
-from copier._main import Worker
+from copier._jinja_ext import SandboxedEnvironment
+from copier._main import Worker, run_copy
 from copier._types import AnyByStrDict
-from copier._user_data import load_answersfile_data
+from copier._user_data import RenderCache, load_answersfile_data
 from copier.errors import InvalidTypeError
 
 from .helpers import (
@@ -592,3 +594,92 @@ def test_copier_conf_variable(
     tui = spawn(COPIER_PATH + ("copy", str(src), str(dst / "test_project")))
     expect_prompt(tui, "project_name", "str")
     tui.expect_exact("test_project")
+
+
+def test_templated_values_compiled_once(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    questions = {
+        f"q{i}": {
+            "type": "str",
+            "when": "{{ enabled }}",
+            "default": "{{ prefix }}-{{ enabled }}",
+            "help": "Question for {{ prefix }}",
+        }
+        for i in range(30)
+    }
+    build_file_tree(
+        {
+            src / "copier.yml": yaml.safe_dump(
+                {
+                    "enabled": {"type": "bool", "default": True},
+                    "prefix": "p",
+                    **questions,
+                }
+            ),
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+        }
+    )
+    parsed: list[str] = []
+    parse = SandboxedEnvironment.parse
+
+    def _parse(self: SandboxedEnvironment, source: str, *args: Any) -> Any:
+        parsed.append(source)
+        return parse(self, source, *args)
+
+    monkeypatch.setattr(SandboxedEnvironment, "parse", _parse)
+    run_copy(str(src), dst, defaults=True, quiet=True)
+    assert parsed.count("{{ enabled }}") == 1
+    assert parsed.count("{{ prefix }}-{{ enabled }}") == 1
+    answers = load_answersfile_data(dst)
+    assert [answers[f"q{i}"] for i in range(30)] == ["p-True"] * 30
+
+
+def test_templated_values_follow_answer_changes(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    echo = {"type": "str", "default": "{{ a }}{{ b | default('') }}"}
+    build_file_tree(
+        {
+            src / "copier.yml": yaml.safe_dump(
+                {
+                    "a": {"type": "str", "default": "A"},
+                    "echo1": echo,
+                    "b": {"type": "str", "default": "B"},
+                    "echo2": echo,
+                    "items": {"type": "yaml", "default": [1]},
+                    "count1": {"type": "int", "default": "{{ items | length }}"},
+                    "more": {"type": "yaml", "default": "{{ items + [2] }}"},
+                    "count2": {"type": "int", "default": "{{ items | length }}"},
+                },
+                sort_keys=False,
+            ),
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+        }
+    )
+    run_copy(str(src), dst, defaults=True, quiet=True)
+    answers = load_answersfile_data(dst)
+    assert answers["echo1"] == "A"
+    assert answers["echo2"] == "AB"
+    assert answers["count1"] == answers["count2"] == 1
+    assert answers["more"] == [1, 2]
+
+
+def test_render_cache_without_dependency_tracking() -> None:
+    env = SandboxedEnvironment()
+    cache = RenderCache(env, track_dependencies=False)
+    assert cache.render("{{ a }}", {"a": 1}) == "1"
+    assert cache.render("{{ a }}", {"a": 2}) == "2"
+    assert cache.compile("{{ a }}")[1] is None
+    tracking = RenderCache(env)
+    assert tracking.compile("{{ a }}{{ b }}")[1] == ("a", "b")
+    assert tracking.compile("{{ [1, 2] | random }}")[1] is None
+    assert tracking.compile('{% include "other" %}')[1] is None
+    assert tracking.render("{{ a }}", {"a": 1}) == "1"
+    assert tracking.render("{{ a }}", {"a": True}) == "True"
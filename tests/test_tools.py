@@ -5,7 +5,7 @@ from tempfile import TemporaryDirectory
 import pytest
 from poethepoet.app import PoeThePoet
 
-from copier._tools import cast_to_bool, normalize_git_path
+from copier._tools import cast_to_bool, filter_git_patch, normalize_git_path
 
 from .helpers import git
 
@@ -83,3 +83,31 @@ def test_temporary_directory_with_git_repo_deletion() -> None:
 )
 def test_normalizing_git_paths(path: str, normalized: str) -> None:
     assert normalize_git_path(path) == normalized
+
+
+def test_filtering_git_patches() -> None:
+    patch = [
+        b"diff --git a/keep me.txt b/keep me.txt\n",
+        b"index 1111111..2222222 100644\n",
+        b"--- a/keep me.txt\n",
+        b"+++ b/keep me.txt\n",
+        b"@@ -1 +1 @@\n",
+        b"-old\n",
+        b"+new\n",
+        b'diff --git "a/dr\\303\\244ng b" "b/dr\\303\\244ng b"\n',
+        b"deleted file mode 100644\n",
+        b"index 3333333..0000000\n",
+        b'--- "a/dr\\303\\244ng b"\n',
+        b"+++ /dev/null\n",
+        b"@@ -1 +0,0 @@\n",
+        b"-diff --git a/keep me.txt b/keep me.txt\n",
+        b"diff --git a/sub/skip.txt b/sub/skip.txt\n",
+        b"new file mode 100644\n",
+        b"--- /dev/null\n",
+        b"+++ b/sub/skip.txt\n",
+        b"@@ -0,0 +1 @@\n",
+        b"+skipped\n",
+    ]
+    excluded = {"dr\u00e4ng b", "sub/skip.txt"}
+    assert list(filter_git_patch(patch, excluded.__contains__)) == patch[:7]
+    assert list(filter_git_patch(patch, lambda _: False)) == patch
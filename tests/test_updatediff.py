@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import platform
 import stat
+import sys
+from io import BytesIO
 from pathlib import Path
 from shutil import rmtree
 from textwrap import dedent
@@ -12,9 +14,10 @@ import pytest
 from inline_snapshot import snapshot
 from packaging.version import Version
 from plumbum import local
+from plumbum.commands import ProcessExecutionError
 
 from copier._cli import CopierApp
-from copier._main import Worker, run_copy, run_update
+from copier._main import Worker, _spool_patch, as_operation, run_copy, run_update
 from copier._tools import normalize_git_path
 from copier._types import VcsRef
 from copier._user_data import load_answersfile_data
@@ -1136,6 +1139,63 @@ def test_update_in_repo_subdirectory(
         )
 
 
+def test_update_in_repo_subdirectory_ignores_sibling_paths(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    subdir = Path("subdir")
+
+    with local.cwd(src):
+        build_file_tree(
+            {
+                "{{ _copier_conf.answers_file }}.jinja": "{{ _copier_answers|to_yaml }}",
+                "version.txt": "v1",
+            }
+        )
+        git_save(tag="v1")
+
+    with local.cwd(dst):
+        build_file_tree(
+            {
+                ".gitignore": "build/\n*.rej\n",
+                "other/notes.txt": "committed notes",
+            }
+        )
+    run_copy(str(src), dst / subdir)
+
+    with local.cwd(dst):
+        git_save()
+        build_file_tree({subdir / "version.txt": "v1 edited"})
+        git_save()
+        # Uncommitted work in an unrelated package of the same repository
+        build_file_tree(
+            {
+                "build/output.txt": "ignored build output",
+                "other/notes.txt": "uncommitted notes",
+                "other/notes.txt.rej": "unrelated rejection",
+            }
+        )
+
+    with local.cwd(src):
+        build_file_tree({"version.txt": "v2"})
+        git_save(tag="v2")
+
+    run_update(dst / subdir, overwrite=True, conflict="inline")
+
+    assert (dst / subdir / "version.txt").read_text() == dedent(
+        """\
+        <<<<<<< before updating
+        v1 edited
+        =======
+        v2
+        >>>>>>> after updating
+        """
+    )
+    assert (dst / "build" / "output.txt").read_text() == "ignored build output"
+    assert (dst / "other" / "notes.txt").read_text() == "uncommitted notes"
+    assert (dst / "other" / "notes.txt.rej").read_text() == "unrelated rejection"
+
+
 @pytest.mark.parametrize(
     "context_lines",
     [
@@ -1362,8 +1422,9 @@ def test_conflicted_files_are_marked_unmerged(
         git("tag", "v2")
 
     # Finally, update the generated project
-    run_update(dst_path=dst, defaults=True, overwrite=True, conflict="inline")
+    worker = run_update(dst_path=dst, defaults=True, overwrite=True, conflict="inline")
     assert load_answersfile_data(dst).get("_commit") == "v2"
+    assert worker.conflicts == [filename]
 
     # Assert that the file still exists, has inline conflict markers,
     # and is reported as "unmerged" by Git.
@@ -2628,3 +2689,160 @@ index f163f4b,d20125d..0000000
 ++>>>>>>> after updating
 """)
         # editorconfig-checker-enable
+
+
+def test_update_same_commit_skips_render(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    with local.cwd(src):
+        build_file_tree(
+            {
+                "copier.yml": (
+                    """\
+                    name: foo
+                    _tasks:
+                        - touch task-ran.txt
+                    """
+                ),
+                "{{ _copier_conf.answers_file }}.jinja": "{{ _copier_answers|to_nice_yaml }}",
+                "README.md.jinja": "# {{ name }}\n",
+            }
+        )
+        git_save(tag="v1")
+    run_copy(str(src), dst, defaults=True, overwrite=True, unsafe=True)
+    (dst / "task-ran.txt").unlink()
+    with local.cwd(dst):
+        git_init("v1")
+
+    def _fail(_: Worker) -> None:
+        raise AssertionError("The full update cycle must not run")
+
+    monkeypatch.setattr(Worker, "_apply_update", _fail)
+    run_update(dst, defaults=True, overwrite=True, unsafe=True)
+    assert (dst / "task-ran.txt").exists()
+    assert (dst / "README.md").read_text() == "# foo\n"
+
+    # Interactive runs can't know answers beforehand
+    with Worker(dst_path=dst, overwrite=True, unsafe=True) as worker:
+        assert worker._noop_update_answers() is None
+    # Changed answers need a full update
+    with Worker(
+        dst_path=dst,
+        data={"name": "bar"},
+        defaults=True,
+        overwrite=True,
+        unsafe=True,
+    ) as worker:
+        assert worker._noop_update_answers() is None
+
+
+def test_update_same_commit_recreates_skipped_paths(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    with local.cwd(src):
+        build_file_tree(
+            {
+                "copier.yml": "_skip_if_exists: [foo.txt]\nname: foo",
+                "{{ _copier_conf.answers_file }}.jinja": "{{ _copier_answers|to_nice_yaml }}",
+                "{{ name }}.txt.jinja": "{{ name }}",
+            }
+        )
+        git_save(tag="v1")
+    run_copy(str(src), dst, defaults=True, overwrite=True)
+    with local.cwd(dst):
+        git_init("v1")
+    with Worker(dst_path=dst, defaults=True, overwrite=True) as worker:
+        assert as_operation("update")(worker._noop_update_answers)() is not None
+    with local.cwd(dst):
+        git("rm", "foo.txt")
+        git("commit", "-m", "remove foo.txt")
+    with Worker(dst_path=dst, defaults=True, overwrite=True) as worker:
+        assert as_operation("update")(worker._noop_update_answers)() is None
+        # Nothing is kept from the discarded answers
+        assert "name" not in worker.answers.combined
+        assert "match_skip" not in worker.__dict__
+    run_update(dst, defaults=True, overwrite=True)
+    assert (dst / "foo.txt").read_text() == "foo"
+
+
+def test_update_new_commit_is_not_noop(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    with local.cwd(src):
+        build_file_tree(
+            {
+                "{{ _copier_conf.answers_file }}.jinja": "{{ _copier_answers|to_nice_yaml }}",
+                "README.md": "v1",
+            }
+        )
+        git_save(tag="v1")
+    run_copy(str(src), dst, defaults=True, overwrite=True)
+    with local.cwd(dst):
+        git_init("v1")
+    with local.cwd(src):
+        build_file_tree({"README.md": "v2"})
+        git_save(tag="v2")
+    with Worker(dst_path=dst, defaults=True, overwrite=True) as worker:
+        assert worker._noop_update_answers() is None
+    run_update(dst, defaults=True, overwrite=True)
+    assert (dst / "README.md").read_text() == "v2"
+
+
+@pytest.mark.parametrize("pretend", [True, False])
+def test_file_removed_plan(
+    tmp_path_factory: pytest.TempPathFactory,
+    capsys: pytest.CaptureFixture[str],
+    pretend: bool,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    with local.cwd(src):
+        build_file_tree(
+            {
+                "{{ _copier_conf.answers_file }}.jinja": "{{ _copier_answers|to_yaml }}",
+                ".gitignore": "*.log",
+                "1.txt": "content 1",
+                Path("dir 2", "2.txt"): "content 2",
+                "debug.log.jinja": "ignored by the template itself",
+            }
+        )
+        git_save(tag="1")
+    run_copy(str(src), dst, defaults=True, overwrite=True)
+    with local.cwd(dst):
+        git_save(message="v1")
+    with local.cwd(src):
+        Path("1.txt").unlink()
+        rmtree("dir 2")
+        Path("debug.log.jinja").unlink()
+        git_save(tag="2")
+    capsys.readouterr()
+    run_update(dst, defaults=True, overwrite=True, pretend=pretend)
+    _, err = capsys.readouterr()
+    for path in ("1.txt", "dir 2/2.txt", "debug.log"):
+        assert any(
+            "remove" in line and line.endswith(f"  {path}") for line in err.splitlines()
+        )
+        assert (dst / path).exists() is pretend
+    assert (dst / "dir 2").exists() is pretend
+
+
+@pytest.mark.parametrize("returncode", [0, 1])
+def test_spool_patch_with_long_errors(returncode: int) -> None:
+    # More errors than fit in a pipe buffer, written before the patch
+    script = (
+        "import sys; "
+        "sys.stderr.write('warning: slow\\n' * 100_000); "
+        "sys.stdout.write('diff --git a/a.txt b/a.txt\\n+a\\n'); "
+        f"sys.exit({returncode})"
+    )
+    diff_cmd = local[sys.executable]["-c", script]
+    patch = BytesIO()
+    if returncode:
+        with pytest.raises(ProcessExecutionError) as error:
+            _spool_patch(diff_cmd, patch, ())
+        assert error.value.stderr.count("warning: slow") == 100_000
+    else:
+        _spool_patch(diff_cmd, patch, ())
+        assert patch.read() == b"diff --git a/a.txt b/a.txt\n+a\n"
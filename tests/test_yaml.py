@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+import yaml
+from inline_snapshot import snapshot
+
+import copier
+from copier import _yaml
+from copier._template import load_template_config
+from copier._user_data import parse_yaml_list
+
+from .helpers import build_file_tree
+
+if _yaml.LIBYAML_BACKEND is None:
+    pytest.skip("PyYAML is built without libyaml", allow_module_level=True)
+
+BACKENDS = (_yaml.PYTHON_BACKEND, _yaml.LIBYAML_BACKEND)
+
+DOCUMENTS = (
+    "",
+    "~",
+    "key: value",
+    "- 1\n- 1.5\n- .inf\n- 0x1F\n- 0o17\n- 1_000\n",
+    "on: yes\noff: no\nnull_value: null\ntilde: ~\nempty:\n",
+    "date: 2024-01-31\ntimestamp: 2024-01-31T12:30:00Z\nversion: 1.10\n",
+    "unicode: héllo wörld ✓\nquoted: 'it''s'\nescaped: \"tab\\there\\u00e9\"\n",
+    "literal: |\n  line 1\n  line 2\nfolded: >-\n  folded\n  text\n",
+    "base: &base {a: 1, b: [x, y]}\nderived:\n  <<: *base\n  b: z\n",
+    "? complex key\n: value\nset: !!set {a, b}\nbinary: !!binary aGVsbG8=\n",
+    "nested:\n  - {name: a, tags: [1, 2]}\n  - name: b\n    tags: []\n",
+    "key: value\n---\nother: document\n",
+    "key: [unclosed\n",
+    "- item\nkey: value\n",
+    "a: b\r\nc: [d, e]\r\n",
+    # Loaded differently by libyaml
+    "key:\n\tnested: value\n",
+    "{url: http://example.com/?q=1}",
+    "[a?b, c]",
+    "text: >#\n  folded\n",
+    "! value",
+    "%YAML 1.1\n---\nkey: value\n",
+    "\ufeffkey: value\n",
+    "a\rb: c\n",
+    "{a:}",
+)
+
+
+def _with_each_backend(
+    monkeypatch: pytest.MonkeyPatch, func: Callable[[], Any]
+) -> list[Any]:
+    results = []
+    for backend in BACKENDS:
+        monkeypatch.setattr(_yaml, "backend", backend)
+        results.append(func())
+    return results
+
+
+def test_libyaml_is_default() -> None:
+    assert _yaml.backend is _yaml.LIBYAML_BACKEND
+
+
+def _load(document: str | bytes) -> Any:
+    try:
+        return _yaml.load(document)
+    except yaml.YAMLError as error:
+        return str(error)
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_load_parity(monkeypatch: pytest.MonkeyPatch, document: str) -> None:
+    python, libyaml = _with_each_backend(monkeypatch, lambda: _load(document))
+    assert python == libyaml
+    python, libyaml = _with_each_backend(monkeypatch, lambda: _load(document.encode()))
+    assert python == libyaml
+    if document.count("---") == 1:
+        python, libyaml = _with_each_backend(
+            monkeypatch, lambda: list(_yaml.load_all(document))
+        )
+        assert python == libyaml
+
+
+@pytest.mark.parametrize(
+    "document, libyaml",
+    [
+        ("key: value\nitems: [1, 2]\n", True),
+        ("key: value\r\nurl: http://example.com/?q=1\r\n", True),
+        ("text: |-\n  literal\n", True),
+        ("key:\n\tnested: value\n", False),
+        ("{url: http://example.com/?q=1}", False),
+        ("text: >#\n  folded\n", False),
+        ("%YAML 1.1\n---\nkey: value\n", False),
+        (b"\xff\xfek\x00", False),
+    ],
+)
+def test_libyaml_only_loads_vouched_documents(
+    document: str | bytes, libyaml: bool
+) -> None:
+    assert _yaml.LIBYAML_BACKEND is not None
+    loader = _yaml.safe_loader_with({})
+    for base in (_yaml.LIBYAML_BACKEND.safe_loader, loader):
+        _, chosen = _yaml._loader_for(document, base)
+        assert (chosen is base) == libyaml
+
+
+def test_dump() -> None:
+    data = {
+        "name": "héllo",
+        "items": [1, 2.5, True, None],
+        "empty": {},
+        "quote": "it's: 'here'",
+        "url": "https://example.com/?q=1",
+        "": "empty key",
+        "long": "word " * 20,
+        "multiline": "a\nb\n",
+    }
+    assert _yaml.safe_dump(data, allow_unicode=True, sort_keys=False) == snapshot("""\
+name: héllo
+items:
+- 1
+- 2.5
+- true
+- null
+empty: {}
+quote: 'it''s: ''here'''
+url: https://example.com/?q=1
+? ''
+: empty key
+long: 'word word word word word word word word word word word word word word word
+  word word word word word '
+multiline: 'a
+
+  b
+
+  '
+""")
+    assert _yaml.to_yaml(data) == snapshot("""\
+? ''
+: empty key
+empty: {}
+items: [1, 2.5, true, null]
+long: 'word word word word word word word word word word word word word word word
+  word word word word word '
+multiline: 'a
+
+  b
+
+  '
+name: héllo
+quote: 'it''s: ''here'''
+url: https://example.com/?q=1
+""")
+    assert _yaml.to_nice_yaml(data) == snapshot("""\
+? ''
+: empty key
+empty: {}
+items:
+- 1
+- 2.5
+- true
+- null
+long: 'word word word word word word word word word word word word word word word
+    word word word word word '
+multiline: 'a
+
+    b
+
+    '
+name: héllo
+quote: 'it''s: ''here'''
+url: https://example.com/?q=1
+""")
+    assert _yaml.safe_dump("scalar") == snapshot("""\
+scalar
+...
+""")
+
+
+@pytest.mark.parametrize(
+    "string",
+    [
+        "[a, 'b c', \"d\", {e: f}]",
+        "- héllo\n- 'wörld'\n- [1, 2]\n- key: value\n",
+    ],
+)
+def test_parse_yaml_list_parity(monkeypatch: pytest.MonkeyPatch, string: str) -> None:
+    python, libyaml = _with_each_backend(monkeypatch, lambda: parse_yaml_list(string))
+    assert python == libyaml
+
+
+def test_template_config_parity(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def _load() -> Any:
+        src = tmp_path_factory.mktemp("src")
+        build_file_tree(
+            {
+                src / "copier.yml": """\
+                    _exclude: [one]
+                    ---
+                    !include includes/*.yml
+                    ---
+                    question:
+                        type: str
+                        default: héllo
+                    """,
+                src / "includes" / "a.yml": "_exclude: [two]\nfrom_a: 1",
+                src / "includes" / "b.yml": "!include nested.yml",
+                src / "nested.yml": "from_nested: [x, y]",
+            }
+        )
+        return load_template_config(src / "copier.yml")
+
+    python, libyaml = _with_each_backend(monkeypatch, _load)
+    assert python == libyaml
+    assert python["_exclude"] == ["one", "two"]
+    assert python["from_nested"] == ["x", "y"]
+
+
+def test_copy_parity(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src = tmp_path_factory.mktemp("src")
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                name:
+                    type: str
+                    default: wörld
+                items:
+                    type: yaml
+                    multiline: true
+                    default: [a, {b: c}]
+                """,
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "data.yml.jinja": "{{ items|to_yaml }}",
+        }
+    )
+    data_file = src.parent / "data.yml"
+    data_file.write_text("name: from file\n")
+
+    def _copy() -> dict[str, str]:
+        dst = tmp_path_factory.mktemp("dst")
+        copier.run_copy(
+            str(src), dst, data=_yaml.load(data_file.read_bytes()), defaults=True
+        )
+        return {path.name: path.read_text() for path in dst.iterdir() if path.is_file()}
+
+    python, libyaml = _with_each_backend(monkeypatch, _copy)
+    assert python == libyaml
+    assert "name: from file" in python[".copier-answers.yml"]